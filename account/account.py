@@ -39,11 +39,30 @@ class Account(object):
         self.__curve_name = Curve.P256
         self.__publicKey = Signature.ec_get_pubkey_by_prikey(self.__private_key, self.__curve_name)  # 33 bytes
         self.__address = Address.address_from_bytes_pubkey(self.__publicKey)  # address is a class type
+        # the key objects are built on the first signature or verification and reused afterwards.
+        self.__signature_handler = None
+        self.__private_key_object = None
+        self.__public_key_object = None
+
+    def __get_signature_handler(self) -> SignatureHandler:
+        if self.__signature_handler is None:
+            self.__signature_handler = SignatureHandler(self.__keyType, SignatureScheme.SHA256withECDSA)
+        return self.__signature_handler
+
+    def __get_private_key_object(self):
+        if self.__private_key_object is None:
+            self.__private_key_object = self.__get_signature_handler().derive_private_key(self.__private_key)
+        return self.__private_key_object
+
+    def __get_public_key_object(self):
+        if self.__public_key_object is None:
+            self.__public_key_object = self.__get_private_key_object().public_key()
+        return self.__public_key_object
 
     def generate_signature(self, msg: bytes, signature_scheme: SignatureScheme):
         if signature_scheme == SignatureScheme.SHA256withECDSA:
-            handler = SignatureHandler(self.__keyType, signature_scheme)
-            signature_value = handler.generateSignature(b2a_hex(self.__private_key), msg)
+            handler = self.__get_signature_handler()
+            signature_value = handler.generate_signature_by_key(self.__get_private_key_object(), msg)
             byte_signature = Signature(signature_scheme, signature_value).to_byte()
         else:
             raise TypeError
@@ -52,8 +71,7 @@ class Account(object):
     def verify_signature(self, msg: bytearray, signature: bytearray):
         if msg is None or signature is None:
             raise Exception(ErrorCode.param_err("param should not be None"))
-        handler = SignatureHandler(self.__keyType, self.__signature_scheme)
-        return handler.verify_signature(self.serialize_public_key(), msg, signature)
+        return SignatureHandler.verify_signature_by_key(self.__get_public_key_object(), msg, signature)
 
     def get_address(self):
         """
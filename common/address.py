@@ -2,15 +2,29 @@
 # -*- coding: utf-8 -*-
 
 import base58
+import hashlib
 from binascii import a2b_hex
+from typing import List, Tuple
 
 from ontology.vm.op_code import CHECKSIG
 from ontology.crypto.digest import Digest
+from ontology.common.memoize import get_cache
 from ontology.common.error_code import ErrorCode
 from ontology.core.program import ProgramBuilder
 from ontology.vm.params_builder import ParamsBuilder
 from ontology.exception.exception import SDKException
 
+__pubkey_address_cache__ = get_cache('address.from_pubkey')
+__b58encode_cache__ = get_cache('address.b58encode')
+__b58decode_cache__ = get_cache('address.b58decode')
+
+__b58_alphabet__ = '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+__b58_value__ = {char: value for value, char in enumerate(__b58_alphabet__)}
+# two base58 digits at a time halve the big integer operations of the bulk codec.
+__b58_pair_value__ = {high + low: 58 * __b58_value__[high] + __b58_value__[low] for high in __b58_alphabet__
+                      for low in __b58_alphabet__}
+__b58_pair__ = [high + low for high in __b58_alphabet__ for low in __b58_alphabet__]
+
 
 class Address(object):
     __COIN_VERSION = b'\x17'
@@ -24,11 +38,15 @@ class Address(object):
 
     @staticmethod
     def address_from_bytes_pubkey(public_key: bytes):
-        builder = ParamsBuilder()
-        builder.emit_push_byte_array(bytearray(public_key))
-        builder.emit(CHECKSIG)
-        addr = Address(Address.to_script_hash(builder.to_array()))
-        return addr
+        public_key = bytes(public_key)
+        script_hash = __pubkey_address_cache__.get(public_key)
+        if script_hash is None:
+            builder = ParamsBuilder()
+            builder.emit_push_byte_array(public_key)
+            builder.emit(CHECKSIG)
+            script_hash = Address.to_script_hash(builder.to_array())
+            __pubkey_address_cache__.put(public_key, script_hash)
+        return Address(script_hash)
 
     @staticmethod
     def address_from_multi_pub_keys(m: int, pub_keys: []):
@@ -44,10 +62,14 @@ class Address(object):
         return Address(Address.to_script_hash(bytearray.fromhex(code)))
 
     def b58encode(self):
-        script_builder = Address.__COIN_VERSION + self.ZERO
-        c256 = Digest.hash256(script_builder)[0:4]
-        out_byte_array = script_builder + bytearray(c256)
-        return base58.b58encode(bytes(out_byte_array)).decode('utf-8')
+        value = bytes(self.ZERO)
+        b58_address = __b58encode_cache__.get(value)
+        if b58_address is None:
+            script_builder = Address.__COIN_VERSION + value
+            c256 = Digest.hash256(script_builder)[0:4]
+            b58_address = base58.b58encode(script_builder + c256).decode('utf-8')
+            __b58encode_cache__.put(value, b58_address)
+        return b58_address
 
     def to_array(self):
         return self.ZERO
@@ -62,6 +84,9 @@ class Address(object):
 
     @staticmethod
     def b58decode(address: str):
+        value = __b58decode_cache__.get(address)
+        if value is not None:
+            return Address(value)
         data = base58.b58decode(address)
         if len(data) != 25:
             raise SDKException(ErrorCode.param_error)
@@ -70,4 +95,76 @@ class Address(object):
         checksum = Digest.hash256(data[0:21])
         if data[21:25] != checksum[0:4]:
             raise SDKException(ErrorCode.param_error)
-        return Address(data[1:21])
+        value = data[1:21]
+        __b58decode_cache__.put(address, value)
+        return Address(value)
+
+    @staticmethod
+    def b58decode_many(address_list: List[str]) -> Tuple[bytes, List[int]]:
+        """
+        This interface is used to decode a list of base58 encode addresses without stopping on invalid ones.
+
+        :param address_list: a list of base58 encode addresses.
+        :return: the 20 bytes addresses concatenated in one bytes object, with zeros in the place of the invalid
+                 addresses, and the list of indexes of the invalid addresses.
+        """
+        digit_value, pair_value = __b58_value__, __b58_pair_value__
+        version = Address.__COIN_VERSION[0]
+        sha256 = hashlib.sha256
+        zero = bytes(20)
+        value_list = list()
+        invalid_list = list()
+        for index, address in enumerate(address_list):
+            # an address never starts with '1', which would be a leading zero byte instead of the version.
+            if not isinstance(address, str) or len(address) < 2 or address[0] == '1':
+                number = -1
+            else:
+                try:
+                    start = len(address) % 2
+                    number = digit_value[address[0]] if start else 0
+                    for i in range(start, len(address), 2):
+                        number = number * 3364 + pair_value[address[i:i + 2]]
+                except KeyError:
+                    number = -1
+            if 0 <= number and number.bit_length() <= 200:
+                data = number.to_bytes(25, 'big')
+                if data[0] == version and sha256(sha256(data[:21]).digest()).digest()[:4] == data[21:]:
+                    value_list.append(data[1:21])
+                    continue
+            invalid_list.append(index)
+            value_list.append(zero)
+        return b''.join(value_list), invalid_list
+
+    @staticmethod
+    def b58encode_many(value_list: bytes or List[bytes]) -> Tuple[List[str], List[int]]:
+        """
+        This interface is used to encode a list of 20 bytes addresses into base58 without stopping on invalid ones.
+
+        :param value_list: a list of 20 bytes addresses, or the addresses concatenated in one bytes object.
+        :return: the list of base58 encode addresses, with None in the place of the invalid addresses,
+                 and the list of indexes of the invalid addresses.
+        """
+        if isinstance(value_list, (bytes, bytearray, memoryview)):
+            data = bytes(value_list)
+            if len(data) % 20 != 0:
+                raise SDKException(ErrorCode.param_err('the length of the address data should be a multiple of 20.'))
+            value_list = [data[i:i + 20] for i in range(0, len(data), 20)]
+        version = Address.__COIN_VERSION
+        pair = __b58_pair__
+        sha256 = hashlib.sha256
+        b58_list = list()
+        invalid_list = list()
+        for index, value in enumerate(value_list):
+            if not isinstance(value, (bytes, bytearray)) or len(value) != 20:
+                invalid_list.append(index)
+                b58_list.append(None)
+                continue
+            data = version + bytes(value)
+            number = int.from_bytes(data + sha256(sha256(data).digest()).digest()[:4], 'big')
+            char_list = list()
+            while number:
+                number, remainder = divmod(number, 3364)
+                char_list.append(pair[remainder])
+            char_list.reverse()
+            b58_list.append(''.join(char_list).lstrip('1'))
+        return b58_list, invalid_list
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import threading
+
+from collections import OrderedDict
+
+from ontology.common.error_code import ErrorCode
+from ontology.exception.exception import SDKException
+
+# the shared caches, by name.
+__caches__ = dict()
+__caches_lock__ = threading.Lock()
+
+
+class LRUCache(object):
+    """
+    A thread-safe, size-bounded mapping which evicts the least recently used entry and counts its hits and misses.
+
+    The cached values should be immutable, since the same object is returned to every caller.
+    """
+
+    def __init__(self, max_size: int = 4096):
+        if max_size < 1:
+            raise SDKException(ErrorCode.param_err('the max size of a cache should be positive.'))
+        self.__data = OrderedDict()
+        self.__max_size = max_size
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+
+    def __len__(self):
+        return len(self.__data)
+
+    def __contains__(self, key):
+        return key in self.__data
+
+    def get(self, key, default=None):
+        """
+        This interface is used to get a cached value and mark it as the most recently used one.
+
+        :param key: the key of the value.
+        :param default: the value returned on a miss.
+        :return: the cached value, or `default`.
+        """
+        with self.__lock:
+            try:
+                value = self.__data[key]
+            except KeyError:
+                self.__misses += 1
+                return default
+            self.__data.move_to_end(key)
+            self.__hits += 1
+            return value
+
+    def put(self, key, value):
+        """
+        This interface is used to cache a value, evicting the least recently used ones when the cache is full.
+        """
+        with self.__lock:
+            self.__data[key] = value
+            self.__data.move_to_end(key)
+            while len(self.__data) > self.__max_size:
+                self.__data.popitem(last=False)
+                self.__evictions += 1
+
+    def get_max_size(self) -> int:
+        return self.__max_size
+
+    def set_max_size(self, max_size: int):
+        if max_size < 1:
+            raise SDKException(ErrorCode.param_err('the max size of a cache should be positive.'))
+        with self.__lock:
+            self.__max_size = max_size
+            while len(self.__data) > max_size:
+                self.__data.popitem(last=False)
+                self.__evictions += 1
+
+    def clear(self):
+        with self.__lock:
+            self.__data.clear()
+
+    def stats(self) -> dict:
+        """
+        This interface is used to get the counters of the cache.
+
+        :return: a dict of hits, misses, evictions, hit_rate, size and max_size.
+        """
+        with self.__lock:
+            lookups = self.__hits + self.__misses
+            return dict(hits=self.__hits, misses=self.__misses, evictions=self.__evictions,
+                        hit_rate=self.__hits / lookups if lookups else 0.0, size=len(self.__data),
+                        max_size=self.__max_size)
+
+    def reset_stats(self):
+        with self.__lock:
+            self.__hits = 0
+            self.__misses = 0
+            self.__evictions = 0
+
+
+def get_cache(name: str, max_size: int = 4096) -> LRUCache:
+    """
+    This interface is used to get the shared cache of a name, which is created on the first call.
+
+    :param name: the name of the cache, e.g. 'address.b58encode'.
+    :param max_size: the max size of the cache when it is created.
+    :return: the cache.
+    """
+    with __caches_lock__:
+        cache = __caches__.get(name)
+        if cache is None:
+            cache = LRUCache(max_size)
+            __caches__[name] = cache
+        return cache
+
+
+def cache_stats() -> dict:
+    """
+    This interface is used to get the counters of every shared cache.
+
+    :return: a dict of the stats() of each cache, by name.
+    """
+    with __caches_lock__:
+        cache_list = list(__caches__.items())
+    return {name: cache.stats() for name, cache in cache_list}
+
+
+def clear_caches():
+    """
+    This interface is used to empty every shared cache.
+    """
+    with __caches_lock__:
+        cache_list = list(__caches__.values())
+    for cache in cache_list:
+        cache.clear()
@@ -6,8 +6,8 @@ from ontology.crypto.key_type import KeyType
 from ontology.io.binary_reader import BinaryReader
 from ontology.vm.op_code import PUSHBYTES75, PUSHBYTES1, PUSHDATA1, PUSHDATA2, PUSHDATA4, CHECKSIG, CHECKMULTISIG, PUSH1
 from ontology.io.binary_writer import BinaryWriter
+from ontology.io.memory_view_reader import MemoryViewReader
 from ontology.io.memory_stream import StreamManager
-from ontology.utils.util import bytes_reader
 from ontology.vm.params_builder import ParamsBuilder
 from ecdsa import util
 from ontology.common import define
@@ -31,28 +31,25 @@ class ProgramBuilder(object):
 
     @staticmethod
     def push_bytes(data):
-        ms = StreamManager.GetStream()
-        writer = BinaryWriter(ms)
         if len(data) == 0:
             raise ValueError("push data error: data is null")
-        if len(data) <= int.from_bytes(PUSHBYTES75, 'little') + 1 - int.from_bytes(PUSHBYTES1, 'little'):
-            num = len(data) + int.from_bytes(PUSHBYTES1, 'little') - 1
-            writer.write_byte(num)
-        elif len(data) < 0x100:
-            writer.write_byte(PUSHDATA1)
-            writer.write_uint8(len(data))
-        elif len(data) < 0x10000:
-            writer.write_byte(PUSHDATA2)
-            writer.write_uint16(len(data))
-        else:
-            writer.write_byte(PUSHDATA4)
-            writer.write_uint32(len(data))
-        writer.write_bytes(data)
-        ms.flush()
-        res = ms.ToArray()
-        StreamManager.ReleaseStream(ms)
-        res = bytes_reader(res)
-        return res
+        with StreamManager.stream() as ms:
+            writer = BinaryWriter(ms)
+            if len(data) <= int.from_bytes(PUSHBYTES75, 'little') + 1 - int.from_bytes(PUSHBYTES1, 'little'):
+                num = len(data) + int.from_bytes(PUSHBYTES1, 'little') - 1
+                writer.write_byte(num)
+            elif len(data) < 0x100:
+                writer.write_byte(PUSHDATA1)
+                writer.write_uint8(len(data))
+            elif len(data) < 0x10000:
+                writer.write_byte(PUSHDATA2)
+                writer.write_uint16(len(data))
+            else:
+                writer.write_byte(PUSHDATA4)
+                writer.write_uint32(len(data))
+            writer.write_bytes(data, unhex=False)
+            ms.flush()
+            return bytearray(ms.to_bytes())
 
     @staticmethod
     def read_bytes(reader: BinaryReader):
@@ -104,9 +101,8 @@ class ProgramBuilder(object):
 
     @staticmethod
     def get_param_info(program: bytes):
-        ms = StreamManager.GetStream(program)
-        reader = BinaryReader(ms)
         list = []
+        reader = MemoryViewReader(program)
         while True:
             try:
                 res = ProgramBuilder.read_bytes(reader)
@@ -120,9 +116,8 @@ class ProgramBuilder(object):
         length = len(program)
         end = program[length - 1]
         temp = program[:length - 1]
-        ms = StreamManager.GetStream(temp)
-        reader = BinaryReader(ms)
         info = ProgramInfo()
+        reader = MemoryViewReader(temp)
         if end == int.from_bytes(CHECKSIG, 'little'):
             pubkeys = ProgramBuilder.read_bytes(reader)
             info.set_pubkey([pubkeys])
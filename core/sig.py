@@ -3,8 +3,8 @@
 
 from ontology.io.binary_reader import BinaryReader
 from ontology.io.binary_writer import BinaryWriter
+from ontology.io.memory_view_reader import MemoryViewReader
 from ontology.io.memory_stream import StreamManager
-from ontology.utils.util import bytes_reader
 from ontology.core.program import ProgramBuilder
 
 
@@ -23,20 +23,16 @@ class Sig(object):
             verification_script = ProgramBuilder.program_from_pubkey(self.public_keys[0])
         else:
             verification_script = ProgramBuilder.program_from_multi_pubkey(self.M, self.public_keys)
-        ms = StreamManager.GetStream()
-        writer = BinaryWriter(ms)
-        writer.write_var_bytes(invoke_script)
-        writer.write_var_bytes(verification_script)
-        ms.flush()
-        res = ms.ToArray()
-        res = bytes_reader(res)
-        StreamManager.ReleaseStream(ms)
-        return res
+        with StreamManager.stream() as ms:
+            writer = BinaryWriter(ms)
+            writer.write_var_bytes(invoke_script)
+            writer.write_var_bytes(verification_script)
+            ms.flush()
+            return bytearray(ms.to_bytes())
 
     @staticmethod
     def deserialize_from(sigbytes: bytes):
-        ms = StreamManager.GetStream(sigbytes)
-        reader = BinaryReader(ms)
+        reader = MemoryViewReader(sigbytes)
         return Sig.deserialize(reader)
 
     @staticmethod
@@ -1,16 +1,25 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from binascii import b2a_hex, a2b_hex
+from binascii import b2a_hex
 
 from ontology.core.sig import Sig
 from ontology.crypto.digest import Digest
 from ontology.io.binary_writer import BinaryWriter
-from ontology.io.binary_reader import BinaryReader
+from ontology.io.memory_view_reader import MemoryViewReader
 from ontology.io.memory_stream import StreamManager
 
 
 class Transaction(object):
+    """
+    The unsigned serialization and the hash of a transaction are cached, so signing it with several
+    accounts only serializes it once. Assigning any field other than `sigs` drops the cache, while
+    in-place changes of a field (e.g. appending to the payload bytearray) require invalidate_cache().
+    """
+    __unsigned_cache = None
+    __hash_cache = None
+    __uncached_attrs = frozenset(['sigs', '_Transaction__unsigned_cache', '_Transaction__hash_cache'])
+
     def __init__(self, version=0, tx_type=None, nonce=None, gas_price=None, gas_limit=None, payer=None, payload=None,
                  attributes=None, sigs=None, hash=None):
         self.version = version
@@ -22,75 +31,80 @@ class Transaction(object):
         self.payload = payload
         self.attributes = attributes
         self.sigs = sigs  # Sig class array
-        self.hash = hash  # 32 bytes
-
-    def serialize_unsigned(self) -> bytes:
-        ms = StreamManager.GetStream()
-        writer = BinaryWriter(ms)
-        writer.write_uint8(self.version)
-        writer.write_uint8(self.tx_type)
-        writer.write_uint32(self.nonce)
-        writer.write_uint64(self.gas_price)
-        writer.write_uint64(self.gas_limit)
-        writer.write_bytes(bytes(self.payer))
-        self.serialize_exclusive_data(writer)
-        if hasattr(self, "payload"):
-            writer.write_var_bytes(bytes(self.payload))
-        writer.write_var_int(len(self.attributes))
-        ms.flush()
-        res = ms.ToArray()
-        StreamManager.ReleaseStream(ms)
-        return res
+        # the hash is derived from the fields, the argument is only kept for compatibility.
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name not in Transaction.__uncached_attrs:
+            self.invalidate_cache()
+
+    def invalidate_cache(self):
+        """
+        This interface is used to drop the cached unsigned serialization and hash of the transaction.
+        """
+        self.__unsigned_cache = None
+        self.__hash_cache = None
+
+    @property
+    def hash(self) -> bytes:
+        """
+        The 32 bytes hash of the unsigned transaction.
+        """
+        return self.hash256_bytes()
+
+    def serialize_unsigned(self, is_hex: bool = True) -> bytes:
+        if self.__unsigned_cache is None:
+            self.__unsigned_cache = self.__serialize_unsigned()
+        if is_hex:
+            return b2a_hex(self.__unsigned_cache)
+        return self.__unsigned_cache
+
+    def __serialize_unsigned(self) -> bytes:
+        with StreamManager.stream() as ms:
+            writer = BinaryWriter(ms)
+            writer.write_uint8(self.version)
+            writer.write_uint8(self.tx_type)
+            writer.write_uint32(self.nonce)
+            writer.write_uint64(self.gas_price)
+            writer.write_uint64(self.gas_limit)
+            writer.write_bytes(bytes(self.payer), unhex=False)
+            self.serialize_exclusive_data(writer)
+            if hasattr(self, "payload"):
+                writer.write_var_bytes(bytes(self.payload))
+            writer.write_var_int(len(self.attributes))
+            ms.flush()
+            return ms.to_bytes()
 
     def serialize_exclusive_data(self, writer):
         pass
 
     def hash256_explorer(self) -> str:
-        tx_serial = self.serialize_unsigned()
-        tx_serial = a2b_hex(tx_serial)
-        digest = Digest.hash256(tx_serial)
-        if isinstance(digest, bytes):
-            return b2a_hex(digest[::-1]).decode('ascii')
-        else:
-            return ''
+        return b2a_hex(self.hash256_bytes()[::-1]).decode('ascii')
 
     def hash256_bytes(self) -> bytes:
-        tx_serial = self.serialize_unsigned()
-        tx_serial = a2b_hex(tx_serial)
-        r = Digest.hash256(tx_serial, False)
-        if isinstance(r, bytes):
-            return r
-        else:
-            raise RuntimeError
+        if self.__hash_cache is None:
+            self.__hash_cache = Digest.hash256(self.serialize_unsigned(is_hex=False), False)
+        return self.__hash_cache
 
     def hash256_hex(self) -> str:
-        tx_serial = self.serialize_unsigned()
-        tx_serial = a2b_hex(tx_serial)
-        r = Digest.hash256(tx_serial, True)
-        if isinstance(r, str):
-            return r
-        else:
-            raise RuntimeError
-
-    def serialize(self, is_hex: bool = False) -> bytes:
-        ms = StreamManager.GetStream()
-        writer = BinaryWriter(ms)
-        writer.write_bytes(self.serialize_unsigned())
-        writer.write_var_int(len(self.sigs))
-        for sig in self.sigs:
-            writer.write_bytes(sig.serialize())
-        ms.flush()
-        temp = ms.ToArray()
-        StreamManager.ReleaseStream(ms)
+        return self.hash256_bytes().hex()
+
+    def serialize(self, is_hex: bool = False) -> bytes or str:
+        with StreamManager.stream() as ms:
+            writer = BinaryWriter(ms)
+            writer.write_bytes(self.serialize_unsigned(is_hex=False), unhex=False)
+            writer.write_var_int(len(self.sigs))
+            for sig in self.sigs:
+                writer.write_bytes(sig.serialize(), unhex=False)
+            ms.flush()
+            temp = ms.to_bytes()
         if is_hex:
-            return temp
-        else:
-            return a2b_hex(temp)
+            return temp.hex()
+        return temp
 
     @staticmethod
     def deserialize_from(txbytes: bytes):
-        ms = StreamManager.GetStream(txbytes)
-        reader = BinaryReader(ms)
+        reader = MemoryViewReader(txbytes)
         tx = Transaction()
         tx.version = reader.read_uint8()
         tx.tx_type = reader.read_uint8()
@@ -100,7 +114,7 @@ class Transaction(object):
         tx.payer = reader.read_bytes(20)
         tx.payload = reader.read_var_bytes()
         attri_len = reader.read_var_int()
-        if attri_len is 0:
+        if attri_len == 0:
             tx.attributes = bytearray()
         sigs_len = reader.read_var_int()
         tx.sigs = []
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import threading
+
+from typing import List
+from concurrent.futures import ProcessPoolExecutor
+
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import ec, utils
+
+from ontology.core.sig import Sig
+from ontology.common import define as Common
+from ontology.account.account import Account
+from ontology.common.memoize import LRUCache
+from ontology.common.error_code import ErrorCode
+from ontology.core.transaction import Transaction
+from ontology.exception.exception import SDKException
+from ontology.crypto.signature_scheme import SignatureScheme
+
+# the derived private key objects of a worker process of a BatchSigner, set up by its pool initializer.
+__worker_key_cache__ = None
+
+
+def get_private_key_object(private_key: bytes, key_cache: LRUCache = None) -> ec.EllipticCurvePrivateKey:
+    """
+    This interface is used to get the derived P-256 private key object of a raw private key.
+
+    :param private_key: the 32 bytes private key.
+    :param key_cache: the cache of the derived objects by raw private key, None to derive it every time.
+    :return: the private key object.
+    """
+    key = key_cache.get(private_key) if key_cache is not None else None
+    if key is None:
+        key = ec.derive_private_key(int.from_bytes(private_key, 'big'), ec.SECP256R1(), default_backend())
+        if key_cache is not None:
+            key_cache.put(private_key, key)
+    return key
+
+
+def sign_hash_list(hash_list: List[bytes], private_key_list: List[bytes],
+                   key_cache: LRUCache = None) -> List[List[bytes]]:
+    """
+    This interface is used to sign every transaction hash with every private key by SHA256withECDSA.
+
+    :param hash_list: a list of transaction hashes.
+    :param private_key_list: a list of 32 bytes private keys.
+    :param key_cache: the cache of the derived private key objects, None to derive them for this call only.
+    :return: for each hash, the list of signatures in the order of the private keys.
+    """
+    key_list = [get_private_key_object(private_key, key_cache) for private_key in private_key_list]
+    algorithm = ec.ECDSA(hashes.SHA256())
+    scheme = bytes([SignatureScheme.SHA256withECDSA.value])
+    result = list()
+    for tx_hash in hash_list:
+        sig_list = list()
+        for key in key_list:
+            r, s = utils.decode_dss_signature(key.sign(tx_hash, algorithm))
+            sig_list.append(scheme + r.to_bytes(32, 'big') + s.to_bytes(32, 'big'))
+        result.append(sig_list)
+    return result
+
+
+def _init_worker(max_cached_keys: int):
+    global __worker_key_cache__
+    __worker_key_cache__ = LRUCache(max_cached_keys)
+
+
+def _sign_in_worker(hash_list: List[bytes], private_key_list: List[bytes]) -> List[List[bytes]]:
+    return sign_hash_list(hash_list, private_key_list, __worker_key_cache__)
+
+
+class BatchSigner(object):
+    """
+    Sign a large number of transactions over a process pool.
+
+    Only the 32 bytes hash of each transaction is sent to the workers, which derive the private key objects
+    once per process and return the signatures. The derived keys are kept in a bounded LRU cache of the signer
+    and of each worker, which is dropped by close(). The Sig objects are attached to the transactions in the
+    calling process.
+
+    Usage:
+        with BatchSigner() as signer:
+            tx_list = signer.sign_transactions(tx_list, [payer])
+    """
+
+    def __init__(self, max_workers: int = None, chunk_size: int = 0, min_pool_size: int = 256,
+                 max_cached_keys: int = 64):
+        """
+        :param max_workers: the number of worker processes, by default the number of CPUs.
+        :param chunk_size: the number of transactions sent to a worker at once, 0 picks it from the batch size.
+        :param min_pool_size: batches smaller than this are signed in the calling process.
+        :param max_cached_keys: the max number of derived private keys kept by the signer and by each worker.
+        """
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        if max_workers < 1:
+            raise SDKException(ErrorCode.param_err('the number of workers should be positive.'))
+        self.__max_workers = max_workers
+        self.__chunk_size = chunk_size
+        self.__min_pool_size = min_pool_size
+        self.__max_cached_keys = max_cached_keys
+        self.__key_cache = LRUCache(max_cached_keys)
+        self.__executor = None
+        self.__lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """
+        This interface is used to shut down the worker processes and drop the derived private keys.
+        """
+        self.__key_cache.clear()
+        with self.__lock:
+            if self.__executor is not None:
+                self.__executor.shutdown()
+                self.__executor = None
+
+    def __get_executor(self) -> ProcessPoolExecutor:
+        with self.__lock:
+            if self.__executor is None:
+                self.__executor = ProcessPoolExecutor(max_workers=self.__max_workers, initializer=_init_worker,
+                                                      initargs=(self.__max_cached_keys,))
+            return self.__executor
+
+    def sign_hash_list(self, hash_list: List[bytes], private_key_list: List[bytes]) -> List[List[bytes]]:
+        """
+        This interface is used to sign every hash with every private key, over the process pool for large batches.
+
+        :param hash_list: a list of transaction hashes.
+        :param private_key_list: a list of 32 bytes private keys.
+        :return: for each hash, the list of signatures in the order of the private keys.
+        """
+        if self.__max_workers == 1 or len(hash_list) < self.__min_pool_size:
+            return sign_hash_list(hash_list, private_key_list, self.__key_cache)
+        chunk_size = self.__chunk_size
+        if chunk_size <= 0:
+            chunk_size = max(1, -(-len(hash_list) // (self.__max_workers * 4)))
+        chunk_list = [hash_list[i:i + chunk_size] for i in range(0, len(hash_list), chunk_size)]
+        executor = self.__get_executor()
+        result = list()
+        for sig_list in executor.map(_sign_in_worker, chunk_list, [private_key_list] * len(chunk_list)):
+            result.extend(sig_list)
+        return result
+
+    def sign_transactions(self, tx_list: List[Transaction], signer_list: List[Account]) -> List[Transaction]:
+        """
+        This interface is used to sign a list of transactions with the same accounts.
+
+        Each transaction gets one single signature Sig per account, in the order of the accounts, which replaces
+        the signatures it had before. It is the same as OntologySdk.sign_transaction() with the first account
+        followed by OntologySdk.add_sign_transaction() with the others.
+
+        :param tx_list: a list of Transaction objects which will be signed.
+        :param signer_list: a list of Account objects which will sign every transaction.
+        :return: the list of signed Transaction objects, in the same order.
+        """
+        if len(signer_list) == 0:
+            raise SDKException(ErrorCode.param_err('the signer list should not be empty.'))
+        if len(signer_list) > Common.TX_MAX_SIG_SIZE:
+            raise SDKException(ErrorCode.param_err('the number of transaction signatures should not be over 16'))
+        for signer in signer_list:
+            if signer.get_signature_scheme() != SignatureScheme.SHA256withECDSA:
+                raise SDKException(ErrorCode.param_err('only SHA256withECDSA is supported by the batch signer.'))
+        private_key_list = [signer.serialize_private_key() for signer in signer_list]
+        public_key_list = [signer.get_public_key_bytes() for signer in signer_list]
+        hash_list = [tx.hash256_bytes() for tx in tx_list]
+        for tx, sig_data_list in zip(tx_list, self.sign_hash_list(hash_list, private_key_list)):
+            tx.sigs = [Sig([public_key], 1, [sig_data]) for public_key, sig_data in zip(public_key_list, sig_data_list)]
+        return tx_list
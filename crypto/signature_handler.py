@@ -1,7 +1,10 @@
  #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 from binascii import b2a_hex
+from typing import List, Tuple
+from concurrent.futures import Executor
 
+from cryptography.exceptions import InvalidSignature
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives.asymmetric import ec
 from cryptography.hazmat.primitives.asymmetric import utils
@@ -9,54 +12,137 @@ from cryptography.hazmat.primitives import hashes
 import ecdsa
 from ecdsa.numbertheory import square_root_mod_prime
 from ecdsa.util import string_to_number, number_to_string
-from hashlib import sha256
-from ecdsa import ellipticcurve, VerifyingKey
+from ecdsa import ellipticcurve
 
+from ontology.common.memoize import get_cache
 from ontology.crypto.signature_scheme import SignatureScheme
 
+# the loaded P-256 public key objects of the current process.
+__public_key_cache__ = get_cache('signature.public_key')
+__uncompress_cache__ = get_cache('signature.uncompress_public_key')
+
+
+def load_public_key(public_key: bytes) -> ec.EllipticCurvePublicKey:
+    """
+    This interface is used to load a compressed or uncompressed P-256 public key into a public key object.
+    The objects are kept in a LRU cache, so a key is only decompressed and validated once.
+
+    :param public_key: the 33 bytes compressed or 65 bytes uncompressed public key.
+    :return: the public key object.
+    """
+    public_key = bytes(public_key)
+    key = __public_key_cache__.get(public_key)
+    if key is not None:
+        return key
+    if not public_key.startswith((b'\x02', b'\x03', b'\x04')):
+        raise ValueError('Invalid public key format')
+    key = ec.EllipticCurvePublicKey.from_encoded_point(ec.SECP256R1(), public_key)
+    __public_key_cache__.put(public_key, key)
+    return key
+
+
+def verify_signature_list(item_list: List[Tuple[bytes, bytes, bytes]]) -> List[bool]:
+    """
+    This interface is used to verify a list of SHA256withECDSA signatures in the current process.
+
+    :param item_list: a list of (public key, message, signature) tuples.
+    :return: whether each signature is valid, False for a malformed public key.
+    """
+    result = list()
+    for public_key, msg, signature in item_list:
+        try:
+            key = load_public_key(public_key)
+        except ValueError:
+            result.append(False)
+            continue
+        result.append(SignatureHandler.verify_signature_by_key(key, msg, signature))
+    return result
+
 
 class SignatureHandler(object):
+    __algorithms = {
+        SignatureScheme.SHA224withECDSA: (ec.SECP224R1, hashes.SHA224),
+        SignatureScheme.SHA256withECDSA: (ec.SECP256R1, hashes.SHA256),
+        SignatureScheme.SHA384withECDSA: (ec.SECP384R1, hashes.SHA384)
+    }
+
     def __init__(self, key_type, scheme):
         self.__type = key_type
         self.__scheme = scheme
 
-    def generateSignature(self, pri_key, msg:bytes):
-        if self.__scheme == SignatureScheme.SHA224withECDSA:
-            private_key = ec.derive_private_key(int(pri_key, 16), ec.SECP224R1(), default_backend())
-            signature = private_key.sign(
-                msg,
-                ec.ECDSA(hashes.SHA224())
-            )
-        elif self.__scheme == SignatureScheme.SHA256withECDSA:
-            private_key = ec.derive_private_key(int(pri_key, 16), ec.SECP256R1(), default_backend())
-            signature = private_key.sign(
-                msg,
-                ec.ECDSA(hashes.SHA256())
-            )
-        elif self.__scheme == SignatureScheme.SHA384withECDSA:
-            private_key = ec.derive_private_key(int(pri_key, 16), ec.SECP384R1(), default_backend())
-            signature = private_key.sign(
-                msg,
-                ec.ECDSA(hashes.SHA384())
-            )
-        else:
+    def __get_algorithm(self):
+        algorithm = SignatureHandler.__algorithms.get(self.__scheme)
+        if algorithm is None:
             raise RuntimeError
-        sign = SignatureHandler.dsa_der_to_plain(signature)
-        return sign
+        return algorithm
 
-    def verify_signature(self, public_key: bytes, msg: bytes, signature: bytes):
-        if public_key.startswith(b'\x02') or public_key.startswith(b'\x03'):
-            public_key = SignatureHandler.uncompress_public_key(public_key)
-        elif public_key.startswith(b'\x04'):
-            pass
-        else:
-            raise ValueError('Invalid public key format')
-        vk = ecdsa.VerifyingKey.from_string(public_key, curve=ecdsa.NIST256p)
+    def generateSignature(self, pri_key, msg:bytes):
+        private_key = self.derive_private_key(int(pri_key, 16))
+        return self.generate_signature_by_key(private_key, msg)
+
+    def derive_private_key(self, pri_key: int or bytes) -> ec.EllipticCurvePrivateKey:
+        """
+        This interface is used to build the private key object of the scheme, which can be reused to sign.
+
+        :param pri_key: the private key as an integer or as big-endian bytes.
+        :return: the private key object.
+        """
+        curve, _ = self.__get_algorithm()
+        if not isinstance(pri_key, int):
+            pri_key = int.from_bytes(pri_key, 'big')
+        return ec.derive_private_key(pri_key, curve(), default_backend())
+
+    def generate_signature_by_key(self, private_key: ec.EllipticCurvePrivateKey, msg: bytes) -> str:
+        """
+        This interface is used to sign the message with a private key object built by derive_private_key().
+
+        :return: the hexadecimal r and s of the signature.
+        """
+        _, hash_algorithm = self.__get_algorithm()
+        signature = private_key.sign(msg, ec.ECDSA(hash_algorithm()))
+        return SignatureHandler.dsa_der_to_plain(signature)
+
+    @staticmethod
+    def verify_signature_by_key(public_key: ec.EllipticCurvePublicKey, msg: bytes, signature: bytes) -> bool:
+        """
+        This interface is used to verify a SHA256withECDSA signature with a reusable public key object,
+        e.g. the public_key() of a private key object.
+
+        :param public_key: the public key object.
+        :param msg: the signed message.
+        :param signature: the signature with its scheme byte, as returned by Signature.to_byte().
+        :return: whether the signature is valid.
+        """
+        if len(signature) != 65:
+            return False
+        r = int.from_bytes(signature[1:33], 'big')
+        s = int.from_bytes(signature[33:], 'big')
         try:
-            return vk.verify(signature[1:], msg, hashfunc=sha256)
-        except Exception as e:
-            print(e)
+            public_key.verify(utils.encode_dss_signature(r, s), bytes(msg), ec.ECDSA(hashes.SHA256()))
+        except InvalidSignature:
             return False
+        return True
+
+    def verify_signature(self, public_key: bytes, msg: bytes, signature: bytes):
+        return SignatureHandler.verify_signature_by_key(load_public_key(public_key), msg, signature)
+
+    def verify_many(self, item_list: List[Tuple[bytes, bytes, bytes]], executor: Executor = None,
+                    chunk_size: int = 512) -> List[bool]:
+        """
+        This interface is used to verify a list of SHA256withECDSA signatures.
+
+        :param item_list: a list of (public key, message, signature) tuples.
+        :param executor: an optional ProcessPoolExecutor to spread the work over, each worker keeps its own key cache.
+        :param chunk_size: the number of signatures sent to a worker at once.
+        :return: whether each signature is valid, in the same order. A malformed public key gives False.
+        """
+        if executor is None or len(item_list) <= chunk_size:
+            return verify_signature_list(item_list)
+        chunk_list = [item_list[i:i + chunk_size] for i in range(0, len(item_list), chunk_size)]
+        result = list()
+        for valid_list in executor.map(verify_signature_list, chunk_list):
+            result.extend(valid_list)
+        return result
 
     @staticmethod
     def dsa_der_to_plain(signature):
@@ -76,6 +162,15 @@ class SignatureHandler(object):
         :param public_key: compressed public key
         :return: uncompressed public key
         """
+        public_key = bytes(public_key)
+        uncompressed_key = __uncompress_cache__.get(public_key)
+        if uncompressed_key is None:
+            uncompressed_key = SignatureHandler.__uncompress_public_key(public_key)
+            __uncompress_cache__.put(public_key, uncompressed_key)
+        return uncompressed_key
+
+    @staticmethod
+    def __uncompress_public_key(public_key: bytes) -> bytes:
         is_even = public_key.startswith(b'\x02')
         x = string_to_number(public_key[1:])
 
@@ -17,6 +17,46 @@ import importlib
 from ontology.common.error_code import ErrorCode
 from ontology.exception.exception import SDKException
 
+__structs__ = dict()
+
+
+def get_struct(fmt):
+    """
+    Get a precompiled struct.Struct object of the format `fmt`.
+
+    Args:
+        fmt (str): format string.
+
+    Returns:
+        struct.Struct:
+    """
+    s = __structs__.get(fmt)
+    if s is None:
+        s = __structs__[fmt] = struct.Struct(fmt)
+    return s
+
+
+BOOL = get_struct('?')
+CHAR = get_struct('c')
+INT8 = get_struct('b')
+UINT8 = get_struct('B')
+FLOAT_LE = get_struct('<f')
+FLOAT_BE = get_struct('>f')
+DOUBLE_LE = get_struct('<d')
+DOUBLE_BE = get_struct('>d')
+INT16_LE = get_struct('<h')
+INT16_BE = get_struct('>h')
+UINT16_LE = get_struct('<H')
+UINT16_BE = get_struct('>H')
+INT32_LE = get_struct('<i')
+INT32_BE = get_struct('>i')
+UINT32_LE = get_struct('<I')
+UINT32_BE = get_struct('>I')
+INT64_LE = get_struct('<q')
+INT64_BE = get_struct('>q')
+UINT64_LE = get_struct('<Q')
+UINT64_BE = get_struct('>Q')
+
 
 class BinaryReader(object):
     """docstring for BinaryReader"""
@@ -43,7 +83,10 @@ class BinaryReader(object):
         Returns:
             variable: the result according to the specified format.
         """
-        return struct.unpack(fmt, self.stream.read(length))[0]
+        return get_struct(fmt).unpack(self.stream.read(length))[0]
+
+    def __unpack(self, s):
+        return s.unpack(self.stream.read(s.size))[0]
 
     def read_byte(self, do_ord=True):
         """
@@ -80,7 +123,7 @@ class BinaryReader(object):
         Returns:
             bool:
         """
-        return self.unpack('?')
+        return self.__unpack(BOOL)
 
     def read_char(self):
         """
@@ -89,7 +132,7 @@ class BinaryReader(object):
         Returns:
             str: a single character.
         """
-        return self.unpack('c')
+        return self.__unpack(CHAR)
 
     def read_float(self, little_endian=True):
         """
@@ -101,11 +144,7 @@ class BinaryReader(object):
         Returns:
             float:
         """
-        if little_endian:
-            endian = "<"
-        else:
-            endian = ">"
-        return self.unpack("%sf" % endian, 4)
+        return self.__unpack(FLOAT_LE if little_endian else FLOAT_BE)
 
     def read_double(self, little_endian=True):
         """
@@ -117,11 +156,7 @@ class BinaryReader(object):
         Returns:
             float:
         """
-        if little_endian:
-            endian = "<"
-        else:
-            endian = ">"
-        return self.unpack("%sd" % endian, 8)
+        return self.__unpack(DOUBLE_LE if little_endian else DOUBLE_BE)
 
     def read_int8(self, little_endian=True):
         """
@@ -133,11 +168,7 @@ class BinaryReader(object):
         Returns:
             int:
         """
-        if little_endian:
-            endian = "<"
-        else:
-            endian = ">"
-        return self.unpack('%sb' % endian)
+        return self.__unpack(INT8)
 
     def read_uint8(self, little_endian=True):
         """
@@ -149,11 +180,7 @@ class BinaryReader(object):
         Returns:
             int:
         """
-        if little_endian:
-            endian = "<"
-        else:
-            endian = ">"
-        return self.unpack('%sB' % endian)
+        return self.__unpack(UINT8)
 
     def read_int16(self, little_endian=True):
         """
@@ -165,11 +192,7 @@ class BinaryReader(object):
         Returns:
             int:
         """
-        if little_endian:
-            endian = "<"
-        else:
-            endian = ">"
-        return self.unpack('%sh' % endian, 2)
+        return self.__unpack(INT16_LE if little_endian else INT16_BE)
 
     def read_uint16(self, little_endian=True):
         """
@@ -181,11 +204,7 @@ class BinaryReader(object):
         Returns:
             int:
         """
-        if little_endian:
-            endian = "<"
-        else:
-            endian = ">"
-        return self.unpack('%sH' % endian, 2)
+        return self.__unpack(UINT16_LE if little_endian else UINT16_BE)
 
     def read_int32(self, little_endian=True):
         """
@@ -197,11 +216,7 @@ class BinaryReader(object):
         Returns:
             int:
         """
-        if little_endian:
-            endian = "<"
-        else:
-            endian = ">"
-        return self.unpack('%si' % endian, 4)
+        return self.__unpack(INT32_LE if little_endian else INT32_BE)
 
     def read_uint32(self, little_endian=True):
         """
@@ -213,11 +228,7 @@ class BinaryReader(object):
         Returns:
             int:
         """
-        if little_endian:
-            endian = "<"
-        else:
-            endian = ">"
-        return self.unpack('%sI' % endian, 4)
+        return self.__unpack(UINT32_LE if little_endian else UINT32_BE)
 
     def read_int64(self, little_endian=True):
         """
@@ -229,11 +240,7 @@ class BinaryReader(object):
         Returns:
             int:
         """
-        if little_endian:
-            endian = "<"
-        else:
-            endian = ">"
-        return self.unpack('%sq' % endian, 8)
+        return self.__unpack(INT64_LE if little_endian else INT64_BE)
 
     def read_uint64(self, little_endian=True):
         """
@@ -245,11 +252,7 @@ class BinaryReader(object):
         Returns:
             int:
         """
-        if little_endian:
-            endian = "<"
-        else:
-            endian = ">"
-        return self.unpack('%sQ' % endian, 8)
+        return self.__unpack(UINT64_LE if little_endian else UINT64_BE)
 
     def read_var_int(self, max=sys.maxsize):
         """
@@ -263,17 +266,14 @@ class BinaryReader(object):
             int:
         """
         fb = self.read_byte()
-        if fb is 0:
-            return fb
-        value = 0
-        if hex(fb) == '0xfd':
-            value = self.read_uint16()
-        elif hex(fb) == '0xfe':
-            value = self.read_uint32()
-        elif hex(fb) == '0xff':
-            value = self.read_uint64()
-        else:
+        if fb < 0xfd:
             value = fb
+        elif fb == 0xfd:
+            value = self.__unpack(UINT16_LE)
+        elif fb == 0xfe:
+            value = self.__unpack(UINT32_LE)
+        else:
+            value = self.__unpack(UINT64_LE)
 
         if value > max:
             raise SDKException(ErrorCode.param_err('Invalid format'))
@@ -8,14 +8,29 @@ Usage:
     from ontology.io.memory_stream import MemoryStream
 """
 
+import threading
+
 from io import BytesIO
 from binascii import hexlify
-
-__mstreams__ = []
-__mstreams_available__ = []
+from contextlib import contextmanager
 
 
 class StreamManager:
+    """
+    A thread-safe pool of MemoryStream objects.
+
+    At most `max_pool_size` released streams are kept for reuse, the others are left to the garbage
+    collector. The number of pool hits and misses and the number of streams which have been taken but
+    not released yet are counted, see StreamManager.stats(). A stream which is not handed out, e.g. one
+    released twice, is ignored by ReleaseStream. Streams are told apart by identity only, so a stream must
+    not be released again once the pool may have handed it out to another caller.
+    """
+    __lock = threading.Lock()
+    __available = []
+    __max_pool_size = 64
+    __hits = 0
+    __misses = 0
+    __handed_out = set()
 
     @staticmethod
     def TotalBuffers():
@@ -25,7 +40,8 @@ class StreamManager:
         Returns:
             int:
         """
-        return len(__mstreams__)
+        with StreamManager.__lock:
+            return len(StreamManager.__available) + len(StreamManager.__handed_out)
 
     @staticmethod
     def GetStream(data=None):
@@ -38,23 +54,24 @@ class StreamManager:
         Returns:
             MemoryStream: instance.
         """
-        if len(__mstreams_available__) == 0:
+        with StreamManager.__lock:
+            if len(StreamManager.__available) == 0:
+                StreamManager.__misses += 1
+                mstream = None
+            else:
+                StreamManager.__hits += 1
+                mstream = StreamManager.__available.pop()
+                StreamManager.__handed_out.add(id(mstream))
+        if mstream is None:
             if data:
                 mstream = MemoryStream(data)
-                mstream.seek(0)
             else:
                 mstream = MemoryStream()
-            __mstreams__.append(mstream)
-            return mstream
-
-        mstream = __mstreams_available__.pop()
-
-        if data is not None and len(data):
-            mstream.Cleanup()
+            with StreamManager.__lock:
+                StreamManager.__handed_out.add(id(mstream))
+        elif data is not None and len(data):
             mstream.write(data)
-
         mstream.seek(0)
-
         return mstream
 
     @staticmethod
@@ -64,8 +81,68 @@ class StreamManager:
         Args:
             mstream (MemoryStream): instance.
         """
-        mstream.Cleanup()
-        __mstreams_available__.append(mstream)
+        with StreamManager.__lock:
+            # a stream released twice is left alone, whether it is in the pool or has been dropped.
+            if id(mstream) not in StreamManager.__handed_out:
+                return
+            StreamManager.__handed_out.remove(id(mstream))
+            if not mstream.closed:
+                mstream.Cleanup()
+            if mstream.closed or len(StreamManager.__available) >= StreamManager.__max_pool_size:
+                return
+            StreamManager.__available.append(mstream)
+
+    @staticmethod
+    @contextmanager
+    def stream(data=None):
+        """
+        Get a MemoryStream instance which is released when the context exits.
+
+        Usage:
+            with StreamManager.stream(data) as ms:
+                reader = BinaryReader(ms)
+
+        Args:
+            data (bytes, bytearray, BytesIO): (Optional) data to create the stream from.
+        """
+        mstream = StreamManager.GetStream(data)
+        try:
+            yield mstream
+        finally:
+            StreamManager.ReleaseStream(mstream)
+
+    get_stream = GetStream
+    release_stream = ReleaseStream
+
+    @staticmethod
+    def set_max_pool_size(size: int):
+        """
+        Set the maximum number of released streams kept for reuse.
+
+        Args:
+            size (int): the maximum pool size, 0 disables the pooling.
+        """
+        with StreamManager.__lock:
+            StreamManager.__max_pool_size = max(size, 0)
+            del StreamManager.__available[StreamManager.__max_pool_size:]
+
+    @staticmethod
+    def stats():
+        """
+        Get the counters of the StreamManager.
+
+        Returns:
+            dict: the pool hits and misses, the outstanding streams and the available streams.
+        """
+        with StreamManager.__lock:
+            return dict(hits=StreamManager.__hits, misses=StreamManager.__misses,
+                        outstanding=len(StreamManager.__handed_out), available=len(StreamManager.__available))
+
+    @staticmethod
+    def reset_stats():
+        with StreamManager.__lock:
+            StreamManager.__hits = 0
+            StreamManager.__misses = 0
 
 
 class MemoryStream(BytesIO):
@@ -117,6 +194,15 @@ class MemoryStream(BytesIO):
         """
         return hexlify(self.getvalue())
 
+    def to_bytes(self):
+        """
+        Get the raw stream data without hexlifying it.
+
+        Returns:
+            bytes: b"" object containing the data.
+        """
+        return self.getvalue()
+
     def Cleanup(self):
         """
         Cleanup the stream by truncating it to size 0.
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Description:
+    Memory View Reader
+
+Usage:
+    from ontology.io.memory_view_reader import MemoryViewReader
+"""
+
+import sys
+import struct
+
+from ontology.common.error_code import ErrorCode
+from ontology.exception.exception import SDKException
+from ontology.io.binary_reader import BinaryReader, get_struct, BOOL, CHAR, INT8, FLOAT_LE, FLOAT_BE, DOUBLE_LE, \
+    DOUBLE_BE, INT16_LE, INT16_BE, UINT16_LE, UINT16_BE, INT32_LE, INT32_BE, UINT32_LE, UINT32_BE, INT64_LE, INT64_BE, \
+    UINT64_LE, UINT64_BE
+
+
+class MemoryViewReader(BinaryReader):
+    """
+    A BinaryReader which reads from a memoryview with an offset cursor instead of a stream.
+
+    Integers are decoded in place with precompiled struct.Struct objects and `unpack_from`, so no
+    intermediate slice is allocated per field. Reading past the end of the data raises a SDKException
+    instead of returning a short value.
+    """
+
+    def __init__(self, data, offset: int = 0):
+        """
+        Create an instance.
+
+        Args:
+            data (bytes, bytearray, memoryview): the data to read from.
+            offset (int): the position of the first byte to read.
+        """
+        super(MemoryViewReader, self).__init__(None)
+        self.__view = memoryview(data).cast('B')
+        self.__offset = offset
+        self.__length = len(self.__view)
+
+    def tell(self) -> int:
+        """
+        Get the current position of the cursor.
+
+        Returns:
+            int:
+        """
+        return self.__offset
+
+    def seek(self, offset: int):
+        """
+        Move the cursor to `offset`.
+
+        Args:
+            offset (int): the new position of the cursor.
+        """
+        if offset < 0 or offset > self.__length:
+            raise SDKException(ErrorCode.param_err('seek out of range.'))
+        self.__offset = offset
+
+    def remaining(self) -> int:
+        """
+        Get the number of unread bytes.
+
+        Returns:
+            int:
+        """
+        return self.__length - self.__offset
+
+    def __advance(self, length: int) -> int:
+        offset = self.__offset
+        if length < 0 or offset + length > self.__length:
+            raise self.__end_of_data(length)
+        self.__offset = offset + length
+        return offset
+
+    def __end_of_data(self, length: int):
+        return SDKException(ErrorCode.param_err(
+            'unexpected end of data, %d bytes wanted but %d left.' % (length, self.__length - self.__offset)))
+
+    def __unpack(self, s: struct.Struct):
+        offset = self.__offset
+        end = offset + s.size
+        if end > self.__length:
+            raise self.__end_of_data(s.size)
+        self.__offset = end
+        return s.unpack_from(self.__view, offset)[0]
+
+    def unpack(self, fmt, length=1):
+        """
+        Unpack the data according to the specified format in `fmt`.
+        For more information about the `fmt` format see: https://docs.python.org/3/library/struct.html
+
+        Args:
+            fmt (str): format string.
+            length (int): amount of bytes to read.
+
+        Returns:
+            variable: the result according to the specified format.
+        """
+        s = get_struct(fmt)
+        if s.size != length:
+            raise SDKException(ErrorCode.param_err('the size of format %s is not %d.' % (fmt, length)))
+        return self.__unpack(s)
+
+    def read_byte(self, do_ord=True):
+        """
+        Read a single byte.
+        Args:
+            do_ord (bool): (default True) convert the byte to an ordinal first.
+        Returns:
+            bytes: a single byte if successful.
+        """
+        offset = self.__advance(1)
+        if do_ord:
+            return self.__view[offset]
+        return bytes(self.__view[offset:offset + 1])
+
+    def read_bytes(self, length):
+        """
+        Read the specified number of bytes.
+
+        Args:
+            length (int): number of bytes to read.
+
+        Returns:
+            bytes: `length` number of bytes.
+        """
+        offset = self.__advance(length)
+        return self.__view[offset:offset + length].tobytes()
+
+    def read_bytes_view(self, length) -> memoryview:
+        """
+        Read the specified number of bytes without copying them.
+
+        Args:
+            length (int): number of bytes to read.
+
+        Returns:
+            memoryview: a view of `length` bytes, only valid as long as the underlying data is not modified.
+        """
+        offset = self.__advance(length)
+        return self.__view[offset:offset + length]
+
+    def read_bool(self):
+        return self.__unpack(BOOL)
+
+    def read_char(self):
+        return self.__unpack(CHAR)
+
+    def read_float(self, little_endian=True):
+        return self.__unpack(FLOAT_LE if little_endian else FLOAT_BE)
+
+    def read_double(self, little_endian=True):
+        return self.__unpack(DOUBLE_LE if little_endian else DOUBLE_BE)
+
+    def read_int8(self, little_endian=True):
+        return self.__unpack(INT8)
+
+    def read_uint8(self, little_endian=True):
+        offset = self.__offset
+        if offset >= self.__length:
+            raise self.__end_of_data(1)
+        self.__offset = offset + 1
+        return self.__view[offset]
+
+    def read_int16(self, little_endian=True):
+        return self.__unpack(INT16_LE if little_endian else INT16_BE)
+
+    def read_uint16(self, little_endian=True):
+        return self.__unpack(UINT16_LE if little_endian else UINT16_BE)
+
+    def read_int32(self, little_endian=True):
+        return self.__unpack(INT32_LE if little_endian else INT32_BE)
+
+    def read_uint32(self, little_endian=True):
+        return self.__unpack(UINT32_LE if little_endian else UINT32_BE)
+
+    def read_int64(self, little_endian=True):
+        return self.__unpack(INT64_LE if little_endian else INT64_BE)
+
+    def read_uint64(self, little_endian=True):
+        return self.__unpack(UINT64_LE if little_endian else UINT64_BE)
+
+    def read_var_int(self, max=sys.maxsize):
+        """
+        Read a variable length integer.
+
+        Args:
+            max (int): (Optional) maximum value of the integer.
+
+        Returns:
+            int:
+        """
+        fb = self.read_uint8()
+        if fb < 0xfd:
+            value = fb
+        elif fb == 0xfd:
+            value = self.__unpack(UINT16_LE)
+        elif fb == 0xfe:
+            value = self.__unpack(UINT32_LE)
+        else:
+            value = self.__unpack(UINT64_LE)
+        if value > max:
+            raise SDKException(ErrorCode.param_err('Invalid format'))
+        return value
+
+    def read_str(self):
+        length = self.read_uint8()
+        return self.read_bytes(length)
+
+    def read_var_str(self, max=sys.maxsize):
+        length = self.read_var_int(max)
+        return self.read_bytes(length)
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import asyncio
+
+import aiohttp
+
+from ontology.exception.error_code import ErrorCode
+from ontology.exception.exception import SDKException
+from ontology.network.http_session import IDEMPOTENT_METHODS
+
+
+class AsyncHttpSession(object):
+    """
+    A connection-pooled, keep-alive asyncio HTTP transport shared by the asyncio RPC and RESTful clients.
+
+    At most `max_concurrency` requests are in flight at the same time, the others wait for a free slot
+    instead of opening more connections. The aiohttp session is created on first use, so the object can
+    be built outside of a running event loop.
+    """
+
+    def __init__(self, pool_size: int = 100, pool_size_per_host: int = 0, max_concurrency: int = 100,
+                 max_retries: int = 2, backoff_factor: float = 0.1, keep_alive_timeout: float = 15,
+                 timeout: float = 10):
+        """
+        :param pool_size: the maximum number of simultaneous connections, 0 means unlimited.
+        :param pool_size_per_host: the maximum number of simultaneous connections to one host, 0 means unlimited.
+        :param max_concurrency: the maximum number of requests in flight.
+        :param max_retries: how many times a failed request is retried.
+        :param backoff_factor: the sleep between retries is backoff_factor * (2 ** attempt) seconds.
+        :param keep_alive_timeout: how long an idle connection is kept alive in seconds.
+        :param timeout: the total timeout of each request in seconds.
+        """
+        self.__pool_size = pool_size
+        self.__pool_size_per_host = pool_size_per_host
+        self.__max_concurrency = max_concurrency
+        self.__max_retries = max_retries
+        self.__backoff_factor = backoff_factor
+        self.__keep_alive_timeout = keep_alive_timeout
+        self.__timeout = timeout
+        self.__session = None
+        self.__semaphore = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def __get_session(self) -> aiohttp.ClientSession:
+        if self.__session is None or self.__session.closed:
+            connector = aiohttp.TCPConnector(limit=self.__pool_size, limit_per_host=self.__pool_size_per_host,
+                                             keepalive_timeout=self.__keep_alive_timeout)
+            self.__session = aiohttp.ClientSession(connector=connector,
+                                                   timeout=aiohttp.ClientTimeout(total=self.__timeout))
+            self.__semaphore = asyncio.Semaphore(self.__max_concurrency)
+        return self.__session
+
+    def get_timeout(self) -> float:
+        return self.__timeout
+
+    async def close(self):
+        if self.__session is not None and not self.__session.closed:
+            await self.__session.close()
+        self.__session = None
+
+    async def post(self, url: str, idempotent: bool = False, **kwargs) -> (int, bytes):
+        return await self.request('POST', url, idempotent, **kwargs)
+
+    async def get(self, url: str, idempotent: bool = True, **kwargs) -> (int, bytes):
+        return await self.request('GET', url, idempotent, **kwargs)
+
+    async def request(self, method: str, url: str, idempotent: bool = None, **kwargs) -> (int, bytes):
+        """
+        This interface is used to send a request through the connection pool.
+
+        :param method: the HTTP method.
+        :param url: the url of the node.
+        :param idempotent: whether the request can be safely resent after a read error.
+                           By default it is decided by the HTTP method.
+        :return: the status code and the content of the response.
+        """
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        session = self.__get_session()
+        attempt = 0
+        while True:
+            retryable = idempotent
+            try:
+                async with self.__semaphore:
+                    async with session.request(method, url, **kwargs) as response:
+                        return response.status, await response.read()
+            except aiohttp.InvalidURL as e:
+                raise SDKException(ErrorCode.connect_err(str(e))) from None
+            except aiohttp.ClientConnectorError:
+                error = ''.join(['ConnectionError: ', url])
+                retryable = True
+            except asyncio.TimeoutError:
+                error = ''.join(['ReadTimeout: ', url])
+            except aiohttp.ClientError:
+                error = ''.join(['ConnectionError: ', url])
+            if not retryable or attempt >= self.__max_retries:
+                raise SDKException(ErrorCode.other_error(error)) from None
+            await asyncio.sleep(self.__backoff_factor * (2 ** attempt))
+            attempt += 1
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+
+from time import time
+from typing import List
+
+from Cryptodome.Random.random import randint
+
+from ontology.account.account import Account
+from ontology.smart_contract.neo_vm import NeoVm
+from ontology.core.transaction import Transaction
+from ontology.network.restful import RestfulMethod
+from ontology.network.async_http_session import AsyncHttpSession
+from ontology.exception.error_code import ErrorCode
+from ontology.exception.exception import SDKException
+from ontology.utils.transaction import ensure_bytearray_contract_address
+from ontology.smart_contract.neo_contract.abi.abi_function import AbiFunction
+from ontology.smart_contract.neo_contract.abi.build_params import BuildParams
+from ontology.smart_contract.neo_contract.invoke_function import InvokeFunction
+
+
+class AsyncRestfulClient(object):
+    """
+    The asyncio counterpart of RestfulClient, every query is a coroutine with the same name and arguments.
+    """
+
+    def __init__(self, url: str = '', session: AsyncHttpSession = None):
+        self.__url = url
+        self.__own_session = session is None
+        if session is None:
+            session = AsyncHttpSession()
+        self.__session = session
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        """
+        This interface is used to close the connection pool if it was created by this client.
+        """
+        if self.__own_session:
+            await self.__session.close()
+
+    def set_address(self, url: str):
+        self.__url = url
+
+    def get_address(self):
+        return self.__url
+
+    def set_session(self, session: AsyncHttpSession):
+        self.__session = session
+        self.__own_session = False
+
+    def get_session(self) -> AsyncHttpSession:
+        return self.__session
+
+    def connect_to_localhost(self):
+        self.set_address('http://localhost:20334')
+
+    def connect_to_test_net(self, index: int = 0):
+        if index == 0:
+            index = randint(1, 5)
+        restful_address = f'http://polaris{index}.ont.io:20334'
+        self.set_address(restful_address)
+
+    def connect_to_main_net(self, index: int = 0):
+        if index == 0:
+            index = randint(1, 3)
+        restful_address = f'http://dappnode{index}.ont.io:20334'
+        self.set_address(restful_address)
+
+    async def __post(self, url: str, data: str, idempotent: bool = False):
+        status, content = await self.__session.post(url, idempotent=idempotent, data=data)
+        return self.__parse_response(status, content)
+
+    async def __get(self, url: str):
+        status, content = await self.__session.get(url)
+        return self.__parse_response(status, content)
+
+    @staticmethod
+    def __parse_response(status: int, content: bytes):
+        if status != 200:
+            raise SDKException(ErrorCode.other_error(content.decode('utf-8')))
+        try:
+            response = json.loads(content.decode('utf-8'))
+        except json.decoder.JSONDecodeError as e:
+            raise SDKException(ErrorCode.other_error(e.args[0]))
+        if response['Error'] != 0:
+            if response['Result'] != '':
+                raise SDKException(ErrorCode.other_error(response['Result']))
+            else:
+                raise SDKException(ErrorCode.other_error(response['Desc']))
+        return response
+
+    async def __query(self, url: str, is_full: bool = False):
+        response = await self.__get(url)
+        if is_full:
+            return response
+        return response['Result']
+
+    async def get_version(self, is_full: bool = False):
+        return await self.__query(RestfulMethod.get_version(self.__url), is_full)
+
+    async def get_connection_count(self, is_full: bool = False) -> int:
+        return await self.__query(RestfulMethod.get_connection_count(self.__url), is_full)
+
+    async def get_gas_price(self, is_full: bool = False) -> int or dict:
+        response = await self.__query(RestfulMethod.get_gas_price(self.__url), True)
+        if is_full:
+            return response
+        return response['Result']['gasprice']
+
+    async def get_network_id(self, is_full: bool = False) -> int or dict:
+        return await self.__query(RestfulMethod.get_network_id(self.__url), is_full)
+
+    async def get_block_height(self, is_full: bool = False) -> int or dict:
+        return await self.__query(RestfulMethod.get_block_height(self.__url), is_full)
+
+    async def get_block_height_by_tx_hash(self, tx_hash: str, is_full: bool = False):
+        return await self.__query(RestfulMethod.get_block_height_by_tx_hash(self.__url, tx_hash), is_full)
+
+    async def get_block_count_by_tx_hash(self, tx_hash: str, is_full: bool = False):
+        response = await self.get_block_height_by_tx_hash(tx_hash, is_full=True)
+        response['Result'] += 1
+        if is_full:
+            return response
+        return response['Result']
+
+    async def get_block_count(self, is_full: bool = False) -> int or dict:
+        response = await self.get_block_height(is_full=True)
+        response['Result'] += 1
+        if is_full:
+            return response
+        return response['Result']
+
+    async def get_block_by_hash(self, block_hash: str, is_full: bool = False) -> int or dict:
+        return await self.__query(RestfulMethod.get_block_by_hash(self.__url, block_hash), is_full)
+
+    async def get_block_by_height(self, height: int, is_full: bool = False):
+        return await self.__query(RestfulMethod.get_block_by_height(self.__url, height), is_full)
+
+    async def get_balance(self, b58_address: str, is_full: bool = False):
+        return await self.__query(RestfulMethod.get_account_balance(self.__url, b58_address), is_full)
+
+    async def get_grant_ong(self, b58_address: str, is_full: bool = False):
+        response = await self.__query(RestfulMethod.get_grant_ong(self.__url, b58_address), True)
+        if is_full:
+            return response
+        return int(response['Result'])
+
+    async def get_allowance(self, asset: str, b58_from_address: str, b58_to_address: str, is_full: bool = False):
+        url = RestfulMethod.get_allowance(self.__url, asset, b58_from_address, b58_to_address)
+        return await self.__query(url, is_full)
+
+    async def get_smart_contract(self, contract_address: str, is_full: bool = False):
+        return await self.__query(RestfulMethod.get_smart_contract(self.__url, contract_address), is_full)
+
+    async def get_smart_contract_event_by_height(self, height: int, is_full: bool = False) -> List[dict]:
+        url = RestfulMethod.get_smart_contract_event_by_height(self.__url, height)
+        response = await self.__query(url, True)
+        if is_full:
+            return response
+        result = response['Result']
+        if result == '':
+            result = list()
+        return result
+
+    async def get_smart_contract_event_by_count(self, count: int, is_full: bool = False) -> List[dict]:
+        return await self.get_smart_contract_event_by_height(count - 1, is_full)
+
+    async def get_smart_contract_event_by_tx_hash(self, tx_hash: str, is_full: bool = False):
+        return await self.__query(RestfulMethod.get_smart_contract_event_by_tx_hash(self.__url, tx_hash), is_full)
+
+    async def get_storage(self, hex_contract_address: str, hex_key: str, is_full: bool = False) -> str or dict:
+        return await self.__query(RestfulMethod.get_storage(self.__url, hex_contract_address, hex_key), is_full)
+
+    async def get_transaction_by_tx_hash(self, tx_hash: str, is_full: bool = False):
+        return await self.__query(RestfulMethod.get_transaction(self.__url, tx_hash), is_full)
+
+    async def send_raw_transaction(self, tx: Transaction, is_full: bool = False):
+        hex_tx_data = tx.serialize(is_hex=True)
+        data = f'{{"Action":"sendrawtransaction", "Version":"1.0.0","Data":"{hex_tx_data}"}}'
+        url = RestfulMethod.send_transaction(self.__url)
+        response = await self.__post(url, data)
+        if is_full:
+            return response
+        return response['Result']
+
+    async def send_raw_transaction_pre_exec(self, tx: Transaction, is_full: bool = False):
+        hex_tx_data = tx.serialize(is_hex=True)
+        data = f'{{"Action":"sendrawtransaction", "Version":"1.0.0","Data":"{hex_tx_data}"}}'
+        url = RestfulMethod.send_transaction_pre_exec(self.__url)
+        response = await self.__post(url, data, idempotent=True)
+        if is_full:
+            return response
+        return response['Result']
+
+    async def get_merkle_proof(self, tx_hash: str, is_full: bool = False):
+        return await self.__query(RestfulMethod.get_merkle_proof(self.__url, tx_hash), is_full)
+
+    async def get_memory_pool_tx_count(self, is_full: bool = False):
+        return await self.__query(RestfulMethod.get_mem_pool_tx_count(self.__url), is_full)
+
+    async def get_memory_pool_tx_state(self, tx_hash: str, is_full: bool = False) -> List[dict] or dict:
+        response = await self.__query(RestfulMethod.get_mem_pool_tx_state(self.__url, tx_hash), True)
+        if is_full:
+            return response
+        return response['Result']['State']
+
+    async def send_neo_vm_transaction_pre_exec(self, contract_address: str or bytes or bytearray,
+                                               signer: Account or None, func: AbiFunction or InvokeFunction,
+                                               is_full: bool = False):
+        if isinstance(func, AbiFunction):
+            params = BuildParams.serialize_abi_function(func)
+        elif isinstance(func, InvokeFunction):
+            params = func.create_invoke_code()
+        else:
+            raise SDKException(ErrorCode.other_error('the type of func is error.'))
+        contract_address = ensure_bytearray_contract_address(contract_address)
+        tx = NeoVm.make_invoke_transaction(contract_address, params, b'', 0, 0)
+        if signer is not None:
+            tx.sign_transaction(signer)
+        return await self.send_raw_transaction_pre_exec(tx, is_full)
+
+    async def send_neo_vm_transaction(self, contract_address: str or bytes or bytearray, signer: Account or None,
+                                      payer: Account or None, gas_limit: int, gas_price: int,
+                                      func: AbiFunction or InvokeFunction, is_full: bool = False):
+        if isinstance(func, AbiFunction):
+            params = BuildParams.serialize_abi_function(func)
+        elif isinstance(func, InvokeFunction):
+            params = func.create_invoke_code()
+        else:
+            raise SDKException(ErrorCode.other_error('the type of func is error.'))
+        contract_address = ensure_bytearray_contract_address(contract_address)
+        params.append(0x67)
+        for i in contract_address:
+            params.append(i)
+        if payer is None:
+            raise SDKException(ErrorCode.param_err('payer account is None.'))
+        tx = Transaction(0, 0xd1, int(time()), gas_price, gas_limit, payer.get_address_bytes(), params, bytearray(), [])
+        tx.sign_transaction(payer)
+        if isinstance(signer, Account) and signer.get_address_base58() != payer.get_address_base58():
+            tx.add_sign_transaction(signer)
+        return await self.send_raw_transaction(tx, is_full)
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+
+from time import time
+from sys import maxsize
+from typing import List
+
+from Cryptodome.Random.random import randint
+
+from ontology.account.account import Account
+from ontology.smart_contract.neo_vm import NeoVm
+from ontology.core.transaction import Transaction
+from ontology.network.rpc import RpcClient, RpcMethod
+from ontology.network.async_http_session import AsyncHttpSession
+from ontology.exception.error_code import ErrorCode
+from ontology.exception.exception import SDKException
+from ontology.utils.transaction import ensure_bytearray_contract_address
+from ontology.smart_contract.neo_contract.abi.abi_function import AbiFunction
+from ontology.smart_contract.neo_contract.abi.build_params import BuildParams
+from ontology.smart_contract.neo_contract.invoke_function import InvokeFunction
+
+
+class AsyncRpcClient(object):
+    """
+    The asyncio counterpart of RpcClient, every query is a coroutine with the same name and arguments.
+
+    Usage:
+        async with AsyncRpcClient('http://localhost:20336') as rpc:
+            balance_list = await asyncio.gather(*[rpc.get_balance(address) for address in address_list])
+    """
+
+    def __init__(self, url: str = '', qid: int = 0, session: AsyncHttpSession = None):
+        self.__url = url
+        self.__qid = qid
+        self.__generate_qid()
+        self.__own_session = session is None
+        if session is None:
+            session = AsyncHttpSession()
+        self.__session = session
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        """
+        This interface is used to close the connection pool if it was created by this client.
+        """
+        if self.__own_session:
+            await self.__session.close()
+
+    def set_address(self, url: str):
+        self.__url = url
+
+    def get_address(self):
+        return self.__url
+
+    def set_session(self, session: AsyncHttpSession):
+        self.__session = session
+        self.__own_session = False
+
+    def get_session(self) -> AsyncHttpSession:
+        return self.__session
+
+    def __generate_qid(self):
+        if self.__qid == 0:
+            self.__qid = randint(0, maxsize)
+        return self.__qid
+
+    def connect_to_localhost(self):
+        self.set_address('http://localhost:20336')
+
+    def connect_to_test_net(self, index: int = 0):
+        if index == 0:
+            index = randint(1, 5)
+        rpc_address = f'http://polaris{index}.ont.io:20336'
+        self.set_address(rpc_address)
+
+    def connect_to_main_net(self, index: int = 0):
+        if index == 0:
+            index = randint(1, 3)
+        rpc_address = f'http://dappnode{index}.ont.io:20336'
+        self.set_address(rpc_address)
+
+    async def __post(self, url, payload):
+        header = {'Content-type': 'application/json'}
+        status, content = await self.__session.post(url, idempotent=self.__is_idempotent(payload), json=payload,
+                                                    headers=header)
+        content = self.__decode_response(status, content)
+        RpcClient.check_response_content(content)
+        return content
+
+    @staticmethod
+    def __is_idempotent(payload: dict) -> bool:
+        if payload.get('method', '') != RpcMethod.SEND_TRANSACTION:
+            return True
+        return payload.get('params', list())[1:] == [1]
+
+    @staticmethod
+    def __decode_response(status: int, content: bytes):
+        try:
+            content = content.decode('utf-8')
+        except Exception as e:
+            raise SDKException(ErrorCode.other_error(e.args[0])) from None
+        if status != 200:
+            raise SDKException(ErrorCode.other_error(content))
+        try:
+            content = json.loads(content)
+        except json.decoder.JSONDecodeError as e:
+            raise SDKException(ErrorCode.other_error(e.args[0])) from None
+        return content
+
+    async def send_batch_request(self, payload_list: List[dict]) -> List[dict]:
+        """
+        This interface is used to send several JSON-RPC requests to the node in one HTTP round trip.
+
+        :param payload_list: a list of JSON-RPC payloads, each of them should have an unique id.
+        :return: the list of JSON-RPC responses in the order of the node, without error checking.
+        """
+        header = {'Content-type': 'application/json'}
+        idempotent = all(self.__is_idempotent(payload) for payload in payload_list)
+        status, content = await self.__session.post(self.__url, idempotent=idempotent, json=payload_list,
+                                                    headers=header)
+        content = self.__decode_response(status, content)
+        if isinstance(content, dict):
+            RpcClient.check_response_content(content)
+            raise SDKException(ErrorCode.other_error('batch request is not supported by the node'))
+        return content
+
+    def generate_json_rpc_payload(self, method, param=None):
+        if param is None:
+            param = list()
+        json_rpc_payload = dict(jsonrpc=RpcMethod.RPC_VERSION, id=self.__qid, method=method, params=param)
+        return json_rpc_payload
+
+    async def __call(self, method: str, param: list = None, is_full: bool = False):
+        payload = self.generate_json_rpc_payload(method, param)
+        response = await self.__post(self.__url, payload)
+        if is_full:
+            return response
+        return response['result']
+
+    async def get_version(self, is_full: bool = False) -> dict or str:
+        return await self.__call(RpcMethod.GET_VERSION, is_full=is_full)
+
+    async def get_connection_count(self, is_full: bool = False) -> int:
+        return await self.__call(RpcMethod.GET_NODE_COUNT, is_full=is_full)
+
+    async def get_gas_price(self, is_full: bool = False) -> int or dict:
+        response = await self.__call(RpcMethod.GET_GAS_PRICE, is_full=True)
+        if is_full:
+            return response
+        return response['result']['gasprice']
+
+    async def get_network_id(self, is_full: bool = False) -> int:
+        return await self.__call(RpcMethod.GET_NETWORK_ID, is_full=is_full)
+
+    async def get_block_by_hash(self, block_hash: str, is_full: bool = False) -> dict:
+        return await self.__call(RpcMethod.GET_BLOCK, [block_hash, 1], is_full)
+
+    async def get_block_by_height(self, height: int, is_full: bool = False) -> dict:
+        return await self.__call(RpcMethod.GET_BLOCK, [height, 1], is_full)
+
+    async def get_block_count(self, is_full: bool = False) -> int or dict:
+        return await self.__call(RpcMethod.GET_BLOCK_COUNT, is_full=is_full)
+
+    async def get_block_height(self, is_full: bool = False) -> int or dict:
+        response = await self.get_block_count(is_full=True)
+        response['result'] -= 1
+        if is_full:
+            return response
+        return response['result']
+
+    async def get_block_height_by_tx_hash(self, tx_hash: str, is_full: bool = False):
+        return await self.__call(RpcMethod.GET_BLOCK_HEIGHT_BY_HASH, [tx_hash], is_full)
+
+    async def get_block_count_by_tx_hash(self, tx_hash: str, is_full: bool = False):
+        response = await self.get_block_height_by_tx_hash(tx_hash, is_full=True)
+        response['result'] += 1
+        if is_full:
+            return response
+        return response['result']
+
+    async def get_current_block_hash(self, is_full: bool = False) -> str:
+        return await self.__call(RpcMethod.GET_CURRENT_BLOCK_HASH, is_full=is_full)
+
+    async def get_block_hash_by_height(self, height: int, is_full: bool = False) -> str:
+        return await self.__call(RpcMethod.GET_BLOCK_HASH, [height, 1], is_full)
+
+    async def get_balance(self, b58_address: str, is_full: bool = False) -> dict:
+        return await self.__call(RpcMethod.GET_BALANCE, [b58_address, 1], is_full)
+
+    async def get_grant_ong(self, b58_address: str, is_full: bool = False):
+        response = await self.__call(RpcMethod.GET_GRANT_ONG, [b58_address], True)
+        if is_full:
+            return response
+        return int(response['result'])
+
+    async def get_allowance(self, asset_name: str, from_address: str, to_address: str, is_full: bool = False) -> str:
+        return await self.__call(RpcMethod.GET_ALLOWANCE, [asset_name, from_address, to_address], is_full)
+
+    async def get_storage(self, hex_contract_address: str, hex_key: str, is_full: bool = False) -> str:
+        return await self.__call(RpcMethod.GET_STORAGE, [hex_contract_address, hex_key, 1], is_full)
+
+    async def get_smart_contract_event_by_tx_hash(self, tx_hash: str, is_full: bool = False) -> dict:
+        return await self.__call(RpcMethod.GET_SMART_CONTRACT_EVENT, [tx_hash, 1], is_full)
+
+    async def get_smart_contract_event_by_height(self, height: int, is_full: bool = False) -> List[dict]:
+        response = await self.__call(RpcMethod.GET_SMART_CONTRACT_EVENT, [height, 1], True)
+        if is_full:
+            return response
+        event_list = response['result']
+        if event_list is None:
+            event_list = list()
+        return event_list
+
+    async def get_smart_contract_event_by_count(self, count: int, is_full: bool = False) -> List[dict]:
+        return await self.get_smart_contract_event_by_height(count - 1, is_full)
+
+    async def get_transaction_by_tx_hash(self, tx_hash: str, is_full: bool = False) -> dict:
+        return await self.__call(RpcMethod.GET_TRANSACTION, [tx_hash, 1], is_full)
+
+    async def get_smart_contract(self, hex_contract_address: str, is_full: bool = False) -> dict:
+        if not isinstance(hex_contract_address, str):
+            raise SDKException(ErrorCode.param_err('a hexadecimal contract address is required.'))
+        if len(hex_contract_address) != 40:
+            raise SDKException(ErrorCode.param_err('the length of the contract address should be 40 bytes.'))
+        return await self.__call(RpcMethod.GET_SMART_CONTRACT, [hex_contract_address, 1], is_full)
+
+    async def get_merkle_proof(self, tx_hash: str, is_full: bool = False) -> dict:
+        return await self.__call(RpcMethod.GET_MERKLE_PROOF, [tx_hash, 1], is_full)
+
+    async def get_memory_pool_tx_count(self, is_full: bool = False):
+        return await self.__call(RpcMethod.GET_MEM_POOL_TX_COUNT, is_full=is_full)
+
+    async def get_memory_pool_tx_state(self, tx_hash: str, is_full: bool = False):
+        response = await self.__call(RpcMethod.GET_MEM_POOL_TX_STATE, [tx_hash], True)
+        if is_full:
+            return response
+        return response['result']['State']
+
+    async def send_raw_transaction(self, tx: Transaction, is_full: bool = False) -> str:
+        tx_data = tx.serialize(is_hex=True)
+        return await self.__call(RpcMethod.SEND_TRANSACTION, [tx_data], is_full)
+
+    async def send_raw_transaction_pre_exec(self, tx: Transaction, is_full: bool = False):
+        tx_data = tx.serialize(is_hex=True)
+        return await self.__call(RpcMethod.SEND_TRANSACTION, [tx_data, 1], is_full)
+
+    async def send_neo_vm_transaction_pre_exec(self, contract_address: str or bytes or bytearray,
+                                               signer: Account or None, func: AbiFunction or InvokeFunction,
+                                               is_full: bool = False):
+        if isinstance(func, AbiFunction):
+            params = BuildParams.serialize_abi_function(func)
+        elif isinstance(func, InvokeFunction):
+            params = func.create_invoke_code()
+        else:
+            raise SDKException(ErrorCode.other_error('the type of func is error.'))
+        contract_address = ensure_bytearray_contract_address(contract_address)
+        tx = NeoVm.make_invoke_transaction(contract_address, params, b'', 0, 0)
+        if signer is not None:
+            tx.sign_transaction(signer)
+        return await self.send_raw_transaction_pre_exec(tx, is_full)
+
+    async def send_neo_vm_transaction(self, contract_address: str or bytes or bytearray, signer: Account or None,
+                                      payer: Account or None, gas_limit: int, gas_price: int,
+                                      func: AbiFunction or InvokeFunction, is_full: bool = False):
+        if isinstance(func, AbiFunction):
+            params = BuildParams.serialize_abi_function(func)
+        elif isinstance(func, InvokeFunction):
+            params = func.create_invoke_code()
+        else:
+            raise SDKException(ErrorCode.other_error('the type of func is error.'))
+        contract_address = ensure_bytearray_contract_address(contract_address)
+        params.append(0x67)
+        for i in contract_address:
+            params.append(i)
+        if payer is None:
+            raise SDKException(ErrorCode.param_err('payer account is None.'))
+        tx = Transaction(0, 0xd1, int(time()), gas_price, gas_limit, payer.get_address_bytes(), params, bytearray(), [])
+        tx.sign_transaction(payer)
+        if isinstance(signer, Account) and signer.get_address_base58() != payer.get_address_base58():
+            tx.add_sign_transaction(signer)
+        return await self.send_raw_transaction(tx, is_full)
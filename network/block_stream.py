@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import json
+import asyncio
+
+from time import sleep
+from typing import List
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from ontology.exception.error_code import ErrorCode
+from ontology.exception.exception import SDKException
+from ontology.utils.util import write_file_atomic
+from ontology.utils.contract_event import ContractEventParser
+
+
+class StreamBlock(object):
+    """
+    A block delivered by a BlockStream, together with the smart contract events of its height.
+    """
+
+    def __init__(self, height: int, block: dict, event_list: List[dict]):
+        self.height = height
+        self.block = block
+        self.event_list = event_list
+
+    @property
+    def hash(self) -> str:
+        return self.block.get('Hash', '')
+
+    @property
+    def prev_hash(self) -> str:
+        return self.block.get('Header', dict()).get('PrevBlockHash', '')
+
+    def get_notify_list(self, hex_contract_address: str = '') -> List[dict]:
+        """
+        This interface is used to get the notifies of every event in the block.
+
+        :param hex_contract_address: only the notifies of this contract are returned if it is given.
+        :return: the notifies in the order of the events.
+        """
+        notify_list = list()
+        for event in self.event_list:
+            for notify in ContractEventParser.get_notify_list(event):
+                if not hex_contract_address or notify.get('ContractAddress') == hex_contract_address:
+                    notify_list.append(notify)
+        return notify_list
+
+
+class BlockStream(object):
+    """
+    An in-order iterator over the blocks of a range of heights, which fetches a bounded window of the following
+    heights concurrently.
+
+    Heights above the current block height are only requested once the node reports them. A height which can
+    not be fetched, or a block which does not link to the previous one, is fetched again with an exponential
+    backoff. The last delivered height and hash are saved to the checkpoint file, and a stream created with the
+    same checkpoint file resumes after them.
+
+    It is a generator over a RpcClient or RpcNodePool, and an async iterator over an AsyncRpcClient.
+
+    Usage:
+        for block in BlockStream(rpc, 0, 10000):
+            notify_list = block.get_notify_list(hex_contract_address)
+        async for block in BlockStream(async_rpc, follow=True, checkpoint_path='blocks.checkpoint'):
+            ...
+    """
+
+    def __init__(self, client, start: int = 0, end: int = None, follow: bool = False, prefetch: int = 32,
+                 concurrency: int = 4, with_events: bool = True, max_retries: int = 5, retry_delay: float = 0.5,
+                 poll_interval: float = 1, checkpoint_path: str = '', checkpoint_interval: int = 100):
+        """
+        :param client: a RpcClient, RpcNodePool or AsyncRpcClient.
+        :param start: the first height.
+        :param end: the last height, by default the block height when the iteration starts.
+        :param follow: whether to keep waiting for new blocks after the end of the chain.
+        :param prefetch: the max number of heights fetched ahead of the delivered one.
+        :param concurrency: the max number of concurrent requests.
+        :param with_events: whether to fetch the smart contract events of each height.
+        :param max_retries: how many times a height is fetched again before the iteration fails.
+        :param retry_delay: the sleep between retries is retry_delay * (2 ** attempt) seconds.
+        :param poll_interval: the seconds between two queries of the block height when following the chain.
+        :param checkpoint_path: the file which the progress is saved to and resumed from.
+        :param checkpoint_interval: the number of delivered blocks between two saves of the checkpoint.
+        """
+        if prefetch < 1 or concurrency < 1:
+            raise SDKException(ErrorCode.param_err('the prefetch window and concurrency should be positive.'))
+        if end is not None and follow:
+            raise SDKException(ErrorCode.param_err('a stream which follows the chain can not have an end.'))
+        self.__client = client
+        self.__start = start
+        self.__end = end
+        self.__follow = follow
+        self.__prefetch = prefetch
+        self.__concurrency = concurrency
+        self.__with_events = with_events
+        self.__max_retries = max_retries
+        self.__retry_delay = retry_delay
+        self.__poll_interval = poll_interval
+        self.__checkpoint_path = checkpoint_path
+        self.__checkpoint_interval = max(checkpoint_interval, 1)
+        self.__height = start - 1
+        self.__hash = ''
+        self.__unsaved = 0
+        self.__load_checkpoint()
+
+    def get_checkpoint(self) -> tuple:
+        """
+        This interface is used to get the height and hash of the last delivered block.
+        """
+        return self.__height, self.__hash
+
+    def __load_checkpoint(self):
+        if not self.__checkpoint_path or not os.path.isfile(self.__checkpoint_path):
+            return
+        try:
+            with open(self.__checkpoint_path, 'r') as f:
+                checkpoint = json.load(f)
+            self.__height, self.__hash = int(checkpoint['height']), checkpoint['hash']
+        except (ValueError, KeyError, TypeError) as e:
+            raise SDKException(ErrorCode.other_error(f'invalid checkpoint: {e}')) from None
+
+    def save_checkpoint(self):
+        """
+        This interface is used to save the height and hash of the last delivered block to the checkpoint file.
+        """
+        self.__unsaved = 0
+        if not self.__checkpoint_path or not self.__hash:
+            return
+        write_file_atomic(self.__checkpoint_path, json.dumps(dict(height=self.__height, hash=self.__hash)))
+
+    def __commit(self, block: StreamBlock):
+        self.__height = block.height
+        self.__hash = block.hash
+        self.__unsaved += 1
+        if self.__unsaved >= self.__checkpoint_interval:
+            self.save_checkpoint()
+
+    def __is_linked(self, block: StreamBlock) -> bool:
+        return not self.__hash or block.prev_hash == self.__hash
+
+    def __link_error(self, block: StreamBlock) -> SDKException:
+        return SDKException(ErrorCode.other_error(f'block {block.height} does not link to block {self.__height}'))
+
+    def __window_end(self, tip: int) -> int:
+        if self.__end is not None:
+            return min(self.__end, tip)
+        return tip
+
+    def __is_finished(self, next_height: int, tip: int) -> bool:
+        if self.__end is not None:
+            return next_height > self.__end
+        return not self.__follow and next_height > tip
+
+    def __fetch(self, height: int) -> StreamBlock:
+        for attempt in range(self.__max_retries + 1):
+            try:
+                block = self.__client.get_block_by_height(height)
+                event_list = list()
+                if self.__with_events:
+                    event_list = self.__client.get_smart_contract_event_by_height(height)
+                return StreamBlock(height, block, event_list)
+            except SDKException:
+                if attempt == self.__max_retries:
+                    raise
+            sleep(self.__retry_delay * (2 ** attempt))
+
+    def __fetch_linked(self, block: StreamBlock) -> StreamBlock:
+        for attempt in range(self.__max_retries):
+            if self.__is_linked(block):
+                return block
+            sleep(self.__retry_delay * (2 ** attempt))
+            block = self.__fetch(block.height)
+        if not self.__is_linked(block):
+            raise self.__link_error(block)
+        return block
+
+    def __iter__(self):
+        next_height = self.__height + 1
+        tip = self.__client.get_block_height()
+        window = deque()
+        executor = ThreadPoolExecutor(max_workers=self.__concurrency)
+        try:
+            while True:
+                while len(window) < self.__prefetch and next_height <= self.__window_end(tip):
+                    window.append(executor.submit(self.__fetch, next_height))
+                    next_height += 1
+                if len(window) == 0:
+                    if self.__is_finished(next_height, tip):
+                        return
+                    sleep(self.__poll_interval)
+                    tip = self.__client.get_block_height()
+                    continue
+                block = self.__fetch_linked(window.popleft().result())
+                yield block
+                self.__commit(block)
+                if next_height > tip and (self.__follow or self.__end is not None):
+                    tip = self.__client.get_block_height()
+        finally:
+            for future in window:
+                future.cancel()
+            executor.shutdown(wait=False)
+            self.save_checkpoint()
+
+    async def __fetch_async(self, height: int, semaphore: asyncio.Semaphore) -> StreamBlock:
+        for attempt in range(self.__max_retries + 1):
+            try:
+                async with semaphore:
+                    block = await self.__client.get_block_by_height(height)
+                    event_list = list()
+                    if self.__with_events:
+                        event_list = await self.__client.get_smart_contract_event_by_height(height)
+                return StreamBlock(height, block, event_list)
+            except SDKException:
+                if attempt == self.__max_retries:
+                    raise
+            await asyncio.sleep(self.__retry_delay * (2 ** attempt))
+
+    async def __fetch_linked_async(self, block: StreamBlock, semaphore: asyncio.Semaphore) -> StreamBlock:
+        for attempt in range(self.__max_retries):
+            if self.__is_linked(block):
+                return block
+            await asyncio.sleep(self.__retry_delay * (2 ** attempt))
+            block = await self.__fetch_async(block.height, semaphore)
+        if not self.__is_linked(block):
+            raise self.__link_error(block)
+        return block
+
+    async def __aiter__(self):
+        next_height = self.__height + 1
+        tip = await self.__client.get_block_height()
+        window = deque()
+        semaphore = asyncio.Semaphore(self.__concurrency)
+        try:
+            while True:
+                while len(window) < self.__prefetch and next_height <= self.__window_end(tip):
+                    window.append(asyncio.ensure_future(self.__fetch_async(next_height, semaphore)))
+                    next_height += 1
+                if len(window) == 0:
+                    if self.__is_finished(next_height, tip):
+                        return
+                    await asyncio.sleep(self.__poll_interval)
+                    tip = await self.__client.get_block_height()
+                    continue
+                block = await self.__fetch_linked_async(await window.popleft(), semaphore)
+                yield block
+                self.__commit(block)
+                if next_height > tip and (self.__follow or self.__end is not None):
+                    tip = await self.__client.get_block_height()
+        finally:
+            for task in window:
+                task.cancel()
+            self.save_checkpoint()
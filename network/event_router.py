@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import asyncio
+import logging
+
+from typing import List
+
+from ontology.network.websocket import WebsocketClient
+from ontology.exception.error_code import ErrorCode
+from ontology.exception.exception import SDKException
+from ontology.utils.contract_event import ContractEventParser
+
+__logger__ = logging.getLogger(__name__)
+
+
+class EventHandler(object):
+    """
+    An async handler of an EventRouter, with the contract address and event name of the notifies it receives.
+    """
+
+    def __init__(self, handler, hex_contract_address: str = '', event_name: str = ''):
+        self.handler = handler
+        self.hex_contract_address = hex_contract_address
+        self.event_name = event_name
+        self.__hex_event_name = event_name.encode('utf-8').hex()
+
+    def is_match(self, notify: dict) -> bool:
+        if self.hex_contract_address and notify.get('ContractAddress') != self.hex_contract_address:
+            return False
+        if not self.event_name:
+            return True
+        states = notify.get('States')
+        if isinstance(states, list) and len(states) != 0:
+            states = states[0]
+        # the event name of a neo vm contract is hex encoded, while a native contract sends it as it is.
+        return states == self.event_name or states == self.__hex_event_name
+
+
+class EventRouter(object):
+    """
+    A background receive loop over the event subscription of a WebsocketClient, which dispatches every notify
+    to the handlers registered for its contract address and event name.
+
+    The node only filters by contract address, so the subscription is narrowed to the contracts of the handlers
+    unless one of them takes every contract, and the event names are matched here. The received events wait in
+    a bounded queue for the dispatch. The receive loop waits while it is full, but the WebsocketClient keeps
+    reading the connection so that the replies to its requests are not held up, and once its own queue is full
+    too it drops the oldest notifications. Those events are lost to the handlers, and counted as dropped by
+    stats(). A dropped connection is reconnected with an exponential backoff and the subscription is sent again.
+
+    Usage:
+        router = EventRouter(ws_client)
+        router.add_handler(on_transfer, hex_contract_address, 'transfer')
+        await router.start()
+    """
+
+    def __init__(self, ws_client: WebsocketClient, max_queue_size: int = 1024, workers: int = 1,
+                 reconnect_delay: float = 1, max_reconnect_delay: float = 30, error_handler=None):
+        """
+        :param ws_client: the WebsocketClient the events are subscribed on.
+        :param max_queue_size: the max number of received events waiting for the dispatch.
+        :param workers: the number of concurrent dispatches, the events are dispatched in order with one worker.
+        :param reconnect_delay: the sleep before the first reconnect in seconds, doubled on every failed attempt.
+        :param max_reconnect_delay: the max sleep between two reconnects in seconds.
+        :param error_handler: an async callable which receives the exception, notify and event of a failed handler,
+                              an exception it raises is logged and does not stop the dispatch.
+        """
+        if max_queue_size < 1 or workers < 1:
+            raise SDKException(ErrorCode.param_err('the queue size and the number of workers should be positive.'))
+        self.__client = ws_client
+        self.__max_queue_size = max_queue_size
+        self.__workers = workers
+        self.__reconnect_delay = reconnect_delay
+        self.__max_reconnect_delay = max_reconnect_delay
+        self.__error_handler = error_handler
+        self.__handler_list = list()
+        self.__queue = None
+        self.__task_list = list()
+        self.__subscribe_task_list = list()
+        self.__last_error = None
+        self.__contract_filter = None
+        self.__received = 0
+        self.__dispatched = 0
+        self.__failed = 0
+        self.__reconnects = 0
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
+
+    def add_handler(self, handler, hex_contract_address: str = '', event_name: str = '') -> EventHandler:
+        """
+        This interface is used to register an async handler, which is awaited with the notify and the event.
+
+        :param handler: an async callable like `async def handler(notify: dict, event: dict)`.
+        :param hex_contract_address: only the notifies of this contract are dispatched if it is given.
+        :param event_name: only the notifies of this event are dispatched if it is given.
+        :return: the EventHandler, which can be removed by remove_handler.
+        """
+        event_handler = EventHandler(handler, hex_contract_address, event_name)
+        self.__handler_list.append(event_handler)
+        self.__update_subscription()
+        return event_handler
+
+    def remove_handler(self, event_handler: EventHandler):
+        try:
+            self.__handler_list.remove(event_handler)
+        except ValueError:
+            raise SDKException(ErrorCode.param_err('the handler is not registered.')) from None
+        self.__update_subscription()
+
+    def get_handler_list(self) -> List[EventHandler]:
+        return list(self.__handler_list)
+
+    def get_contract_filter(self) -> List[str]:
+        """
+        This interface is used to get the contract addresses the subscription is narrowed to, empty for all.
+        """
+        if any(not event_handler.hex_contract_address for event_handler in self.__handler_list):
+            return list()
+        return sorted(set(event_handler.hex_contract_address for event_handler in self.__handler_list))
+
+    def is_running(self) -> bool:
+        return len(self.__task_list) != 0
+
+    def get_last_error(self) -> Exception or None:
+        """
+        This interface is used to get the last failure of a subscription or connection, None if there is not any.
+        """
+        return self.__last_error
+
+    def stats(self) -> dict:
+        """
+        This interface is used to get the counters of the router.
+
+        :return: a dict of received, dispatched, failed, reconnects, queued, and dropped, the number of events
+                 the WebsocketClient dropped before they were received.
+        """
+        queued = self.__queue.qsize() if self.__queue is not None else 0
+        return dict(received=self.__received, dispatched=self.__dispatched, failed=self.__failed,
+                    reconnects=self.__reconnects, queued=queued, dropped=self.__client.get_dropped_count())
+
+    def __update_subscription(self):
+        if self.is_running() and self.get_contract_filter() != self.__contract_filter:
+            task = asyncio.ensure_future(self.__subscribe())
+            task.add_done_callback(self.__on_subscribed)
+            self.__subscribe_task_list.append(task)
+
+    def __on_subscribed(self, task: asyncio.Future):
+        self.__subscribe_task_list.remove(task)
+        if task.cancelled() or task.exception() is None:
+            return
+        # the old filter is kept, so the subscription is sent again on the next change or reconnect.
+        self.__last_error = task.exception()
+        __logger__.error('the subscription of the event router failed: %s', self.__last_error)
+
+    async def __subscribe(self):
+        contract_filter = self.get_contract_filter()
+        await self.__client.subscribe(contract_filter, is_event=True)
+        self.__contract_filter = contract_filter
+
+    async def start(self):
+        """
+        This interface is used to subscribe the events and start the receive loop and the dispatch workers.
+        """
+        if self.is_running():
+            return
+        self.__queue = asyncio.Queue(self.__max_queue_size)
+        await self.__subscribe()
+        self.__task_list = [asyncio.ensure_future(self.__receive_loop())]
+        for _ in range(self.__workers):
+            self.__task_list.append(asyncio.ensure_future(self.__dispatch_loop()))
+
+    async def stop(self, drain: bool = True):
+        """
+        This interface is used to stop the receive loop, and the dispatch workers once the queue is empty.
+
+        :param drain: whether to dispatch the queued events before the workers are stopped.
+        """
+        if not self.is_running():
+            return
+        task_list, self.__task_list = self.__task_list, list()
+        task_list[0].cancel()
+        if drain:
+            await self.__queue.join()
+        task_list.extend(self.__subscribe_task_list)
+        for task in task_list:
+            task.cancel()
+        await asyncio.gather(*task_list, return_exceptions=True)
+
+    async def __reconnect(self):
+        delay = self.__reconnect_delay
+        while True:
+            await asyncio.sleep(delay)
+            try:
+                await self.__client.connect()
+                await self.__subscribe()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # a refused handshake of the websocket library is not an SDKException.
+                self.__last_error = e
+                delay = min(delay * 2, self.__max_reconnect_delay)
+                continue
+            self.__reconnects += 1
+            return
+
+    async def __receive_loop(self):
+        while True:
+            try:
+                response = await self.__client.recv_subscribe_info(is_full=True)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.__last_error = e
+                await self.__reconnect()
+                continue
+            if not isinstance(response, dict) or response.get('Action') != 'Notify' or response.get('Error') != 0:
+                continue
+            event_list = response.get('Result')
+            if isinstance(event_list, dict):
+                event_list = [event_list]
+            if not isinstance(event_list, list):
+                continue
+            for event in event_list:
+                self.__received += 1
+                await self.__queue.put(event)
+
+    async def __dispatch_loop(self):
+        while True:
+            event = await self.__queue.get()
+            try:
+                await self.__dispatch(event)
+            finally:
+                self.__queue.task_done()
+
+    async def __dispatch(self, event: dict):
+        try:
+            notify_list = ContractEventParser.get_notify_list(event)
+        except SDKException:
+            return
+        for notify in notify_list or list():
+            for event_handler in list(self.__handler_list):
+                if not event_handler.is_match(notify):
+                    continue
+                try:
+                    await event_handler.handler(notify, event)
+                    self.__dispatched += 1
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self.__failed += 1
+                    if self.__error_handler is None:
+                        continue
+                    try:
+                        await self.__error_handler(e, notify, event)
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception:
+                        __logger__.exception('the error handler of the event router failed')
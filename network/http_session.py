@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import threading
+
+from time import sleep
+
+import requests
+
+from requests.adapters import HTTPAdapter
+
+from ontology.exception.error_code import ErrorCode
+from ontology.exception.exception import SDKException
+
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS'])
+
+
+class HttpSession(object):
+    """
+    A connection-pooled, keep-alive HTTP transport shared by the RPC and RESTful clients.
+
+    Connections to the same node are reused between calls instead of paying a new TCP (and TLS)
+    handshake for every request. Requests which never reached the node (connect timeouts) are retried
+    for every method, while read errors are only retried for idempotent requests.
+    """
+    _instance_lock = threading.Lock()
+    _default = None
+
+    def __init__(self, pool_connections: int = 10, pool_maxsize: int = 10, max_retries: int = 2,
+                 backoff_factor: float = 0.1, keep_alive: bool = True, timeout: float = 10):
+        """
+        :param pool_connections: the number of per-host connection pools to cache.
+        :param pool_maxsize: the maximum number of connections kept alive in each per-host pool.
+        :param max_retries: how many times a failed request is retried.
+        :param backoff_factor: the sleep between retries is backoff_factor * (2 ** attempt) seconds.
+        :param keep_alive: whether connections should be kept alive between requests.
+        :param timeout: the connect and read timeout of each request in seconds.
+        """
+        self.__pool_connections = pool_connections
+        self.__pool_maxsize = pool_maxsize
+        self.__max_retries = max_retries
+        self.__backoff_factor = backoff_factor
+        self.__keep_alive = keep_alive
+        self.__timeout = timeout
+        self.__session = self.__create_session()
+
+    def __create_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.__pool_connections, pool_maxsize=self.__pool_maxsize)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        if not self.__keep_alive:
+            session.headers['Connection'] = 'close'
+        return session
+
+    @staticmethod
+    def get_default():
+        """
+        This interface is used to get the HttpSession shared by every client which has not been given its own.
+
+        :return: the shared HttpSession object.
+        """
+        if HttpSession._default is None:
+            with HttpSession._instance_lock:
+                if HttpSession._default is None:
+                    HttpSession._default = HttpSession()
+        return HttpSession._default
+
+    @staticmethod
+    def set_default(session):
+        with HttpSession._instance_lock:
+            HttpSession._default = session
+
+    def get_timeout(self) -> float:
+        return self.__timeout
+
+    def set_timeout(self, timeout: float):
+        self.__timeout = timeout
+
+    def close(self):
+        self.__session.close()
+
+    def post(self, url: str, idempotent: bool = False, **kwargs) -> requests.Response:
+        return self.request('POST', url, idempotent, **kwargs)
+
+    def get(self, url: str, idempotent: bool = True, **kwargs) -> requests.Response:
+        return self.request('GET', url, idempotent, **kwargs)
+
+    def request(self, method: str, url: str, idempotent: bool = None, **kwargs) -> requests.Response:
+        """
+        This interface is used to send a request through the connection pool.
+
+        :param method: the HTTP method.
+        :param url: the url of the node.
+        :param idempotent: whether the request can be safely resent after a read error.
+                           By default it is decided by the HTTP method.
+        :return: the response of the node.
+        """
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        kwargs.setdefault('timeout', self.__timeout)
+        attempt = 0
+        while True:
+            retryable = idempotent
+            try:
+                return self.__session.request(method, url, **kwargs)
+            except requests.exceptions.MissingSchema as e:
+                raise SDKException(ErrorCode.connect_err(e.args[0])) from None
+            except requests.exceptions.ConnectTimeout:
+                error = ''.join(['ConnectTimeout: ', url])
+                retryable = True
+            except requests.exceptions.ReadTimeout:
+                error = ''.join(['ReadTimeout: ', url])
+            except requests.exceptions.ConnectionError:
+                error = ''.join(['ConnectionError: ', url])
+            if not retryable or attempt >= self.__max_retries:
+                raise SDKException(ErrorCode.other_error(error)) from None
+            sleep(self.__backoff_factor * (2 ** attempt))
+            attempt += 1
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import threading
+
+from time import time, perf_counter
+from typing import List
+from concurrent.futures import ThreadPoolExecutor
+
+from ontology.account.account import Account
+from ontology.core.transaction import Transaction
+from ontology.network.http_session import HttpSession
+from ontology.network.rpc import RpcClient, MAIN_RPC_ADDRESS
+from ontology.exception.error_code import ErrorCode
+from ontology.exception.exception import SDKException
+from ontology.smart_contract.neo_contract.abi.abi_function import AbiFunction
+from ontology.smart_contract.neo_contract.invoke_function import InvokeFunction
+
+TRANSPORT_ERRORS = ('ConnectTimeout', 'ReadTimeout', 'ConnectionError')
+
+READ_METHODS = frozenset([
+    'get_version', 'get_connection_count', 'get_gas_price', 'get_network_id', 'get_block_by_hash',
+    'get_block_by_height', 'get_block_count', 'get_block_height', 'get_block_height_by_tx_hash',
+    'get_block_count_by_tx_hash', 'get_current_block_hash', 'get_block_hash_by_height', 'get_balance',
+    'get_grant_ong', 'get_allowance', 'get_storage', 'get_smart_contract_event_by_tx_hash',
+    'get_smart_contract_event_by_height', 'get_smart_contract_event_by_count', 'get_transaction_by_tx_hash',
+    'get_smart_contract', 'get_merkle_proof', 'get_memory_pool_tx_count', 'get_memory_pool_tx_state',
+    'send_raw_transaction_pre_exec', 'send_neo_vm_transaction_pre_exec'
+])
+
+
+class RpcNode(object):
+    """
+    The state of one node in a RpcNodePool.
+    """
+
+    def __init__(self, url: str, session: HttpSession = None):
+        self.client = RpcClient(url, session=session)
+        self.url = url
+        self.latency = None
+        self.block_count = 0
+        self.is_healthy = True
+        self.last_error = ''
+
+    def update_latency(self, latency: float, alpha: float):
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency = alpha * latency + (1 - alpha) * self.latency
+
+
+class RpcNodePool(object):
+    """
+    A RpcClient which spreads its requests over several nodes.
+
+    Reads are routed to the healthy node with the lowest moving average (EWMA) latency and fail over
+    to the next node on connection or timeout errors. Nodes which do not answer `getblockcount` or
+    lag behind the highest node by more than `max_block_lag` blocks are marked unhealthy until the
+    next health check, and are only tried when no healthy node is left.
+
+    Each transaction submission is pinned to one node. It only fails over on a connect timeout,
+    when the transaction is known to have never reached the node.
+
+    Usage:
+        pool = RpcNodePool(MAIN_RPC_ADDRESS)
+        balance = pool.get_balance(b58_address)
+    """
+
+    def __init__(self, url_list: List[str] = None, session: HttpSession = None, ewma_alpha: float = 0.3,
+                 max_block_lag: int = 5, check_interval: float = 30):
+        """
+        :param url_list: the RPC addresses of the nodes, by default the main net nodes.
+        :param session: the HttpSession shared by the nodes, by default HttpSession.get_default().
+        :param ewma_alpha: the weight of the newest sample in the moving average of the latency.
+        :param max_block_lag: how many blocks a node may lag behind the highest node and still be healthy.
+        :param check_interval: the seconds between two health checks, 0 disables the periodic check.
+        """
+        if url_list is None:
+            url_list = MAIN_RPC_ADDRESS
+        if len(url_list) == 0:
+            raise SDKException(ErrorCode.param_err('the url list should not be empty.'))
+        if not 0 < ewma_alpha <= 1:
+            raise SDKException(ErrorCode.param_err('the ewma alpha should be in (0, 1].'))
+        self.__node_list = [RpcNode(url, session) for url in url_list]
+        self.__ewma_alpha = ewma_alpha
+        self.__max_block_lag = max_block_lag
+        self.__check_interval = check_interval
+        self.__last_check = 0
+        self.__lock = threading.Lock()
+        self.__check_lock = threading.Lock()
+
+    def __getattr__(self, name: str):
+        if name not in READ_METHODS:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+        def read(*args, **kwargs):
+            return self.__read(name, *args, **kwargs)
+
+        read.__name__ = name
+        return read
+
+    def get_node_list(self) -> List[RpcNode]:
+        return list(self.__node_list)
+
+    def get_healthy_node_list(self) -> List[RpcNode]:
+        return [node for node in self.__node_list if node.is_healthy]
+
+    @staticmethod
+    def is_transport_error(e: SDKException, error_list: tuple = TRANSPORT_ERRORS) -> bool:
+        """
+        This interface is used to check whether an exception raised by a client means the node could not be reached.
+        """
+        if len(e.args) < 2 or not isinstance(e.args[1], str):
+            return False
+        desc = e.args[1]
+        if desc.startswith('Other Error, '):
+            desc = desc[len('Other Error, '):]
+        return desc.startswith(error_list)
+
+    def check_health(self) -> List[RpcNode]:
+        """
+        This interface is used to query the block count of every node in parallel and update their health.
+
+        :return: the list of healthy nodes.
+        """
+        with self.__check_lock:
+            with ThreadPoolExecutor(max_workers=len(self.__node_list)) as executor:
+                list(executor.map(self.__check_node, self.__node_list))
+            highest = max(node.block_count for node in self.__node_list)
+            with self.__lock:
+                for node in self.__node_list:
+                    if node.block_count == 0:
+                        node.is_healthy = False
+                    elif highest - node.block_count > self.__max_block_lag:
+                        node.is_healthy = False
+                        node.last_error = f'lagging {highest - node.block_count} blocks behind'
+                    else:
+                        node.is_healthy = True
+                self.__last_check = time()
+        return self.get_healthy_node_list()
+
+    def __check_node(self, node: RpcNode):
+        start = perf_counter()
+        try:
+            node.block_count = node.client.get_block_count()
+        except SDKException as e:
+            node.block_count = 0
+            node.last_error = e.args[-1]
+            return
+        with self.__lock:
+            node.update_latency(perf_counter() - start, self.__ewma_alpha)
+
+    def __maybe_check_health(self):
+        if self.__check_interval <= 0 or time() - self.__last_check < self.__check_interval:
+            return
+        if self.__check_lock.locked():
+            return
+        self.check_health()
+
+    def __sorted_node_list(self) -> List[RpcNode]:
+        with self.__lock:
+            return sorted(self.__node_list, key=lambda node: (not node.is_healthy, node.latency is not None,
+                                                              node.latency or 0))
+
+    def __mark_unhealthy(self, node: RpcNode, e: SDKException):
+        with self.__lock:
+            node.is_healthy = False
+            node.last_error = e.args[-1]
+
+    def __call_node(self, node: RpcNode, name: str, *args, **kwargs):
+        start = perf_counter()
+        result = getattr(node.client, name)(*args, **kwargs)
+        with self.__lock:
+            node.update_latency(perf_counter() - start, self.__ewma_alpha)
+        return result
+
+    def __read(self, name: str, *args, **kwargs):
+        self.__maybe_check_health()
+        error = None
+        for node in self.__sorted_node_list():
+            try:
+                return self.__call_node(node, name, *args, **kwargs)
+            except SDKException as e:
+                if not self.is_transport_error(e):
+                    raise
+                self.__mark_unhealthy(node, e)
+                error = e
+        raise error
+
+    def __write(self, name: str, *args, **kwargs):
+        self.__maybe_check_health()
+        error = None
+        for node in self.__sorted_node_list():
+            try:
+                return self.__call_node(node, name, *args, **kwargs)
+            except SDKException as e:
+                if not self.is_transport_error(e, ('ConnectTimeout',)):
+                    raise
+                self.__mark_unhealthy(node, e)
+                error = e
+        raise error
+
+    def send_raw_transaction(self, tx: Transaction, is_full: bool = False) -> str:
+        """
+        This interface is used to send the transaction into the network through one node.
+
+        :param tx: Transaction object in ontology Python SDK.
+        :param is_full:
+        :return: a hexadecimal transaction hash value.
+        """
+        return self.__write('send_raw_transaction', tx, is_full)
+
+    def send_neo_vm_transaction(self, contract_address: str or bytes or bytearray, signer: Account or None,
+                                payer: Account or None, gas_limit: int, gas_price: int,
+                                func: AbiFunction or InvokeFunction, is_full: bool = False):
+        return self.__write('send_neo_vm_transaction', contract_address, signer, payer, gas_limit, gas_price, func,
+                            is_full)
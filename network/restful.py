@@ -2,7 +2,6 @@
 # -*- coding: utf-8 -*-
 
 import json
-import requests
 
 from time import time
 from typing import List
@@ -12,6 +11,7 @@ from Cryptodome.Random.random import randint
 from ontology.account.account import Account
 from ontology.smart_contract.neo_vm import NeoVm
 from ontology.core.transaction import Transaction
+from ontology.network.http_session import HttpSession
 from ontology.exception.error_code import ErrorCode
 from ontology.exception.exception import SDKException
 from ontology.utils.transaction import ensure_bytearray_contract_address
@@ -114,8 +114,11 @@ class RestfulMethod(object):
 
 
 class RestfulClient(object):
-    def __init__(self, url: str = ''):
+    def __init__(self, url: str = '', session: HttpSession = None):
         self.__url = url
+        if session is None:
+            session = HttpSession.get_default()
+        self.__session = session
 
     def set_address(self, url: str):
         self.__url = url
@@ -123,6 +126,12 @@ class RestfulClient(object):
     def get_address(self):
         return self.__url
 
+    def set_session(self, session: HttpSession):
+        self.__session = session
+
+    def get_session(self) -> HttpSession:
+        return self.__session
+
     def connect_to_localhost(self):
         self.set_address('http://localhost:20334')
 
@@ -138,34 +147,16 @@ class RestfulClient(object):
         restful_address = f'http://dappnode{index}.ont.io:20334'
         self.set_address(restful_address)
 
-    def __post(self, url: str, data: str):
-        try:
-            response = requests.post(url, data=data, timeout=10)
-        except requests.exceptions.MissingSchema as e:
-            raise SDKException(ErrorCode.connect_err(e.args[0]))
-        except requests.exceptions.ConnectTimeout:
-            raise SDKException(ErrorCode.other_error(''.join(['ConnectTimeout: ', self.__url])))
-        except requests.exceptions.ConnectionError:
-            raise SDKException(ErrorCode.other_error(''.join(['ConnectionError: ', self.__url])))
-        if response.status_code != 200:
-            raise SDKException(ErrorCode.other_error(response.content.decode('utf-8')))
-        try:
-            response = json.loads(response.content.decode('utf-8'))
-        except json.decoder.JSONDecodeError as e:
-            raise SDKException(ErrorCode.other_error(e.args[0]))
-        if response['Error'] != 0:
-            raise SDKException(ErrorCode.other_error(response['Result']))
-        return response
+    def __post(self, url: str, data: str, idempotent: bool = False):
+        response = self.__session.post(url, idempotent=idempotent, data=data)
+        return self.__parse_response(response)
 
     def __get(self, url: str):
-        try:
-            response = requests.get(url, timeout=10)
-        except requests.exceptions.MissingSchema as e:
-            raise SDKException(ErrorCode.connect_err(e.args[0]))
-        except requests.exceptions.ConnectTimeout:
-            raise SDKException(ErrorCode.other_error(''.join(['ConnectTimeout: ', self.__url])))
-        except requests.exceptions.ConnectionError:
-            raise SDKException(ErrorCode.other_error(''.join(['ConnectionError: ', self.__url])))
+        response = self.__session.get(url)
+        return self.__parse_response(response)
+
+    @staticmethod
+    def __parse_response(response):
         if response.status_code != 200:
             raise SDKException(ErrorCode.other_error(response.content.decode('utf-8')))
         try:
@@ -324,7 +315,7 @@ class RestfulClient(object):
         hex_tx_data = tx.serialize(is_hex=True)
         data = f'{{"Action":"sendrawtransaction", "Version":"1.0.0","Data":"{hex_tx_data}"}}'
         url = RestfulMethod.send_transaction_pre_exec(self.__url)
-        response = self.__post(url, data)
+        response = self.__post(url, data, idempotent=True)
         if is_full:
             return response
         return response['Result']
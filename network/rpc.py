@@ -2,7 +2,6 @@
 # -*- coding: utf-8 -*-
 
 import json
-import requests
 
 from time import time
 from sys import maxsize
@@ -13,6 +12,7 @@ from Cryptodome.Random.random import randint
 from ontology.account.account import Account
 from ontology.smart_contract.neo_vm import NeoVm
 from ontology.core.transaction import Transaction
+from ontology.network.http_session import HttpSession
 from ontology.exception.error_code import ErrorCode
 from ontology.exception.exception import SDKException
 from ontology.utils.transaction import ensure_bytearray_contract_address
@@ -54,10 +54,13 @@ class RpcMethod(object):
 
 
 class RpcClient(object):
-    def __init__(self, url: str = '', qid: int = 0):
+    def __init__(self, url: str = '', qid: int = 0, session: HttpSession = None):
         self.__url = url
         self.__qid = qid
         self.__generate_qid()
+        if session is None:
+            session = HttpSession.get_default()
+        self.__session = session
 
     def set_address(self, url: str):
         self.__url = url
@@ -65,6 +68,12 @@ class RpcClient(object):
     def get_address(self):
         return self.__url
 
+    def set_session(self, session: HttpSession):
+        self.__session = session
+
+    def get_session(self) -> HttpSession:
+        return self.__session
+
     def __generate_qid(self):
         if self.__qid == 0:
             self.__qid = randint(0, maxsize)
@@ -85,19 +94,30 @@ class RpcClient(object):
         rpc_address = f'http://dappnode{index}.ont.io:20336'
         self.set_address(rpc_address)
 
-    @staticmethod
-    def __post(url, payload):
+    def __post(self, url, payload):
         header = {'Content-type': 'application/json'}
-        try:
-            response = requests.post(url, json=payload, headers=header, timeout=10)
-        except requests.exceptions.MissingSchema as e:
-            raise SDKException(ErrorCode.connect_err(e.args[0])) from None
-        except requests.exceptions.ConnectTimeout:
-            raise SDKException(ErrorCode.other_error(''.join(['ConnectTimeout: ', url]))) from None
-        except requests.exceptions.ConnectionError:
-            raise SDKException(ErrorCode.other_error(''.join(['ConnectionError: ', url]))) from None
-        except requests.exceptions.ReadTimeout:
-            raise SDKException(ErrorCode.other_error(''.join(['ReadTimeout: ', url]))) from None
+        response = self.__session.post(url, idempotent=self.__is_idempotent(payload), json=payload, headers=header)
+        return self.__parse_response(response)
+
+    def __get(self, url, payload):
+        header = {'Content-type': 'application/json'}
+        response = self.__session.get(url, params=json.dumps(payload), headers=header)
+        return self.__parse_response(response)
+
+    @staticmethod
+    def __is_idempotent(payload: dict) -> bool:
+        if payload.get('method', '') != RpcMethod.SEND_TRANSACTION:
+            return True
+        return payload.get('params', list())[1:] == [1]
+
+    @staticmethod
+    def __parse_response(response):
+        content = RpcClient.__decode_response(response)
+        RpcClient.check_response_content(content)
+        return content
+
+    @staticmethod
+    def __decode_response(response):
         try:
             content = response.content.decode('utf-8')
         except Exception as e:
@@ -108,41 +128,50 @@ class RpcClient(object):
             content = json.loads(content)
         except json.decoder.JSONDecodeError as e:
             raise SDKException(ErrorCode.other_error(e.args[0])) from None
-        if content['error'] != 0:
-            if content['result'] != '':
-                raise SDKException(ErrorCode.other_error(content['result']))
-            else:
-                raise SDKException(ErrorCode.other_error(content['desc']))
         return content
 
     @staticmethod
-    def __get(url, payload):
-        header = {'Content-type': 'application/json'}
-        try:
-            response = requests.get(url, params=json.dumps(payload), headers=header, timeout=10)
-        except requests.exceptions.MissingSchema as e:
-            raise SDKException(ErrorCode.connect_err(e.args[0]))
-        except requests.exceptions.ConnectTimeout:
-            raise SDKException(ErrorCode.other_error(''.join(['ConnectTimeout: ', url])))
-        except requests.exceptions.ConnectionError:
-            raise SDKException(ErrorCode.other_error(''.join(['ConnectionError: ', url])))
-        try:
-            content = response.content.decode('utf-8')
-        except Exception as e:
-            raise SDKException(ErrorCode.other_error(e.args[0]))
-        if response.status_code != 200:
-            raise SDKException(ErrorCode.other_error(content))
-        try:
-            content = json.loads(content)
-        except json.decoder.JSONDecodeError as e:
-            raise SDKException(ErrorCode.other_error(e.args[0]))
+    def check_response_content(content: dict):
+        if not isinstance(content, dict):
+            raise SDKException(ErrorCode.other_error('invalid response'))
         if content['error'] != 0:
             if content['result'] != '':
                 raise SDKException(ErrorCode.other_error(content['result']))
             else:
                 raise SDKException(ErrorCode.other_error(content['desc']))
+
+    def send_batch_request(self, payload_list: List[dict]) -> List[dict]:
+        """
+        This interface is used to send several JSON-RPC requests to the node in one HTTP round trip.
+
+        :param payload_list: a list of JSON-RPC payloads, each of them should have an unique id.
+        :return: the list of JSON-RPC responses in the order of the node, without error checking.
+        """
+        header = {'Content-type': 'application/json'}
+        idempotent = all(self.__is_idempotent(payload) for payload in payload_list)
+        response = self.__session.post(self.__url, idempotent=idempotent, json=payload_list, headers=header)
+        content = self.__decode_response(response)
+        if isinstance(content, dict):
+            self.check_response_content(content)
+            raise SDKException(ErrorCode.other_error('batch request is not supported by the node'))
         return content
 
+    def batch(self, max_batch_size: int = 500, is_full: bool = False):
+        """
+        This interface is used to queue several requests and send them to the node as JSON-RPC batches.
+
+        Usage:
+            with rpc.batch() as batch:
+                for b58_address in b58_address_list:
+                    batch.get_balance(b58_address)
+            balance_list = batch.results
+
+        :param max_batch_size: the maximum number of requests sent in one HTTP round trip.
+        :param is_full: whether to return the full responses instead of their results.
+        :return: a RpcBatch object.
+        """
+        return RpcBatch(self, max_batch_size, is_full)
+
     def generate_json_rpc_payload(self, method, param=None):
         if param is None:
             param = list()
@@ -507,3 +536,108 @@ class RpcClient(object):
         if isinstance(signer, Account) and signer.get_address_base58() != payer.get_address_base58():
             tx.add_sign_transaction(signer)
         return self.send_raw_transaction(tx, is_full)
+
+
+class RpcBatch(object):
+    """
+    A queue of JSON-RPC requests which are flushed to the node as batch arrays.
+
+    The results are returned in the order the requests were queued. A request which failed on the node
+    does not abort the whole batch, its result is the corresponding SDKException object instead.
+    """
+
+    def __init__(self, client: RpcClient, max_batch_size: int = 500, is_full: bool = False):
+        if max_batch_size <= 0:
+            raise SDKException(ErrorCode.param_err('the max batch size should be greater than 0.'))
+        self.__client = client
+        self.__max_batch_size = max_batch_size
+        self.__is_full = is_full
+        self.__payload_list = list()
+        self.__result_handler_list = list()
+        self.results = list()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.results = self.execute()
+
+    def __len__(self):
+        return len(self.__payload_list)
+
+    def add(self, method: str, param: list = None, result_handler=None) -> int:
+        """
+        This interface is used to queue a JSON-RPC request.
+
+        :param method: the JSON-RPC method.
+        :param param: the JSON-RPC params.
+        :param result_handler: an optional function applied on the result of the request.
+        :return: the index of the request's result.
+        """
+        self.__payload_list.append(self.__client.generate_json_rpc_payload(method, param))
+        self.__result_handler_list.append(result_handler)
+        return len(self.__payload_list) - 1
+
+    def get_balance(self, b58_address: str) -> int:
+        return self.add(RpcMethod.GET_BALANCE, [b58_address, 1])
+
+    def get_storage(self, hex_contract_address: str, hex_key: str) -> int:
+        return self.add(RpcMethod.GET_STORAGE, [hex_contract_address, hex_key, 1])
+
+    def get_block_by_height(self, height: int) -> int:
+        return self.add(RpcMethod.GET_BLOCK, [height, 1])
+
+    def get_block_by_hash(self, block_hash: str) -> int:
+        return self.add(RpcMethod.GET_BLOCK, [block_hash, 1])
+
+    def get_smart_contract_event_by_height(self, height: int) -> int:
+        return self.add(RpcMethod.GET_SMART_CONTRACT_EVENT, [height, 1],
+                        lambda event_list: list() if event_list is None else event_list)
+
+    def get_smart_contract_event_by_tx_hash(self, tx_hash: str) -> int:
+        return self.add(RpcMethod.GET_SMART_CONTRACT_EVENT, [tx_hash, 1])
+
+    def get_transaction_by_tx_hash(self, tx_hash: str) -> int:
+        return self.add(RpcMethod.GET_TRANSACTION, [tx_hash, 1])
+
+    def send_raw_transaction_pre_exec(self, tx: Transaction) -> int:
+        tx_data = tx.serialize(is_hex=True)
+        return self.add(RpcMethod.SEND_TRANSACTION, [tx_data, 1])
+
+    def execute(self) -> list:
+        """
+        This interface is used to send all the queued requests and clear the queue.
+
+        :return: the results of the queued requests in order.
+        """
+        payload_list, self.__payload_list = self.__payload_list, list()
+        handler_list, self.__result_handler_list = self.__result_handler_list, list()
+        results = list()
+        for start in range(0, len(payload_list), self.__max_batch_size):
+            chunk = payload_list[start:start + self.__max_batch_size]
+            for index, payload in enumerate(chunk):
+                payload['id'] = index
+            response_map = dict()
+            for response in self.__client.send_batch_request(chunk):
+                if isinstance(response, dict):
+                    response_map[response.get('id')] = response
+            for index, handler in enumerate(handler_list[start:start + self.__max_batch_size]):
+                results.append(self.__get_result(response_map.get(index), handler))
+        return results
+
+    def __get_result(self, response: dict or None, handler):
+        if response is None:
+            return SDKException(ErrorCode.other_error('response not found in batch'))
+        try:
+            RpcClient.check_response_content(response)
+        except SDKException as e:
+            return e
+        except KeyError:
+            return SDKException(ErrorCode.other_error('invalid response'))
+        if self.__is_full:
+            return response
+        result = response.get('result')
+        if handler is not None:
+            result = handler(result)
+        return result
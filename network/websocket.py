@@ -3,9 +3,9 @@
 
 import json
 import socket
+import asyncio
 
 from time import time
-from sys import maxsize
 from typing import List
 from websockets import client
 from Cryptodome.Random.random import randint
@@ -20,16 +20,42 @@ from ontology.smart_contract.neo_contract.abi.abi_function import AbiFunction
 from ontology.smart_contract.neo_contract.abi.build_params import BuildParams
 from ontology.smart_contract.neo_contract.invoke_function import InvokeFunction
 
+MAX_WS_ID = 2 ** 53
+
 
 class WebsocketClient(object):
-    def __init__(self, url: str = ''):
+    """
+    A websocket client which multiplexes concurrent requests over a single connection.
+
+    Every request is stamped with its own Id, a background reader task routes the replies to the
+    awaiting requests by Id, and the messages which answer no request (subscription notifications)
+    are put into a separate queue consumed by recv_subscribe_info. The queue is bounded, and when it
+    is full the oldest notification is dropped so that the replies are never held up.
+    """
+
+    def __init__(self, url: str = '', timeout: float = None, max_subscribe_queue_size: int = 1024):
+        """
+        :param url: the websocket address of the node.
+        :param timeout: how long a request waits for its reply in seconds, None means forever.
+        :param max_subscribe_queue_size: the max number of notifications waiting for recv_subscribe_info.
+        """
+        if max_subscribe_queue_size < 1:
+            raise SDKException(ErrorCode.param_err('the size of the subscribe queue should be positive.'))
         self.__url = url
+        self.__timeout = timeout
         self.__id = 0
         self.__ws_client = None
-
-    def __generate_ws_id(self):
-        if self.__id == 0:
-            self.__id = randint(0, maxsize)
+        self.__reader_task = None
+        self.__connect_lock = None
+        self.__pending = dict()
+        self.__subscribe_queue = None
+        self.__max_subscribe_queue_size = max_subscribe_queue_size
+        self.__dropped = 0
+
+    def __generate_ws_id(self) -> int:
+        if self.__id == 0 or self.__id >= MAX_WS_ID:
+            self.__id = randint(1, MAX_WS_ID // 2)
+        self.__id += 1
         return self.__id
 
     def set_address(self, url: str):
@@ -38,6 +64,12 @@ class WebsocketClient(object):
     def get_address(self):
         return self.__url
 
+    def get_dropped_count(self) -> int:
+        """
+        This interface is used to get the number of notifications dropped because the subscribe queue was full.
+        """
+        return self.__dropped
+
     def connect_to_localhost(self):
         self.set_address('http://localhost:20335')
 
@@ -54,51 +86,112 @@ class WebsocketClient(object):
         self.set_address(restful_address)
 
     async def connect(self):
+        await self.close_connect()
         try:
             self.__ws_client = await client.connect(self.__url)
         except ConnectionAbortedError as e:
             raise SDKException(ErrorCode.other_error(e.args[1])) from None
         except socket.gaierror as e:
             raise SDKException(ErrorCode.other_error(e.args[1])) from None
+        if self.__subscribe_queue is None:
+            self.__subscribe_queue = asyncio.Queue(self.__max_subscribe_queue_size)
+        self.__reader_task = asyncio.ensure_future(self.__read_loop(self.__ws_client))
 
     async def close_connect(self):
+        if self.__reader_task is not None:
+            self.__reader_task.cancel()
+            self.__reader_task = None
+        self.__fail_pending('ConnectionClosed: ' + self.__url)
         if isinstance(self.__ws_client, client.WebSocketClientProtocol) and not self.__ws_client.closed:
             await self.__ws_client.close()
 
-    async def __send_recv(self, msg: dict, is_full: bool):
-        if self.__ws_client is None or self.__ws_client.closed:
-            await self.connect()
-        await self.__ws_client.send(json.dumps(msg))
-        response = await self.__ws_client.recv()
-        response = json.loads(response)
+    async def __ensure_connected(self):
+        if self.__connect_lock is None:
+            self.__connect_lock = asyncio.Lock()
+        async with self.__connect_lock:
+            if self.__ws_client is None or self.__ws_client.closed or self.__reader_task is None \
+                    or self.__reader_task.done():
+                await self.connect()
+
+    async def __read_loop(self, ws_client):
+        try:
+            while True:
+                response = await ws_client.recv()
+                try:
+                    response = json.loads(response)
+                except json.decoder.JSONDecodeError as e:
+                    self.__put_subscribe_info(SDKException(ErrorCode.other_error(e.args[0])))
+                    continue
+                future = self.__pending.pop(self.__get_response_id(response), None)
+                if future is None:
+                    self.__put_subscribe_info(response)
+                elif not future.done():
+                    future.set_result(response)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            error = ''.join(['ConnectionClosed: ', self.__url, ', ', str(e)])
+        self.__fail_pending(error)
+        self.__put_subscribe_info(SDKException(ErrorCode.other_error(error)))
+
+    def __put_subscribe_info(self, response: dict or SDKException):
+        if self.__subscribe_queue.full():
+            self.__subscribe_queue.get_nowait()
+            self.__dropped += 1
+        self.__subscribe_queue.put_nowait(response)
+
+    def __fail_pending(self, error: str):
+        pending, self.__pending = self.__pending, dict()
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(SDKException(ErrorCode.other_error(error)))
+
+    @staticmethod
+    def __get_response_id(response) -> int or None:
+        if not isinstance(response, dict):
+            return None
+        try:
+            return int(response.get('Id'))
+        except (TypeError, ValueError):
+            return None
+
+    @staticmethod
+    def __parse_response(response: dict, is_full: bool):
         if is_full:
             return response
         if response['Error'] != 0:
             raise SDKException(ErrorCode.other_error(response.get('Result', '')))
         return response.get('Result', dict())
 
+    async def __send_recv(self, msg: dict, is_full: bool):
+        await self.__ensure_connected()
+        ws_id = self.__generate_ws_id()
+        msg['Id'] = ws_id
+        future = asyncio.get_event_loop().create_future()
+        self.__pending[ws_id] = future
+        try:
+            await self.__ws_client.send(json.dumps(msg))
+            response = await asyncio.wait_for(future, self.__timeout)
+        except asyncio.TimeoutError:
+            raise SDKException(ErrorCode.other_error(''.join(['ReadTimeout: ', self.__url]))) from None
+        finally:
+            self.__pending.pop(ws_id, None)
+        return self.__parse_response(response, is_full)
+
     async def send_heartbeat(self, is_full: bool = False):
-        if self.__id == 0:
-            self.__id = self.__generate_ws_id()
-        msg = dict(Action='heartbeat', Version='V1.0.0', Id=self.__id)
+        msg = dict(Action='heartbeat', Version='V1.0.0')
         return await self.__send_recv(msg, is_full)
 
     async def get_connection_count(self, is_full: bool = False) -> int:
-        if self.__id == 0:
-            self.__id = self.__generate_ws_id()
-        msg = dict(Action='getconnectioncount', Id=self.__id, Version='1.0.0')
+        msg = dict(Action='getconnectioncount', Version='1.0.0')
         return await self.__send_recv(msg, is_full)
 
     async def get_session_count(self, is_full: bool = False):
-        if self.__id == 0:
-            self.__id = self.__generate_ws_id()
-        msg = dict(Action='getsessioncount', Id=self.__id, Version='1.0.0')
+        msg = dict(Action='getsessioncount', Version='1.0.0')
         return await self.__send_recv(msg, is_full)
 
     async def get_balance(self, b58_address: str, is_full: bool = False):
-        if self.__id == 0:
-            self.__id = self.__generate_ws_id()
-        msg = dict(Action='getbalance', Id=self.__id, Version='1.0.0', Addr=b58_address)
+        msg = dict(Action='getbalance', Version='1.0.0', Addr=b58_address)
         response = await self.__send_recv(msg, is_full=True)
         response['Result'] = dict((k, int(v)) for k, v in response['Result'].items())
         if is_full:
@@ -106,97 +199,84 @@ class WebsocketClient(object):
         return response['Result']
 
     async def get_merkle_proof(self, tx_hash: str, is_full: bool = False):
-        if self.__id == 0:
-            self.__id = self.__generate_ws_id()
-        msg = dict(Action='getmerkleproof', Id=self.__id, Version='1.0.0', Hash=tx_hash, Raw=0)
+        msg = dict(Action='getmerkleproof', Version='1.0.0', Hash=tx_hash, Raw=0)
         return await self.__send_recv(msg, is_full)
 
     async def get_storage(self, hex_contract_address: str, key: str, is_full: bool = False):
-        if self.__id == 0:
-            self.__id = self.__generate_ws_id()
-        msg = dict(Action='getstorage', Id=self.__id, Version='1.0.0', Hash=hex_contract_address, Key=key)
+        msg = dict(Action='getstorage', Version='1.0.0', Hash=hex_contract_address, Key=key)
         return await self.__send_recv(msg, is_full)
 
     async def get_smart_contract(self, hex_contract_address: str, is_full: bool = False):
-        if self.__id == 0:
-            self.__id = self.__generate_ws_id()
-        msg = dict(Action='getcontract', Id=self.__id, Version='1.0.0', Hash=hex_contract_address, Raw=0)
+        msg = dict(Action='getcontract', Version='1.0.0', Hash=hex_contract_address, Raw=0)
         response = await self.__send_recv(msg, is_full=True)
         if is_full:
             return response
         return response['Result']
 
     async def get_smart_contract_event_by_tx_hash(self, tx_hash: str, is_full: bool = False) -> dict:
-        if self.__id == 0:
-            self.__id = self.__generate_ws_id()
-        msg = dict(Action='getsmartcodeeventbyhash', Id=self.__id, Version='1.0.0', Hash=tx_hash, Raw=0)
+        msg = dict(Action='getsmartcodeeventbyhash', Version='1.0.0', Hash=tx_hash, Raw=0)
         return await self.__send_recv(msg, is_full)
 
     async def get_smart_contract_event_by_height(self, height: int, is_full: bool = False):
-        if self.__id == 0:
-            self.__id = self.__generate_ws_id()
-        msg = dict(Action='getsmartcodeeventbyheight', Id=self.__id, Version='1.0.0', Height=height)
+        msg = dict(Action='getsmartcodeeventbyheight', Version='1.0.0', Height=height)
         return await self.__send_recv(msg, is_full)
 
     async def get_block_height(self, is_full: bool = False) -> dict:
-        if self.__id == 0:
-            self.__id = self.__generate_ws_id()
-        msg = dict(Action='getblockheight', Id=self.__id, Version='1.0.0')
+        msg = dict(Action='getblockheight', Version='1.0.0')
         return await self.__send_recv(msg, is_full)
 
     async def get_block_height_by_tx_hash(self, tx_hash: str, is_full: bool = False):
-        if self.__id == 0:
-            self.__id = self.__generate_ws_id()
-        msg = dict(Action='getblockheightbytxhash', Id=self.__id, Version='1.0.0', Hash=tx_hash)
+        msg = dict(Action='getblockheightbytxhash', Version='1.0.0', Hash=tx_hash)
         return await self.__send_recv(msg, is_full)
 
     async def get_block_hash_by_height(self, height: int, is_full: bool = False):
-        if self.__id == 0:
-            self.__id = self.__generate_ws_id()
-        msg = dict(Action='getblockhash', Id=self.__id, Version='1.0.0', Height=height)
+        msg = dict(Action='getblockhash', Version='1.0.0', Height=height)
         return await self.__send_recv(msg, is_full)
 
     async def get_block_by_height(self, height: int, is_full: bool = False) -> dict:
-        if self.__id == 0:
-            self.__id = self.__generate_ws_id()
-        msg = dict(Action='getblockbyheight', Version='1.0.0', Id=self.__id, Raw=0, Height=height)
+        msg = dict(Action='getblockbyheight', Version='1.0.0', Raw=0, Height=height)
         return await self.__send_recv(msg, is_full)
 
     async def get_block_by_hash(self, block_hash: str, is_full: bool = False) -> dict:
-        if self.__id == 0:
-            self.__id = self.__generate_ws_id()
-        msg = dict(Action='getblockbyhash', Version='1.0.0', Id=self.__id, Hash=block_hash)
+        msg = dict(Action='getblockbyhash', Version='1.0.0', Hash=block_hash)
         return await self.__send_recv(msg, is_full)
 
     async def subscribe(self, contract_address_list: List[str] or str, is_event: bool = False,
                         is_json_block: bool = False,
                         is_raw_block: bool = False, is_tx_hash: bool = False, is_full: bool = False) -> dict:
-        if self.__id == 0:
-            self.__id = self.__generate_ws_id()
         if isinstance(contract_address_list, str):
             contract_address_list = [contract_address_list]
-        msg = dict(Action='subscribe', Version='1.0.0', Id=self.__id, ConstractsFilter=contract_address_list,
+        msg = dict(Action='subscribe', Version='1.0.0', ConstractsFilter=contract_address_list,
                    SubscribeEvent=is_event, SubscribeJsonBlock=is_json_block, SubscribeRawBlock=is_raw_block,
                    SubscribeBlockTxHashs=is_tx_hash)
         return await self.__send_recv(msg, is_full)
 
     async def recv_subscribe_info(self, is_full: bool = False):
-        response = await self.__ws_client.recv()
-        response = json.loads(response)
-        if is_full:
-            return response
-        if response['Error'] != 0:
-            raise SDKException(ErrorCode.other_error(response.get('Result', '')))
-        return response.get('Result', dict())
+        """
+        This interface is used to receive the next subscription notification.
+
+        The notifications are queued by the background reader, so replies of concurrent requests
+        are never mistaken for them. Once the connection is closed and the queued notifications are
+        received, every call raises at once, since the subscription is gone with the connection and
+        should be sent again, which also reconnects.
+        """
+        if self.__subscribe_queue is None:
+            await self.__ensure_connected()
+        elif self.__subscribe_queue.empty() and (self.__reader_task is None or self.__reader_task.done()):
+            raise SDKException(ErrorCode.other_error(''.join(['ConnectionClosed: ', self.__url])))
+        response = await self.__subscribe_queue.get()
+        if isinstance(response, SDKException):
+            raise response
+        return self.__parse_response(response, is_full)
 
     async def send_raw_transaction(self, tx: Transaction, is_full: bool = False):
         tx_data = tx.serialize(is_hex=True)
-        msg = dict(Action='sendrawtransaction', Version='1.0.0', Id=self.__id, PreExec='0', Data=tx_data)
+        msg = dict(Action='sendrawtransaction', Version='1.0.0', PreExec='0', Data=tx_data)
         return await self.__send_recv(msg, is_full)
 
     async def send_raw_transaction_pre_exec(self, tx: Transaction, is_full: bool = False):
         tx_data = tx.serialize(is_hex=True)
-        msg = dict(Action='sendrawtransaction', Version='1.0.0', Id=self.__id, PreExec='1', Data=tx_data)
+        msg = dict(Action='sendrawtransaction', Version='1.0.0', PreExec='1', Data=tx_data)
         return await self.__send_recv(msg, is_full)
 
     async def send_neo_vm_transaction_pre_exec(self, contract_address: str or bytes or bytearray,
@@ -3,10 +3,13 @@
 
 import threading
 
+from typing import List
+
 from ontology.crypto.signature_handler import SignatureHandler
 
 from ontology.core.sig import Sig
 from ontology.crypto.key_type import KeyType
+from ontology.crypto.batch_signer import BatchSigner
 from ontology.rpc.rpc import RpcClient
 from ontology.common import define as Common
 from ontology.account.account import Account
@@ -79,6 +82,20 @@ class OntologySdk(object):
         tx.sigs = sig
         return tx
 
+    @staticmethod
+    def sign_transactions(tx_list: List[Transaction], signer_list: List[Account], max_workers: int = None) -> \
+            List[Transaction]:
+        """
+        This interface is used to sign a list of transactions with the same accounts over a process pool.
+
+        :param tx_list: a list of Transaction objects which will be signed.
+        :param signer_list: a list of Account objects which will sign every transaction.
+        :param max_workers: the number of worker processes, by default the number of CPUs.
+        :return: the list of signed Transaction objects, in the same order.
+        """
+        with BatchSigner(max_workers) as signer:
+            return signer.sign_transactions(tx_list, signer_list)
+
     @staticmethod
     def add_sign_transaction(tx: Transaction, signer: Account):
         """
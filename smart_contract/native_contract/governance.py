@@ -10,6 +10,7 @@ from ontology.core.transaction import Transaction
 from ontology.io.binary_reader import BinaryReader
 from ontology.io.binary_writer import BinaryWriter
 from ontology.io.memory_stream import StreamManager
+from ontology.io.memory_view_reader import MemoryViewReader
 from ontology.vm.build_vm import build_native_invoke_code
 from ontology.wallet.identity import Identity
 
@@ -245,11 +246,9 @@ class Governance(object):
         res = self.__sdk.rpc.get_storage(contract_address.hex(), key.hex())
         if res is None or res == '':
             return None
-        stream = StreamManager.GetStream(bytearray.fromhex(res))
-        reader = BinaryReader(stream)
         total_stake = TotalStake()
+        reader = MemoryViewReader(bytearray.fromhex(res))
         total_stake.deserialize(reader)
-        stream.close()
         return total_stake
 
     def get_peer_attributes(self, peer_pubkey: str):
@@ -262,10 +261,8 @@ class Governance(object):
         if res is None or res == '':
             return None
         peer_attributes = PeerAttributes()
-        stream = StreamManager.GetStream(bytearray.fromhex(res))
-        reader = BinaryReader(stream)
+        reader = MemoryViewReader(bytearray.fromhex(res))
         peer_attributes.deserialize(reader)
-        stream.close()
         return peer_attributes.to_json()
 
     def get_split_fee_address(self, address: str):
@@ -278,10 +275,8 @@ class Governance(object):
         if res is None or res == '':
             return None
         split_fee_address = SplitFeeAddress()
-        stream = StreamManager.GetStream(bytearray.fromhex(res))
-        reader = BinaryReader(stream)
+        reader = MemoryViewReader(bytearray.fromhex(res))
         split_fee_address.deserialize(reader)
-        stream.close()
         return split_fee_address.to_json()
 
     def get_peer_info(self, peer_pubkey: str):
@@ -296,24 +291,21 @@ class Governance(object):
         view = self.__sdk.rpc.get_storage(contract_address.hex(), self.GOVERNANCE_VIEW.encode().hex())
         if view is None or view == '':
             return None
-        stream = StreamManager.GetStream(bytearray.fromhex(view))
-        reader = BinaryReader(stream)
         governance_view = GovernanceView()
+        reader = MemoryViewReader(bytearray.fromhex(view))
         governance_view.deserialize(reader)
-        stream.close()
-        stream2 = StreamManager.GetStream()
-        writer = BinaryWriter(stream2)
-        writer.write_int32(governance_view.view)
-        view_bytes = stream2.ToArray()
+        with StreamManager.stream() as stream2:
+            writer = BinaryWriter(stream2)
+            writer.write_int32(governance_view.view)
+            view_bytes = stream2.to_bytes()
         peer_pool_bytes = self.PEER_POOL.encode('utf-8')
-        key_bytes = peer_pool_bytes + a2b_hex(view_bytes)
+        key_bytes = peer_pool_bytes + view_bytes
         value = self.__sdk.rpc.get_storage(contract_address.hex(), key_bytes.hex())
         if value is None or value == '':
             return None
-        stream3 = StreamManager.GetStream(bytearray.fromhex(value))
-        reader2 = BinaryReader(stream3)
-        length = reader2.read_int32()
         peer_pool_map = {}
+        reader2 = MemoryViewReader(bytearray.fromhex(value))
+        length = reader2.read_int32()
         for i in range(length):
             item = PeerPoolItem()
             item.deserialize(reader2)
@@ -334,9 +326,8 @@ class Governance(object):
         res = self.__sdk.rpc.get_storage(contract_address.hex(), key.hex())
         if res is None or res == '':
             return None
-        stream = StreamManager.GetStream(bytearray.fromhex(res))
-        reader = BinaryReader(stream)
         authorize_info = AuthorizeInfo()
+        reader = MemoryViewReader(bytearray.fromhex(res))
         authorize_info.deserialize(reader)
         return authorize_info.to_json()
 
@@ -6,8 +6,7 @@ from ontology.core.transaction import Transaction
 from ontology.crypto.key_type import KeyType
 from ontology.common.address import Address
 from ontology.common.define import *
-from ontology.io.memory_stream import StreamManager
-from ontology.io.binary_reader import BinaryReader
+from ontology.io.memory_view_reader import MemoryViewReader
 from ontology.crypto.curve import Curve
 from binascii import b2a_hex, a2b_hex
 
@@ -360,8 +359,7 @@ class OntId(object):
         """
         if ddo == "":
             return dict()
-        ms = StreamManager.GetStream(a2b_hex(ddo))
-        reader = BinaryReader(ms)
+        reader = MemoryViewReader(a2b_hex(ddo))
         try:
             public_key_bytes = reader.read_var_bytes()
         except Exception as e:
@@ -376,8 +374,7 @@ class OntId(object):
             recovery_bytes = bytearray()
         pubKey_list = []
         if len(public_key_bytes) != 0:
-            ms = StreamManager.GetStream(public_key_bytes)
-            reader2 = BinaryReader(ms)
+            reader2 = MemoryViewReader(public_key_bytes)
             while True:
                 try:
                     index = reader2.read_int32()
@@ -397,8 +394,7 @@ class OntId(object):
                     break
         attribute_list = []
         if len(attribute_bytes) != 0:
-            ms = StreamManager.GetStream(attribute_bytes)
-            reader2 = BinaryReader(ms)
+            reader2 = MemoryViewReader(attribute_bytes)
 
             while True:
                 try:
@@ -226,17 +226,20 @@ class Oep4(object):
         :return: the hexadecimal transaction hash value.
         """
         func = self.__abi_info.get_function('transferMulti')
-        for index in range(len(args)):
-            item = args[index]
+        for item in args:
             Oep4.__b58_address_check(item[0])
             Oep4.__b58_address_check(item[1])
             if not isinstance(item[2], float) or isinstance(item[2], int):
                 raise SDKException(ErrorCode.param_err('the data type of value should be number.'))
             if item[2] < 0:
                 raise SDKException(ErrorCode.param_err('the value should be equal or great than 0.'))
-            from_address_array = Address.b58decode(item[0]).to_array()
-            to_address_array = Address.b58decode(item[1]).to_array()
-            args[index] = [from_address_array, to_address_array, self.__to_int_according_to_decimal(item[2])]
+        address_data, invalid_list = Address.b58decode_many([b58_address for item in args for b58_address in item[:2]])
+        if len(invalid_list) != 0:
+            raise SDKException(ErrorCode.param_err(f'invalid base58 encode address in args[{invalid_list[0] // 2}].'))
+        for index in range(len(args)):
+            from_address_array = address_data[40 * index:40 * index + 20]
+            to_address_array = address_data[40 * index + 20:40 * index + 40]
+            args[index] = [from_address_array, to_address_array, self.__to_int_according_to_decimal(args[index][2])]
         func.set_params_value((args,))
         params = BuildParams.serialize_abi_function(func)
         unix_time_now = int(time.time())
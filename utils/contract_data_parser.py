@@ -6,12 +6,9 @@ import binascii
 from typing import List
 
 from ontology.common.address import Address
-from ontology.io.binary_reader import BinaryReader
-from ontology.io.memory_stream import StreamManager
 from ontology.exception.error_code import ErrorCode
 from ontology.exception.exception import SDKException
-from ontology.smart_contract.neo_contract.abi.struct_type import Struct
-from ontology.smart_contract.neo_contract.abi.build_params import BuildParams
+from ontology.vm.stack_item import deserialize_stack_item, MAX_STACK_ITEM_DEPTH, MAX_STACK_ITEM_COUNT
 
 
 class ContractDataParser(object):
@@ -103,14 +100,24 @@ class ContractDataParser(object):
 
     @staticmethod
     def to_b58_address_list(hex_str_list: list) -> List[bytes]:
-        for index in range(len(hex_str_list)):
-            item = hex_str_list[index]
+        bytes_index_list = list()
+        bytes_address_list = list()
+        for index, item in enumerate(hex_str_list):
             if isinstance(item, list):
                 hex_str_list[index] = ContractDataParser.to_b58_address_list(item)
             elif isinstance(item, str):
-                hex_str_list[index] = ContractDataParser.to_b58_address(item)
+                try:
+                    bytes_address_list.append(binascii.a2b_hex(item))
+                except binascii.Error as e:
+                    raise SDKException(ErrorCode.other_error(e.args[0]))
+                bytes_index_list.append(index)
             else:
                 raise SDKException(ErrorCode.other_error('invalid data'))
+        b58_address_list, invalid_list = Address.b58encode_many(bytes_address_list)
+        for invalid_index in invalid_list:
+            b58_address_list[invalid_index] = Address(bytes_address_list[invalid_index]).b58encode()
+        for index, b58_address in zip(bytes_index_list, b58_address_list):
+            hex_str_list[index] = b58_address
         return hex_str_list
 
     @staticmethod
@@ -135,52 +142,19 @@ class ContractDataParser(object):
         return hex_str_list
 
     @staticmethod
-    def to_dict(item_serialize: str):
-        stream = StreamManager.GetStream(bytearray.fromhex(item_serialize))
-        reader = BinaryReader(stream)
-        return ContractDataParser.__deserialize_stack_item(reader)
-
-    @staticmethod
-    def __deserialize_stack_item(reader: BinaryReader):
-        t = reader.read_byte()
-        if t == BuildParams.Type.bytearray_type.value:
-            b = reader.read_var_bytes()
-            return b
-        elif t == BuildParams.Type.bool_type.value:
-            return reader.read_bool()
-        elif t == BuildParams.Type.int_type.value:
-            b = reader.read_var_bytes()
-            return ContractDataParser.__big_int_from_bytes(bytearray(b))
-        elif t == BuildParams.Type.struct_type.value or t == BuildParams.Type.array_type.value:
-            count = reader.read_var_int()
-            item_list = list()
-            for i in range(count):
-                item = ContractDataParser.__deserialize_stack_item(reader)
-                item_list.append(item)
-            if t == BuildParams.Type.struct_type.value:
-                return Struct(item_list)
-            return item_list
-        elif t == BuildParams.Type.dict_type.value:
-            count = reader.read_var_int()
-            item_dict = dict()
-            for i in range(count):
-                key = ContractDataParser.__deserialize_stack_item(reader)
-                value = ContractDataParser.__deserialize_stack_item(reader)
-                item_dict[key] = value
-            return item_dict
-        else:
-            raise SDKException(ErrorCode.other_error('type error'))
+    def to_dict(item_serialize: str, max_depth: int = MAX_STACK_ITEM_DEPTH, max_count: int = MAX_STACK_ITEM_COUNT):
+        """
+        This interface is used to decode a hex serialized NeoVM stack item, e.g. a map returned by pre-exec.
 
-    @staticmethod
-    def __big_int_from_bytes(ba: bytearray):
-        if len(ba) == 0:
-            return 0
-        ba_temp = ba[:]
-        ba_temp.reverse()
-        if ba_temp[0] >> 7 == 1:
-            res = int.from_bytes(ba_temp, 'big', signed=True)
-            return res
-        return int.from_bytes(ba_temp, 'big', signed=True)
+        :param item_serialize: the hex serialized stack item.
+        :param max_depth: the max nesting depth of arrays, structs and maps.
+        :param max_count: the max number of items in total.
+        """
+        try:
+            data = binascii.a2b_hex(item_serialize)
+        except ValueError as e:
+            raise SDKException(ErrorCode.other_error(e.args[0]))
+        return deserialize_stack_item(data, max_depth, max_count)
 
     @staticmethod
     def parser_oep4_transfer_notify(notify: dict):
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from typing import List, Dict, Tuple
+
+from ontology.common.address import Address
+from ontology.common.define import NATIVE_TRANSFER, ONT_CONTRACT_ADDRESS, ONG_CONTRACT_ADDRESS
+from ontology.exception.error_code import ErrorCode
+from ontology.exception.exception import SDKException
+from ontology.utils.contract_event import ContractEventParser
+
+ONT_NOTIFY_ADDRESS = ONT_CONTRACT_ADDRESS[::-1].hex()
+ONG_NOTIFY_ADDRESS = ONG_CONTRACT_ADDRESS[::-1].hex()
+
+HEX_TRANSFER = NATIVE_TRANSFER.encode('ascii').hex()
+
+
+class TransferRecords(object):
+    """
+    Decoded transfers in columns: the hex contract address, the 20 bytes from and to addresses, the amount and
+    the hash of the transaction of each transfer.
+    """
+
+    def __init__(self):
+        self.contract_list = list()
+        self.from_list = list()
+        self.to_list = list()
+        self.amount_list = list()
+        self.tx_hash_list = list()
+
+    def __len__(self):
+        return len(self.amount_list)
+
+    def __iter__(self):
+        return zip(self.contract_list, self.from_list, self.to_list, self.amount_list, self.tx_hash_list)
+
+    def __getitem__(self, index: int) -> tuple:
+        return (self.contract_list[index], self.from_list[index], self.to_list[index], self.amount_list[index],
+                self.tx_hash_list[index])
+
+    def append_columns(self, hex_contract_address: str, from_list: List[bytes], to_list: List[bytes],
+                       amount_list: List[int], tx_hash_list: List[str]):
+        """
+        This interface is used to append the transfers of one contract.
+        """
+        if not len(from_list) == len(to_list) == len(amount_list) == len(tx_hash_list):
+            raise SDKException(ErrorCode.param_err('the columns of the transfers should have the same length.'))
+        self.contract_list.extend([hex_contract_address] * len(amount_list))
+        self.from_list.extend(from_list)
+        self.to_list.extend(to_list)
+        self.amount_list.extend(amount_list)
+        self.tx_hash_list.extend(tx_hash_list)
+
+    def extend(self, records):
+        self.contract_list.extend(records.contract_list)
+        self.from_list.extend(records.from_list)
+        self.to_list.extend(records.to_list)
+        self.amount_list.extend(records.amount_list)
+        self.tx_hash_list.extend(records.tx_hash_list)
+
+    def get_b58_from_list(self) -> List[str]:
+        return Address.b58encode_many(self.from_list)[0]
+
+    def get_b58_to_list(self) -> List[str]:
+        return Address.b58encode_many(self.to_list)[0]
+
+
+def decode_native_transfers(states_list: List[list]) -> Tuple[List[int], List[bytes], List[bytes], List[int]]:
+    """
+    This interface is used to decode the transfer states of the ONT and ONG contracts, which hold the event name,
+    the base58 encode addresses and the amount as they are.
+
+    :param states_list: the States of the notifies of one contract.
+    :return: the indexes of the transfer states in the list, and the columns of from, to and amount.
+    """
+    index_list = list()
+    b58_list = list()
+    amount_list = list()
+    for index, states in enumerate(states_list):
+        if not isinstance(states, list) or len(states) != 4 or states[0] != NATIVE_TRANSFER:
+            continue
+        if not isinstance(states[3], int):
+            continue
+        index_list.append(index)
+        b58_list.append(states[1])
+        b58_list.append(states[2])
+        amount_list.append(states[3])
+    data, invalid_list = Address.b58decode_many(b58_list)
+    address_list = [data[i:i + 20] for i in range(0, len(data), 20)]
+    if len(invalid_list) != 0:
+        invalid_set = set(i // 2 for i in invalid_list)
+        keep_list = [i for i in range(len(index_list)) if i not in invalid_set]
+        index_list = [index_list[i] for i in keep_list]
+        address_list = [address_list[j] for i in keep_list for j in (2 * i, 2 * i + 1)]
+        amount_list = [amount_list[i] for i in keep_list]
+    return index_list, address_list[0::2], address_list[1::2], amount_list
+
+
+def decode_oep4_transfers(states_list: List[list]) -> Tuple[List[int], List[bytes], List[bytes], List[int]]:
+    """
+    This interface is used to decode the transfer states of OEP-4 contracts, which hold the event name, the
+    addresses and the little endian amount in hex. The states of OEP-5 contracts have the same layout, with the
+    token id in the place of the amount.
+
+    :param states_list: the States of the notifies of one contract.
+    :return: the indexes of the transfer states in the list, and the columns of from, to and amount.
+    """
+    index_list = list()
+    from_list = list()
+    to_list = list()
+    amount_list = list()
+    from_hex = bytes.fromhex
+    for index, states in enumerate(states_list):
+        if not isinstance(states, list) or len(states) != 4 or states[0] != HEX_TRANSFER:
+            continue
+        try:
+            from_address = from_hex(states[1])
+            to_address = from_hex(states[2])
+            amount = states[3]
+            if not isinstance(amount, int):
+                amount = int.from_bytes(from_hex(amount), 'little')
+        except (TypeError, ValueError):
+            continue
+        if len(from_address) != 20 or len(to_address) != 20:
+            continue
+        index_list.append(index)
+        from_list.append(from_address)
+        to_list.append(to_address)
+        amount_list.append(amount)
+    return index_list, from_list, to_list, amount_list
+
+
+decode_oep5_transfers = decode_oep4_transfers
+
+
+class ContractEventIndexer(object):
+    """
+    A one pass index of the notifies of a list of events by contract address, and the bulk decoding of their
+    transfer states into TransferRecords with a decoder per contract.
+
+    A decoder is a callable which takes the States of all the notifies of a contract and returns the indexes of
+    the transfer states, and the columns of from, to and amount, like decode_oep4_transfers.
+
+    Usage:
+        indexer = ContractEventIndexer()
+        indexer.set_decoder(hex_contract_address, decode_oep4_transfers)
+        records = indexer.decode_transfers(event_list)
+    """
+
+    def __init__(self, default_decoder=None):
+        """
+        :param default_decoder: the decoder of the contracts without their own, None to skip them.
+        """
+        self.__decoder_dict = dict()
+        self.__decoder_dict[ONT_NOTIFY_ADDRESS] = decode_native_transfers
+        self.__decoder_dict[ONG_NOTIFY_ADDRESS] = decode_native_transfers
+        self.__default_decoder = default_decoder
+
+    def set_decoder(self, hex_contract_address: str, decoder):
+        self.__decoder_dict[hex_contract_address] = decoder
+
+    def remove_decoder(self, hex_contract_address: str):
+        self.__decoder_dict.pop(hex_contract_address, None)
+
+    def get_decoder(self, hex_contract_address: str):
+        return self.__decoder_dict.get(hex_contract_address, self.__default_decoder)
+
+    @staticmethod
+    def index_notify(event_list: List[dict]) -> Dict[str, Tuple[List[dict], List[str]]]:
+        """
+        This interface is used to bucket the notifies of a list of events by their contract address in one pass.
+
+        :param event_list: a list of smart contract events.
+        :return: a dict of the hex contract address to the list of its notifies and the list of their tx hashes.
+        """
+        bucket_dict = dict()
+        for event in event_list:
+            tx_hash = event.get('TxHash', '') if isinstance(event, dict) else ''
+            for notify in ContractEventParser.get_notify_list(event) or list():
+                bucket = bucket_dict.get(notify['ContractAddress'])
+                if bucket is None:
+                    bucket = bucket_dict[notify['ContractAddress']] = (list(), list())
+                bucket[0].append(notify)
+                bucket[1].append(tx_hash)
+        return bucket_dict
+
+    def decode_transfers(self, event_list: List[dict], hex_contract_address_list: List[str] = None,
+                         records: TransferRecords = None) -> TransferRecords:
+        """
+        This interface is used to decode the transfers in a list of events, grouped by contract.
+
+        :param event_list: a list of smart contract events.
+        :param hex_contract_address_list: only the transfers of these contracts are decoded if it is given.
+        :param records: the TransferRecords to append to, by default a new one.
+        :return: the TransferRecords.
+        """
+        if records is None:
+            records = TransferRecords()
+        bucket_dict = self.index_notify(event_list)
+        if hex_contract_address_list is None:
+            hex_contract_address_list = list(bucket_dict.keys())
+        for hex_contract_address in hex_contract_address_list:
+            bucket = bucket_dict.get(hex_contract_address)
+            decoder = self.get_decoder(hex_contract_address)
+            if bucket is None or decoder is None:
+                continue
+            notify_list, tx_hash_list = bucket
+            index_list, from_list, to_list, amount_list = decoder([notify.get('States') for notify in notify_list])
+            records.append_columns(hex_contract_address, from_list, to_list, amount_list,
+                                   [tx_hash_list[index] for index in index_list])
+        return records
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+
+from typing import List, Dict, Tuple
+
+import numpy as np
+
+from ontology.common.address import Address
+from ontology.exception.error_code import ErrorCode
+from ontology.exception.exception import SDKException
+from ontology.utils.event_indexer import TransferRecords
+
+COLUMN_NAMES = ('contract', 'from', 'to', 'amount', 'amount_high', 'height', 'tx_index', 'tx_hash')
+BUFFER_NAMES = ('contract', 'from', 'to', 'amount', 'height', 'tx_index')
+
+MAX_AMOUNT = (1 << 128) - 1
+
+
+class TransferStore(object):
+    """
+    A columnar store of decoded transfers in NumPy arrays, which is filled from TransferRecords in chunks.
+
+    Each chunk holds the 20 bytes from and to addresses as fixed width bytes, the low and high 64 bits of the
+    amounts as uint64, the block heights, the index of the contract in the contract table of the store, and the
+    index of the tx hash in the tx hashes of the chunk. NumPy drops the trailing zero bytes of an address on item
+    access, while tobytes of the array keeps them. Every column has a fixed width, so with a spill directory
+    every full chunk is written to .npy files and memory-mapped, and the history may be larger than the memory.
+    The amounts are only turned into Python ints by the aggregation, when the sums do not fit into int64.
+
+    Usage:
+        store = TransferStore(spill_dir='transfers')
+        store.append_records(indexer.decode_transfers(event_list), block.height)
+        balance_dict = store.get_b58_balances(hex_contract_address)
+    """
+
+    def __init__(self, chunk_size: int = 1 << 20, spill_dir: str = ''):
+        """
+        :param chunk_size: the number of transfers buffered before they are turned into a chunk of arrays.
+        :param spill_dir: the directory the full chunks are memory-mapped from, empty to keep them in memory.
+        """
+        if chunk_size < 1:
+            raise SDKException(ErrorCode.param_err('the chunk size should be positive.'))
+        self.__chunk_size = chunk_size
+        self.__spill_dir = spill_dir
+        self.__chunk_list = list()
+        self.__file_list = list()
+        self.__contract_list = list()
+        self.__contract_index = dict()
+        self.__buffer = dict((name, list()) for name in BUFFER_NAMES)
+        self.__tx_hash_list = list()
+        self.__tx_index = dict()
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self):
+        return sum(len(chunk['amount']) for chunk in self.__chunk_list) + len(self.__buffer['amount'])
+
+    def get_contract_list(self) -> List[str]:
+        return list(self.__contract_list)
+
+    def get_chunk_list(self) -> List[Dict[str, np.ndarray]]:
+        """
+        This interface is used to get the chunks of arrays, after the buffered transfers are turned into a chunk.
+        """
+        self.flush()
+        return list(self.__chunk_list)
+
+    def append_records(self, records: TransferRecords, height: int or List[int] = 0):
+        """
+        This interface is used to append decoded transfers.
+
+        :param records: the TransferRecords.
+        :param height: the block height of every transfer, or a list with the height of each transfer.
+        """
+        count = len(records)
+        if count != 0 and (min(records.amount_list) < 0 or max(records.amount_list) > MAX_AMOUNT):
+            raise SDKException(ErrorCode.param_err('the amount of a transfer should be in [0, 2 ** 128).'))
+        if isinstance(height, int):
+            height_list = [height] * count
+        elif len(height) == count:
+            height_list = height
+        else:
+            raise SDKException(ErrorCode.param_err('the heights and the transfers should have the same length.'))
+        contract_index, tx_index, tx_hash_list = self.__contract_index, self.__tx_index, self.__tx_hash_list
+        buffer = self.__buffer
+        for hex_contract_address in records.contract_list:
+            index = contract_index.get(hex_contract_address)
+            if index is None:
+                index = contract_index[hex_contract_address] = len(self.__contract_list)
+                self.__contract_list.append(hex_contract_address)
+            buffer['contract'].append(index)
+        for tx_hash in records.tx_hash_list:
+            index = tx_index.get(tx_hash)
+            if index is None:
+                index = tx_index[tx_hash] = len(tx_hash_list)
+                tx_hash_list.append(tx_hash)
+            buffer['tx_index'].append(index)
+        buffer['from'].extend(records.from_list)
+        buffer['to'].extend(records.to_list)
+        buffer['amount'].extend(records.amount_list)
+        buffer['height'].extend(height_list)
+        if len(buffer['amount']) >= self.__chunk_size:
+            self.flush()
+
+    def flush(self):
+        """
+        This interface is used to turn the buffered transfers into a chunk, and spill it if there is a spill directory.
+        """
+        buffer = self.__buffer
+        if len(buffer['amount']) == 0:
+            return
+        chunk = dict()
+        chunk['contract'] = np.array(buffer['contract'], dtype=np.int32)
+        chunk['from'] = np.array(buffer['from'], dtype='S20')
+        chunk['to'] = np.array(buffer['to'], dtype='S20')
+        amount_list = buffer['amount']
+        try:
+            chunk['amount'] = np.array(amount_list, dtype=np.uint64)
+            chunk['amount_high'] = np.zeros(len(amount_list), dtype=np.uint64)
+        except OverflowError:
+            chunk['amount'] = np.array([amount & 0xffffffffffffffff for amount in amount_list], dtype=np.uint64)
+            chunk['amount_high'] = np.array([amount >> 64 for amount in amount_list], dtype=np.uint64)
+        chunk['height'] = np.array(buffer['height'], dtype=np.uint32)
+        chunk['tx_index'] = np.array(buffer['tx_index'], dtype=np.int32)
+        chunk['tx_hash'] = np.array([bytes.fromhex(tx_hash) for tx_hash in self.__tx_hash_list], dtype='S32')
+        if self.__spill_dir:
+            chunk = self.__spill(chunk)
+        self.__chunk_list.append(chunk)
+        self.__buffer = dict((name, list()) for name in BUFFER_NAMES)
+        self.__tx_hash_list = list()
+        self.__tx_index = dict()
+
+    def __spill(self, chunk: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        mapped_chunk = dict()
+        for name, array in chunk.items():
+            file_path = os.path.join(self.__spill_dir, f'chunk-{len(self.__chunk_list):06d}-{name}.npy')
+            np.save(file_path, array)
+            self.__file_list.append(file_path)
+            mapped_chunk[name] = np.load(file_path, mmap_mode='r')
+        return mapped_chunk
+
+    def close(self):
+        """
+        This interface is used to drop every transfer and remove the spilled files.
+        """
+        self.__chunk_list = list()
+        self.__buffer = dict((name, list()) for name in BUFFER_NAMES)
+        self.__tx_hash_list = list()
+        self.__tx_index = dict()
+        file_list, self.__file_list = self.__file_list, list()
+        for file_path in file_list:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+
+    def get_tx_hash_array(self) -> np.ndarray:
+        """
+        This interface is used to get the 32 bytes tx hash of every transfer.
+        """
+        return np.concatenate([chunk['tx_hash'][chunk['tx_index']] for chunk in self.get_chunk_list()] or
+                              [np.empty(0, dtype='S32')])
+
+    @staticmethod
+    def __sum_by_address(address_array: np.ndarray, amount_array: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        unique_array, inverse_array = np.unique(address_array, return_inverse=True)
+        if amount_array.dtype != object and len(amount_array) != 0:
+            # sum as Python ints if the int64 sum could overflow.
+            if int(np.abs(amount_array).max()) * len(amount_array) >= 1 << 63:
+                amount_array = amount_array.astype(object)
+        if amount_array.dtype == object:
+            balance_array = np.zeros(len(unique_array), dtype=object)
+        else:
+            balance_array = np.zeros(len(unique_array), dtype=np.int64)
+        np.add.at(balance_array, inverse_array.reshape(-1), amount_array)
+        return unique_array, balance_array
+
+    @staticmethod
+    def __sum_wide_by_address(from_array: np.ndarray, to_array: np.ndarray, low_array: np.ndarray,
+                              high_array: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        # the 128 bits amounts are split into 32 bits limbs, whose sums fit into int64 for up to 2 ** 31 transfers.
+        mask = np.uint64(0xffffffff)
+        shift = np.uint64(32)
+        limb_array = np.stack((low_array & mask, low_array >> shift, high_array & mask, high_array >> shift),
+                              axis=1).astype(np.int64)
+        address_array = np.concatenate((from_array, to_array))
+        unique_array, inverse_array = np.unique(address_array, return_inverse=True)
+        limb_sum_array = np.zeros((len(unique_array), 4), dtype=np.int64)
+        np.add.at(limb_sum_array, inverse_array.reshape(-1), np.concatenate((-limb_array, limb_array)))
+        balance_array = np.zeros(len(unique_array), dtype=object)
+        for i in range(4):
+            balance_array += limb_sum_array[:, i].astype(object) * (1 << (32 * i))
+        return unique_array, balance_array
+
+    def get_balances(self, hex_contract_address: str, start_height: int = 0,
+                     end_height: int = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        This interface is used to get the net amount received by every address of a contract, chunk by chunk.
+
+        :param hex_contract_address: the hex contract address of the notifies.
+        :param start_height: the first block height of the transfers.
+        :param end_height: the last block height of the transfers, None for the last one.
+        :return: the sorted array of 20 bytes addresses and the array of their balances, as int64 or as Python
+                 ints if they do not fit into int64.
+        """
+        contract_index = self.__contract_index.get(hex_contract_address)
+        address_part_list, balance_part_list = list(), list()
+        for chunk in self.get_chunk_list() if contract_index is not None else list():
+            mask = chunk['contract'] == contract_index
+            if start_height > 0:
+                mask &= chunk['height'] >= start_height
+            if end_height is not None:
+                mask &= chunk['height'] <= end_height
+            if not mask.any():
+                continue
+            low_array, high_array = chunk['amount'][mask], chunk['amount_high'][mask]
+            if high_array.any() or int(low_array.max()) * len(low_array) >= 1 << 63:
+                address_array, balance_array = self.__sum_wide_by_address(chunk['from'][mask], chunk['to'][mask],
+                                                                          low_array, high_array)
+            else:
+                amount_array = low_array.astype(np.int64)
+                address_array = np.concatenate((chunk['from'][mask], chunk['to'][mask]))
+                amount_array = np.concatenate((-amount_array, amount_array))
+                address_array, balance_array = self.__sum_by_address(address_array, amount_array)
+            address_part_list.append(address_array)
+            balance_part_list.append(balance_array)
+        if len(address_part_list) == 0:
+            return np.empty(0, dtype='S20'), np.empty(0, dtype=np.int64)
+        if len(address_part_list) == 1:
+            return address_part_list[0], balance_part_list[0]
+        if any(balance_array.dtype == object for balance_array in balance_part_list):
+            balance_part_list = [balance_array.astype(object) for balance_array in balance_part_list]
+        return self.__sum_by_address(np.concatenate(address_part_list), np.concatenate(balance_part_list))
+
+    def get_b58_balances(self, hex_contract_address: str, start_height: int = 0,
+                         end_height: int = None) -> Dict[str, int]:
+        """
+        This interface is used to get the net amount received by every base58 encode address of a contract.
+        """
+        address_array, balance_array = self.get_balances(hex_contract_address, start_height, end_height)
+        b58_address_list = Address.b58encode_many(address_array.tobytes())[0]
+        return dict(zip(b58_address_list, balance_array.tolist()))
@@ -1,7 +1,10 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import os.path
+import os
+import stat
+import tempfile
+
 from Cryptodome import Random
 
 from ontology.common.define import *
@@ -66,6 +69,38 @@ def is_file_exist(file_path: str) -> bool:
     return os.path.isfile(file_path)
 
 
+def write_file_atomic(file_path: str, content: str):
+    """
+    This interface is used to replace a file with new content, so that a crash leaves either the old or the new file.
+
+    The content is written to a temporary file in the same directory, flushed to disk, and renamed over the file.
+    The permission bits of an existing file are kept, a new file is only readable and writable by its owner.
+
+    :param file_path: the path of the file.
+    :param content: the new content of the file.
+    """
+    dir_path = os.path.dirname(os.path.abspath(file_path))
+    fd, temp_path = tempfile.mkstemp(prefix='.' + os.path.basename(file_path) + '.', suffix='.tmp', dir=dir_path)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(file_path):
+            os.chmod(temp_path, stat.S_IMODE(os.stat(file_path).st_mode))
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    if hasattr(os, 'O_DIRECTORY'):
+        dir_fd = os.open(dir_path, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
 def parse_pre_exec_result(return_value, return_type):
     if isinstance(return_type, int) and return_type >= 1 and return_type <= 4:
         res = parse_neo_vm_contract_return_type(return_value, return_type)
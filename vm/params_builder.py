@@ -1,75 +1,91 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-from binascii import a2b_hex
-from ontology.utils import util
 from ontology.common.error_code import ErrorCode
-from ontology.io.memory_stream import MemoryStream
 from ontology.exception.exception import SDKException
 from ontology.vm.op_code import PUSHDATA1, PUSHDATA2, PUSHDATA4, PUSHF, PUSHT, PUSH0, PUSH1, PUSHM1, \
     PUSHBYTES75, APPCALL
 
+_PUSHBYTES75 = PUSHBYTES75[0]
+_PUSHDATA1 = PUSHDATA1[0]
+_PUSHDATA2 = PUSHDATA2[0]
+_PUSHDATA4 = PUSHDATA4[0]
+_APPCALL = APPCALL[0]
+
+
+def _encode_integer(num: int) -> bytes:
+    if num == -1:
+        return PUSHM1
+    if num == 0:
+        return PUSH0
+    if 0 < num < 16:
+        return bytes([PUSH1[0] - 1 + num])
+    # the same little endian two's complement encoding as util.bigint_to_neo_bytes
+    data = num.to_bytes(num.bit_length() // 8 + 1, 'little', signed=True)
+    return _encode_push_bytes_prefix(len(data)) + data
+
+
+def _encode_push_bytes_prefix(length: int) -> bytes:
+    if length < _PUSHBYTES75:
+        return bytes([length])
+    if length < 0x100:
+        return bytes([_PUSHDATA1, length])
+    if length < 0x10000:
+        return bytes([_PUSHDATA2]) + length.to_bytes(2, 'little')
+    return bytes([_PUSHDATA4]) + length.to_bytes(4, 'little')
+
+
+# the encodings of the integers used as amounts, lengths and versions by most scripts.
+__integer_cache__ = {num: _encode_integer(num) for num in range(-1, 1025)}
+
 
 class ParamsBuilder:
+    """
+    Build a NeoVm script in a bytearray, every emitted opcode is appended in place.
+    """
+
     def __init__(self):
-        self.ms = MemoryStream()
+        self.__buffer = bytearray()
 
     def emit(self, op):
         self.write_byte(op)
 
     def emit_push_bool(self, data: bool):
-        return self.emit(PUSHT) if data else self.emit(PUSHF)
+        self.__buffer += PUSHT if data else PUSHF
 
     def emit_push_integer(self, num: int):
-        if num == -1:
-            return self.emit(PUSHM1)
-        elif num == 0:
-            return self.emit(PUSH0)
-        elif 0 < num < 16:
-            return self.emit(int.from_bytes(PUSH1, 'little') - 1 + num)
-        # elif num < 0x10000:
-        #     return self.emit_push_byte_array(num.to_bytes(2, "little"))
-        # elif num.bit_length() < 32:
-        #     return self.emit_push_byte_array(num.to_bytes(4, "little"))
-        # elif num.bit_length() < 40:
-        #     return self.emit_push_byte_array(num.to_bytes(5, "little"))
-        # elif num.bit_length() < 48:
-        #     return self.emit_push_byte_array(num.to_bytes(6, "little"))
-        # elif num.bit_length() < 56:
-        #     return self.emit_push_byte_array(num.to_bytes(7, "little"))
-        # else:
-        #     return self.emit_push_byte_array(num.to_bytes(8, "little"))
-        bs = util.bigint_to_neo_bytes(num)
-        return self.emit_push_byte_array(bs)
+        encoded = __integer_cache__.get(num)
+        if encoded is None:
+            encoded = _encode_integer(num)
+        self.__buffer += encoded
 
     def emit_push_byte_array(self, data):
-        l = len(data)
-        if l < int.from_bytes(PUSHBYTES75, 'little'):
-            self.write_byte(bytearray([l]))
-        elif l < 0x100:
-            self.emit(PUSHDATA1)
-            self.write_byte(bytearray([l]))
-        elif l < 0x10000:
-            self.emit(PUSHDATA2)
-            self.write_byte(len(data).to_bytes(2, "little"))
+        length = len(data)
+        buffer = self.__buffer
+        if length < _PUSHBYTES75:
+            buffer.append(length)
         else:
-            self.emit(PUSHDATA4)
-            self.write_byte(len(data).to_bytes(4, "little"))
+            buffer += _encode_push_bytes_prefix(length)
         self.write_byte(data)
 
     def emit_push_call(self, address):
-        self.emit(APPCALL)
+        self.__buffer.append(_APPCALL)
         self.write_byte(address)
 
     def write_byte(self, value):
-        if isinstance(value, bytearray) or isinstance(value, bytes):
-            self.ms.write(value)
+        value_type = type(value)
+        if value_type is bytes or value_type is bytearray:
+            self.__buffer += value
+        elif value_type is int:
+            self.__buffer.append(value)
+        elif isinstance(value, (bytes, bytearray, memoryview)):
+            self.__buffer += value
         elif isinstance(value, str):
-            self.ms.write(value.encode())
+            self.__buffer += value.encode()
         elif isinstance(value, int):
-            self.ms.write(bytes([value]))
+            self.__buffer.append(value)
         else:
             raise SDKException(ErrorCode.param_err('type error, write byte failed.'))
 
     def to_array(self):
-        return a2b_hex(self.ms.ToArray())
+        return bytes(self.__buffer)
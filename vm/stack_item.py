@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from ontology.common.error_code import ErrorCode
+from ontology.exception.exception import SDKException
+from ontology.smart_contract.neo_contract.abi.struct_type import Struct
+from ontology.smart_contract.neo_contract.abi.build_params import BuildParams
+
+_BYTEARRAY_TYPE = BuildParams.Type.bytearraytype.value
+_BOOL_TYPE = BuildParams.Type.booltype.value
+_INTEGER_TYPE = BuildParams.Type.integertype.value
+_ARRAY_TYPE = BuildParams.Type.arraytype.value
+_STRUCT_TYPE = BuildParams.Type.structtype.value
+_MAP_TYPE = BuildParams.Type.maptype.value
+
+MAX_STACK_ITEM_DEPTH = 1024
+MAX_STACK_ITEM_COUNT = 1 << 20
+
+
+def deserialize_stack_item(data: bytes or bytearray or memoryview, max_depth: int = MAX_STACK_ITEM_DEPTH,
+                           max_count: int = MAX_STACK_ITEM_COUNT):
+    """
+    This interface is used to decode a serialized NeoVM stack item, e.g. the result of a pre-executed transaction.
+
+    Byte arrays are decoded into bytes, integers into int, arrays into list, structs into Struct and maps into dict.
+    The nested items are decoded with an explicit stack instead of recursion, so the nesting is only bounded by
+    max_depth.
+
+    :param data: the serialized stack item.
+    :param max_depth: the max nesting depth of arrays, structs and maps.
+    :param max_count: the max number of items in total.
+    :return: the decoded stack item.
+    """
+    view = memoryview(data).cast('B')
+    length = len(view)
+    from_bytes = int.from_bytes
+    pos = 0
+    count = 0
+    # every frame is [the list or dict, the number of items left, the item type, the pending map key].
+    stack = list()
+    try:
+        while True:
+            item_type = view[pos]
+            pos += 1
+            if item_type == _BYTEARRAY_TYPE or item_type == _INTEGER_TYPE or item_type >= _ARRAY_TYPE:
+                size = view[pos]
+                pos += 1
+                if size >= 0xfd:
+                    width = 2 if size == 0xfd else 4 if size == 0xfe else 8
+                    size = from_bytes(view[pos:pos + width], 'little')
+                    pos += width
+            if item_type == _BYTEARRAY_TYPE:
+                if pos + size > length:
+                    raise IndexError
+                item = view[pos:pos + size].tobytes()
+                pos += size
+            elif item_type == _INTEGER_TYPE:
+                if pos + size > length:
+                    raise IndexError
+                item = from_bytes(view[pos:pos + size], 'little', signed=True)
+                pos += size
+            elif item_type == _BOOL_TYPE:
+                item = view[pos] != 0
+                pos += 1
+            elif item_type == _ARRAY_TYPE or item_type == _STRUCT_TYPE or item_type == _MAP_TYPE:
+                if item_type == _MAP_TYPE:
+                    size *= 2
+                count += size
+                # every item takes at least two bytes, which bounds the size before anything is allocated.
+                if count > max_count or size * 2 > length - pos:
+                    raise SDKException(ErrorCode.other_error('stack item has too many items'))
+                item = dict() if item_type == _MAP_TYPE else list()
+                if size != 0:
+                    if len(stack) >= max_depth:
+                        raise SDKException(ErrorCode.other_error('stack item is nested too deep'))
+                    stack.append([item, size, item_type, None])
+                    continue
+                if item_type == _STRUCT_TYPE:
+                    item = Struct()
+            else:
+                raise SDKException(ErrorCode.other_error('type error'))
+            while True:
+                if len(stack) == 0:
+                    return item
+                frame = stack[-1]
+                frame[1] -= 1
+                if frame[2] != _MAP_TYPE:
+                    frame[0].append(item)
+                elif frame[1] % 2 == 1:
+                    frame[3] = item
+                else:
+                    frame[0][frame[3]] = item
+                if frame[1] != 0:
+                    break
+                stack.pop()
+                item = frame[0]
+                if frame[2] == _STRUCT_TYPE:
+                    item = Struct()
+                    item.param_list = frame[0]
+    except IndexError:
+        raise SDKException(ErrorCode.other_error('unexpected end of stack item')) from None
+    except TypeError:
+        raise SDKException(ErrorCode.other_error('unhashable map key in stack item')) from None
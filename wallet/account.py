@@ -3,12 +3,15 @@
 
 
 class AccountData(object):
+    # the number of times the address of any account has been changed after it was set, see WalletData.
+    address_changes = 0
+
     def __init__(self, address: str = '', enc_alg: str = "aes-256-gcm", key: str = "", algorithm="ECDSA", salt="",
                  param: dict = None, label: str = "", public_key: str = "", sign_scheme: str = "SHA256withECDSA",
                  is_default: bool = True, lock: bool = False):
         if param is None:
             param = {"curve": "P-256"}
-        self.address = address
+        self.__address = address
         self.algorithm = algorithm
         self.enc_alg = enc_alg
         self.is_default = is_default
@@ -20,6 +23,16 @@ class AccountData(object):
         self.public_key = public_key
         self.signature_scheme = sign_scheme
 
+    @property
+    def address(self) -> str:
+        return self.__address
+
+    @address.setter
+    def address(self, address: str):
+        if self.__address and address != self.__address:
+            AccountData.address_changes += 1
+        self.__address = address
+
     def __iter__(self):
         data = dict()
         data['address'] = self.address
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import hmac
+import hashlib
+import threading
+
+from time import monotonic
+from collections import OrderedDict
+
+from ontology.account.account import Account
+from ontology.common.error_code import ErrorCode
+from ontology.exception.exception import SDKException
+
+
+class AccountCache(object):
+    """
+    A size and time bounded cache of unlocked Account objects, keyed by wallet path and address or ontid.
+
+    The password is never stored, only its HMAC under a random secret of the cache, so a lookup with another
+    password is a miss and goes through the scrypt decryption again. An entry also remembers the encrypted key
+    it was unlocked from, and is evicted when it is looked up with another one, e.g. after the account has been
+    imported again with a new password. Evicted, expired and closed entries are
+    dropped from the cache; the private key bytes held by an Account are immutable and are released to the
+    garbage collector rather than overwritten.
+
+    Usage:
+        wallet_manager.set_account_cache(AccountCache(max_size=64, ttl=300))
+    """
+
+    def __init__(self, max_size: int = 64, ttl: float = 300):
+        """
+        :param max_size: the max number of unlocked accounts.
+        :param ttl: the seconds an unlocked account stays in the cache after it was put.
+        """
+        if max_size < 1:
+            raise SDKException(ErrorCode.param_err('the max size of the account cache should be positive.'))
+        if ttl <= 0:
+            raise SDKException(ErrorCode.param_err('the ttl of the account cache should be positive.'))
+        self.__max_size = max_size
+        self.__ttl = ttl
+        self.__secret = os.urandom(32)
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def __digest(self, password: str) -> bytes:
+        return hmac.new(self.__secret, password.encode('utf-8'), hashlib.sha256).digest()
+
+    def get(self, wallet_path: str, b58_address_or_ontid: str, password: str,
+            encrypted_key: str = '') -> Account or None:
+        """
+        This interface is used to get an unlocked account.
+
+        :param wallet_path: the path of the wallet file.
+        :param b58_address_or_ontid: a base58 encode address or ontid.
+        :param password: the password the account was unlocked with.
+        :param encrypted_key: the encrypted private key and salt of the account in the wallet.
+        :return: the Account object, or None if it is not cached, has expired or the password does not match.
+        """
+        key = (wallet_path, b58_address_or_ontid)
+        digest = self.__digest(password)
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None and entry[2] <= monotonic():
+                del self.__entries[key]
+                self.__evictions += 1
+                entry = None
+            if entry is not None and entry[3] != encrypted_key:
+                # the account in the wallet has been replaced since it was unlocked.
+                del self.__entries[key]
+                self.__evictions += 1
+                entry = None
+            if entry is None or not hmac.compare_digest(entry[1], digest):
+                self.__misses += 1
+                return None
+            self.__entries.move_to_end(key)
+            self.__hits += 1
+            return entry[0]
+
+    def put(self, wallet_path: str, b58_address_or_ontid: str, password: str, account: Account,
+            encrypted_key: str = ''):
+        """
+        This interface is used to cache an unlocked account, evicting the least recently used ones when it is full.
+
+        :param wallet_path: the path of the wallet file.
+        :param b58_address_or_ontid: a base58 encode address or ontid.
+        :param password: the password the account was unlocked with.
+        :param account: the Account object.
+        :param encrypted_key: the encrypted private key and salt the account was unlocked from.
+        """
+        key = (wallet_path, b58_address_or_ontid)
+        entry = (account, self.__digest(password), monotonic() + self.__ttl, encrypted_key)
+        with self.__lock:
+            self.__entries[key] = entry
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__max_size:
+                self.__entries.popitem(last=False)
+                self.__evictions += 1
+
+    def evict(self, wallet_path: str, b58_address_or_ontid: str = None):
+        """
+        This interface is used to drop an unlocked account, or every account of a wallet.
+
+        :param wallet_path: the path of the wallet file.
+        :param b58_address_or_ontid: a base58 encode address or ontid, None for every account of the wallet.
+        """
+        with self.__lock:
+            if b58_address_or_ontid is not None:
+                key_list = [(wallet_path, b58_address_or_ontid)]
+            else:
+                key_list = [key for key in self.__entries if key[0] == wallet_path]
+            for key in key_list:
+                if self.__entries.pop(key, None) is not None:
+                    self.__evictions += 1
+
+    def purge_expired(self) -> int:
+        """
+        This interface is used to drop every expired account.
+
+        :return: the number of dropped accounts.
+        """
+        now = monotonic()
+        with self.__lock:
+            key_list = [key for key, entry in self.__entries.items() if entry[2] <= now]
+            for key in key_list:
+                del self.__entries[key]
+            self.__evictions += len(key_list)
+        return len(key_list)
+
+    def close(self):
+        """
+        This interface is used to drop every unlocked account and renew the secret of the password digests.
+        """
+        with self.__lock:
+            self.__evictions += len(self.__entries)
+            self.__entries.clear()
+            self.__secret = os.urandom(32)
+
+    def stats(self) -> dict:
+        """
+        This interface is used to get the counters of the cache.
+
+        :return: a dict of hits, misses, evictions, hit_rate, size and max_size.
+        """
+        with self.__lock:
+            lookups = self.__hits + self.__misses
+            return dict(hits=self.__hits, misses=self.__misses, evictions=self.__evictions,
+                        hit_rate=self.__hits / lookups if lookups else 0.0, size=len(self.__entries),
+                        max_size=self.__max_size)
+
+    def reset_stats(self):
+        with self.__lock:
+            self.__hits = 0
+            self.__misses = 0
+            self.__evictions = 0
@@ -5,15 +5,28 @@ did_ont = "did:onx:"
 
 
 class Identity(object):
+    # the number of times the ont id of any identity has been changed after it was set, see WalletData.
+    ont_id_changes = 0
+
     def __init__(self, ont_id: str = "", label: str = "", lock: bool = False, controls: list = None, is_default=False):
         if controls is None:
             controls = list()
-        self.ont_id = ont_id
+        self.__ont_id = ont_id
         self.label = label
         self.lock = lock
         self.controls = controls
         self.is_default = is_default
 
+    @property
+    def ont_id(self) -> str:
+        return self.__ont_id
+
+    @ont_id.setter
+    def ont_id(self, ont_id: str):
+        if self.__ont_id and ont_id != self.__ont_id:
+            Identity.ont_id_changes += 1
+        self.__ont_id = ont_id
+
     def __iter__(self):
         data = dict()
         data['ontid'] = self.ont_id
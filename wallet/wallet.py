@@ -3,6 +3,8 @@
 
 import json
 
+from typing import List
+
 from ontology.crypto.scrypt import Scrypt
 from ontology.wallet.control import Control
 from ontology.wallet.identity import Identity
@@ -10,8 +12,78 @@ from ontology.wallet.account import AccountData
 from ontology.common.error_code import ErrorCode
 from ontology.exception.exception import SDKException
 
+__decoder__ = json.JSONDecoder()
+
+
+class VersionedList(list):
+    """
+    A list which counts the changes made to it, so that an index over its items knows when to be rebuilt.
+    """
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.version = 0
+
+    def __setitem__(self, key, value):
+        self.version += 1
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self.version += 1
+        super().__delitem__(key)
+
+    def __iadd__(self, other):
+        self.version += 1
+        return super().__iadd__(other)
+
+    def __imul__(self, other):
+        self.version += 1
+        return super().__imul__(other)
+
+    def append(self, item):
+        self.version += 1
+        super().append(item)
+
+    def extend(self, item_list):
+        self.version += 1
+        super().extend(item_list)
+
+    def insert(self, index, item):
+        self.version += 1
+        super().insert(index, item)
+
+    def pop(self, *args):
+        self.version += 1
+        return super().pop(*args)
+
+    def remove(self, item):
+        self.version += 1
+        super().remove(item)
+
+    def clear(self):
+        self.version += 1
+        super().clear()
+
+    def sort(self, *args, **kwargs):
+        self.version += 1
+        super().sort(*args, **kwargs)
+
+    def reverse(self):
+        self.version += 1
+        super().reverse()
+
 
 class WalletData(object):
+    """
+    The accounts and identities of a wallet are indexed by address and ont id. The lists are kept as VersionedList,
+    and the indexes are rebuilt whenever a list is replaced or changed outside of the add and remove methods.
+    AccountData and Identity count the changes of an address or ont id which was already set, so the indexes are
+    also rebuilt when one is changed in place.
+
+    The accounts may also be left in the text of the wallet file by set_lazy_accounts, in which case an account
+    looked up by address is decoded on first access, and the whole accounts array on first access of the list.
+    """
+
     def __init__(self, name: str = "MyWallet", version: str = "1.1", create_time: str = "", default_id: str = "",
                  default_address="", scrypt: Scrypt = None, identities: list = None, accounts: list = None):
         if scrypt is None:
@@ -28,8 +100,12 @@ class WalletData(object):
         self.default_ont_id = default_id
         self.default_account_address = default_address
         self.scrypt = scrypt
-        self.identities = list()
-        self.accounts = list()
+        self.identities = VersionedList()
+        self.accounts = VersionedList()
+        self.__account_index = dict()
+        self.__account_index_key = None
+        self.__identity_index = dict()
+        self.__identity_index_key = None
         for index in range(len(identities)):
             dict_identity = identities[index]
             if isinstance(dict_identity, dict):
@@ -53,24 +129,111 @@ class WalletData(object):
         for index in range(len(accounts)):
             dict_account = accounts[index]
             if isinstance(dict_account, dict):
-                try:
-                    public_key = dict_account['publicKey']
-                except KeyError:
-                    public_key = ''
-                try:
-                    acct = AccountData(address=dict_account['address'], enc_alg=dict_account['enc-alg'],
-                                       key=dict_account['key'], algorithm=dict_account['algorithm'],
-                                       salt=dict_account['salt'], param=dict_account['parameters'],
-                                       label=dict_account['label'], public_key=public_key,
-                                       sign_scheme=dict_account['signatureScheme'],
-                                       is_default=dict_account['isDefault'], lock=dict_account['lock'])
-                except KeyError:
-                    raise SDKException(ErrorCode.param_error)
-                self.accounts.append(acct)
+                self.accounts.append(WalletData.__account_from_dict(dict_account))
             else:
                 self.accounts = accounts
                 break
 
+    @staticmethod
+    def __account_from_dict(dict_account: dict) -> AccountData:
+        try:
+            public_key = dict_account['publicKey']
+        except KeyError:
+            public_key = ''
+        try:
+            acct = AccountData(address=dict_account['address'], enc_alg=dict_account['enc-alg'],
+                               key=dict_account['key'], algorithm=dict_account['algorithm'],
+                               salt=dict_account['salt'], param=dict_account['parameters'],
+                               label=dict_account['label'], public_key=public_key,
+                               sign_scheme=dict_account['signatureScheme'],
+                               is_default=dict_account['isDefault'], lock=dict_account['lock'])
+        except KeyError:
+            raise SDKException(ErrorCode.param_error)
+        return acct
+
+    @property
+    def accounts(self) -> list:
+        if self.__lazy_accounts is not None:
+            self.__load_accounts()
+        return self.__accounts
+
+    @accounts.setter
+    def accounts(self, accounts: list):
+        if not isinstance(accounts, VersionedList):
+            accounts = VersionedList(accounts)
+        self.__accounts = accounts
+        self.__lazy_accounts = None
+
+    @property
+    def identities(self) -> list:
+        return self.__identities
+
+    @identities.setter
+    def identities(self, identities: list):
+        if not isinstance(identities, VersionedList):
+            identities = VersionedList(identities)
+        self.__identities = identities
+
+    def set_lazy_accounts(self, content: str, array_offset: int, offset_list: List[int], address_list: List[str]):
+        """
+        This interface is used to replace the accounts with the accounts array in the text of a wallet file, which
+        is decoded on first access.
+
+        :param content: the text of the wallet file.
+        :param array_offset: the offset of the accounts array in the text.
+        :param offset_list: the offsets of the account objects in the text.
+        :param address_list: the addresses of the account objects.
+        """
+        # the first account wins on duplicated addresses, as in the account index.
+        address_index = dict(zip(reversed(address_list), reversed(offset_list)))
+        self.__accounts = VersionedList()
+        self.__lazy_accounts = (content, array_offset, address_index, dict())
+
+    def is_lazy(self) -> bool:
+        """
+        This interface is used to check whether the accounts array is still left in the text of the wallet file.
+        """
+        return self.__lazy_accounts is not None
+
+    def __load_accounts(self):
+        content, array_offset, _, loaded_accounts = self.__lazy_accounts
+        try:
+            dict_account_list, _ = __decoder__.raw_decode(content, array_offset)
+        except ValueError as e:
+            raise SDKException(ErrorCode.param_err('wallet file format error: %s.' % e))
+        if not isinstance(dict_account_list, list):
+            raise SDKException(ErrorCode.param_err('wallet file format error: accounts should be an array.'))
+        accounts = VersionedList()
+        for dict_account in dict_account_list:
+            if not isinstance(dict_account, dict):
+                raise SDKException(ErrorCode.param_error)
+            # keep the accounts which have been handed out already.
+            acct = loaded_accounts.pop(dict_account.get('address'), None)
+            if acct is None:
+                acct = WalletData.__account_from_dict(dict_account)
+            accounts.append(acct)
+        self.__accounts = accounts
+        self.__lazy_accounts = None
+
+    def __get_lazy_account(self, address: str) -> AccountData or None:
+        content, _, address_index, loaded_accounts = self.__lazy_accounts
+        acct = loaded_accounts.get(address)
+        if acct is None:
+            offset = address_index.get(address)
+            if offset is None:
+                return None
+            try:
+                dict_account, _ = __decoder__.raw_decode(content, offset)
+            except ValueError:
+                return None
+            if not isinstance(dict_account, dict) or dict_account.get('address') != address:
+                return None
+            acct = WalletData.__account_from_dict(dict_account)
+            loaded_accounts[address] = acct
+        if acct.address != address:
+            return None
+        return acct
+
     def __iter__(self):
         data = dict()
         data['name'] = self.name
@@ -96,13 +259,39 @@ class WalletData(object):
         wallet.set_identities(self.identities)
         return wallet
 
+    @staticmethod
+    def __is_index_key(key: tuple or None, item_list: VersionedList, key_changes: int) -> bool:
+        # the list itself is kept in the key, so that a new list can not take over the id of a dropped one.
+        return key is not None and key[0] is item_list and key[1] == item_list.version and key[2] == key_changes
+
+    def __get_account_index(self) -> dict:
+        if not WalletData.__is_index_key(self.__account_index_key, self.accounts, AccountData.address_changes):
+            index = dict()
+            for acct in self.accounts:
+                index.setdefault(acct.address, acct)
+            self.__account_index = index
+            self.__account_index_key = (self.accounts, self.accounts.version, AccountData.address_changes)
+        return self.__account_index
+
+    def __get_identity_index(self) -> dict:
+        if not WalletData.__is_index_key(self.__identity_index_key, self.identities, Identity.ont_id_changes):
+            index = dict()
+            for identity in self.identities:
+                index.setdefault(identity.ont_id, identity)
+            self.__identity_index = index
+            self.__identity_index_key = (self.identities, self.identities.version, Identity.ont_id_changes)
+        return self.__identity_index
+
     def add_account(self, acct: AccountData):
         """
         This interface is used to add account into WalletData.
 
         :param acct: an AccountData object.
         """
+        index = self.__get_account_index()
         self.accounts.append(acct)
+        index.setdefault(acct.address, acct)
+        self.__account_index_key = (self.accounts, self.accounts.version, AccountData.address_changes)
 
     def remove_account(self, address: str):
         """
@@ -170,10 +359,12 @@ class WalletData(object):
         return self.accounts[index]
 
     def get_account_by_address(self, address: str):
-        for index in range(len(self.accounts)):
-            if self.accounts[index].address == address:
-                return self.accounts[index]
-        return None
+        if self.__lazy_accounts is not None:
+            acct = self.__get_lazy_account(address)
+            if acct is not None:
+                return acct
+            # the account may be missing from the offsets, look it up in the decoded accounts array.
+        return self.__get_account_index().get(address)
 
     def set_identities(self, identities: list):
         if not isinstance(identities, list):
@@ -187,23 +378,24 @@ class WalletData(object):
         self.identities = list()
 
     def add_identity(self, id: Identity):
-        for identity in self.identities:
-            if identity.ont_id == id.ont_id:
-                raise SDKException(ErrorCode.other_error('add identity failed, OntId conflict.'))
+        if self.get_identity_by_ont_id(id.ont_id) is not None:
+            raise SDKException(ErrorCode.other_error('add identity failed, OntId conflict.'))
+        index = self.__get_identity_index()
         self.identities.append(id)
+        index[id.ont_id] = id
+        self.__identity_index_key = (self.identities, self.identities.version, Identity.ont_id_changes)
 
     def remove_identity(self, ont_id):
+        identity = self.get_identity_by_ont_id(ont_id)
+        if identity is None:
+            raise SDKException(ErrorCode.param_error)
         for index in range(len(self.identities)):
-            if self.identities[index].ont_id == ont_id:
+            if self.identities[index] is identity:
                 del self.identities[index]
-                return
-        raise SDKException(ErrorCode.param_error)
+                break
 
     def get_identity_by_ont_id(self, ont_id: str) -> Identity or None:
-        for identity in self.identities:
-            if identity.ont_id == ont_id:
-                return identity
-        return None
+        return self.__get_identity_index().get(ont_id)
 
     def set_default_identity_by_index(self, index: int):
         """
@@ -1,11 +1,15 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import os
 import json
 import uuid
 import base64
 import codecs
+import asyncio
 from datetime import datetime
+from typing import List, Dict
+from concurrent.futures import ProcessPoolExecutor
 
 from ontology.common.define import DID_ONT
 from ontology.crypto.scrypt import Scrypt
@@ -16,6 +20,9 @@ from ontology.utils.util import is_file_exist
 from ontology.wallet.wallet import WalletData
 from ontology.utils.util import get_random_hex_str
 from ontology.wallet.account import AccountData
+from ontology.wallet.account_cache import AccountCache
+from ontology.utils.util import write_file_atomic
+from ontology.wallet.wallet_store import WalletJournal, GENERATION_KEY, dump_wallet, index_wallet
 from ontology.common.error_code import ErrorCode
 from ontology.wallet.account_info import AccountInfo
 from ontology.exception.exception import SDKException
@@ -25,29 +32,67 @@ from ontology.crypto.signature_scheme import SignatureScheme
 
 
 class WalletManager(object):
-    def __init__(self, scheme=SignatureScheme.SHA256withECDSA):
+    def __init__(self, scheme=SignatureScheme.SHA256withECDSA, journal: bool = False,
+                 max_journal_size: int = 16 * 1024 * 1024):
+        """
+        :param scheme: the signature scheme of the accounts.
+        :param journal: whether to append the changes of each save to a JSON-lines journal next to the wallet file,
+                        instead of rewriting the whole wallet file.
+        :param max_journal_size: the size in bytes above which the journal is compacted into the wallet file.
+        """
         self.scheme = scheme
         self.wallet_file = WalletData()
         self.wallet_in_mem = WalletData()
         self.wallet_path = ""
+        self.__account_cache = None
+        self.__use_journal = journal
+        self.__max_journal_size = max_journal_size
+        self.__journal = None
+
+    def open_wallet(self, wallet_path: str, lazy: bool = False):
+        """
+        This interface is used to open a wallet file, which is created if it does not exist.
 
-    def open_wallet(self, wallet_path: str):
+        :param wallet_path: the path of the wallet file.
+        :param lazy: whether to decode the accounts on first access instead of on open, so that opening a wallet
+                     to use a few of its accounts does not pay for decoding all of them.
+        :return: the WalletData object.
+        """
         self.wallet_path = wallet_path
+        self.__journal = WalletJournal(wallet_path)
         if is_file_exist(wallet_path) is False:
             # create a new wallet file
             self.wallet_in_mem.create_time = datetime.today().strftime("%Y-%m-%d %H:%M:%S")
             self.save()
         # wallet file exists now
-        self.wallet_file = self.load()
+        self.wallet_file = self.load(lazy)
         self.wallet_in_mem = self.wallet_file
+        if not self.wallet_in_mem.is_lazy():
+            # without a snapshot, the first save rewrites the wallet file.
+            self.__journal.snapshot(self.wallet_in_mem)
         return self.wallet_file
 
-    def load(self):
+    def load(self, lazy: bool = False):
         with open(self.wallet_path, "rb") as f:
             content = f.read()
             if content.startswith(codecs.BOM_UTF8):
                 content = content[len(codecs.BOM_UTF8):]
-            obj = json.loads(content)
+            index = None
+            if lazy and (self.__journal is None or not self.__journal.exists()):
+                try:
+                    content = content.decode('utf-8')
+                    index = index_wallet(content)
+                except ValueError:
+                    index = None
+            if index is None:
+                obj = json.loads(content)
+                if self.__journal is not None:
+                    obj = self.__journal.replay(obj)
+            else:
+                obj = index[0]
+                obj['accounts'] = list()
+            if self.__journal is not None:
+                self.__journal.set_generation(obj.get(GENERATION_KEY, ''))
             try:
                 create_time = obj['createTime']
             except KeyError:
@@ -72,11 +117,47 @@ class WalletManager(object):
                                     scrypt_obj, identities, obj['accounts'])
             except KeyError as e:
                 raise SDKException(ErrorCode.param_err('wallet file format error: %s.' % e))
+            if index is not None:
+                wallet.set_lazy_accounts(content, *index[1:])
         return wallet
 
     def save(self):
-        with open(self.wallet_path, "w") as f:
-            json.dump(self.wallet_in_mem, f, default=lambda obj: dict(obj), indent=4)
+        """
+        This interface is used to persist the wallet in memory.
+
+        With the journal enabled, only the changes since the last save are appended to the journal, which is
+        compacted into the wallet file once it grows over the max journal size. Otherwise the wallet file is
+        rewritten atomically.
+        """
+        if self.__use_journal and self.__journal is not None and is_file_exist(self.wallet_path):
+            if self.__journal.append(self.wallet_in_mem):
+                if self.__journal.size() > self.__max_journal_size:
+                    self.compact()
+                return
+        self.compact()
+
+    def compact(self):
+        """
+        This interface is used to atomically rewrite the wallet file from the wallet in memory and drop the journal.
+        """
+        if self.__journal is None:
+            write_file_atomic(self.wallet_path, dump_wallet(self.wallet_in_mem))
+            return
+        # the lines left in the journal by a crash before its removal belong to the old generation.
+        generation = get_random_hex_str(16)
+        write_file_atomic(self.wallet_path, dump_wallet(self.wallet_in_mem, generation))
+        self.__journal.set_generation(generation)
+        self.__journal.remove()
+        self.__journal.snapshot(self.wallet_in_mem)
+
+    def export_wallet(self, wallet_path: str):
+        """
+        This interface is used to write the wallet in memory to a standard wallet file, including the changes which
+        are only in the journal.
+
+        :param wallet_path: the path of the exported wallet file.
+        """
+        write_file_atomic(wallet_path, dump_wallet(self.wallet_in_mem))
 
     def get_wallet(self):
         return self.wallet_in_mem
@@ -93,6 +174,19 @@ class WalletManager(object):
     def get_signature_scheme(self):
         return self.scheme
 
+    def set_account_cache(self, account_cache: AccountCache or None):
+        """
+        This interface is used to keep the accounts unlocked by get_account() and get_accounts() in a cache, so
+        repeated unlocks with the same password skip the scrypt decryption. A cached account is evicted when it is
+        no longer in the wallet. The cache is disabled by default.
+
+        :param account_cache: an AccountCache object, or None to disable the cache.
+        """
+        self.__account_cache = account_cache
+
+    def get_account_cache(self) -> AccountCache or None:
+        return self.__account_cache
+
     def set_signature_scheme(self, scheme):
         self.scheme = scheme
 
@@ -112,10 +206,7 @@ class WalletManager(object):
         scrypt_n = Scrypt().get_n()
         pri_key = Account.get_gcm_decoded_private_key(encrypted_pri_key, pwd, b58_address, salt, scrypt_n, self.scheme)
         info = self.__create_identity(label, pwd, salt, pri_key)
-        for index in range(len(self.wallet_in_mem.identities)):
-            if self.wallet_in_mem.identities[index].ont_id == info.ont_id:
-                return self.wallet_in_mem.identities[index]
-        return None
+        return self.wallet_in_mem.get_identity_by_ont_id(info.ont_id)
 
     def create_identity(self, label: str, pwd: str) -> Identity:
         """
@@ -183,9 +274,8 @@ class WalletManager(object):
         if label is None or label == "":
             label = str(uuid.uuid4())[0:8]
         if account_flag:
-            for index in range(len(self.wallet_in_mem.accounts)):
-                if acct.address == self.wallet_in_mem.accounts[index].address:
-                    raise ValueError("wallet account exists")
+            if self.wallet_in_mem.get_account_by_address(acct.address) is not None:
+                raise ValueError("wallet account exists")
 
             if len(self.wallet_in_mem.accounts) == 0:
                 acct.is_default = True
@@ -193,11 +283,10 @@ class WalletManager(object):
             acct.label = label
             acct.salt = base64.b64encode(salt.encode('latin-1')).decode('ascii')
             acct.public_key = account.serialize_public_key().hex()
-            self.wallet_in_mem.accounts.append(acct)
+            self.wallet_in_mem.add_account(acct)
         else:
-            for index in range(len(self.wallet_in_mem.identities)):
-                if self.wallet_in_mem.identities[index].ont_id == did_ont + acct.address:
-                    raise ValueError("wallet identity exists")
+            if self.wallet_in_mem.get_identity_by_ont_id(did_ont + acct.address) is not None:
+                raise ValueError("wallet identity exists")
             idt = Identity()
             idt.ont_id = did_ont + acct.address
             idt.label = label
@@ -208,7 +297,7 @@ class WalletManager(object):
                           address=acct.address,
                           public_key=account.serialize_public_key().hex())
             idt.controls.append(ctl)
-            self.wallet_in_mem.identities.append(idt)
+            self.wallet_in_mem.add_identity(idt)
         return account
 
     def import_account(self, label: str, encrypted_pri_key: str, pwd: str, base58_address: str,
@@ -229,10 +318,7 @@ class WalletManager(object):
         private_key = Account.get_gcm_decoded_private_key(encrypted_pri_key, pwd, base58_address, salt,
                                                           Scrypt().get_n(), self.scheme)
         info = self.create_account_info(label, pwd, salt, private_key)
-        for index in range(len(self.wallet_in_mem.accounts)):
-            if info.address_base58 == self.wallet_in_mem.accounts[index].address:
-                return self.wallet_in_mem.accounts[index]
-        return None
+        return self.wallet_in_mem.get_account_by_address(info.address_base58)
 
     def create_account_info(self, label: str, pwd: str, salt: str, private_key: str) -> AccountInfo:
         acct = self.__create_account(label, pwd, salt, private_key, True)
@@ -256,10 +342,7 @@ class WalletManager(object):
         """
         salt = get_random_hex_str(16)
         info = self.create_account_info(label, password, salt, private_key)
-        for index in range(len(self.wallet_in_mem.accounts)):
-            if info.address_base58 == self.wallet_in_mem.accounts[index].address:
-                return self.wallet_in_mem.accounts[index]
-        return None
+        return self.wallet_in_mem.get_account_by_address(info.address_base58)
 
     def get_account(self, b58_address_or_ontid: str, password: str) -> Account or None:
         """
@@ -267,26 +350,140 @@ class WalletManager(object):
         :param password: a password which is used to decrypt the encrypted private key.
         :return:
         """
+        key_info = self.__get_key_info(b58_address_or_ontid)
+        account = self.__get_cached_account(b58_address_or_ontid, password, key_info)
+        if account is not None:
+            return account
+        if key_info is None:
+            return None
+        key, addr, salt = key_info
+        private_key = Account.get_gcm_decoded_private_key(key, password, addr, salt, self.wallet_in_mem.scrypt.get_n(),
+                                                          self.scheme)
+        account = Account(private_key, self.scheme)
+        if self.__account_cache is not None:
+            self.__account_cache.put(self.wallet_path, b58_address_or_ontid, password, account,
+                                     self.__get_encrypted_key(key, salt))
+        return account
+
+    @staticmethod
+    def __get_encrypted_key(key: str, salt: bytes) -> str:
+        return key + ':' + salt.hex()
+
+    def __get_cached_account(self, b58_address_or_ontid: str, password: str, key_info: tuple or None) -> \
+            Account or None:
+        if self.__account_cache is None:
+            return None
+        if key_info is None:
+            # the account has been removed from the wallet since it was unlocked.
+            self.__account_cache.evict(self.wallet_path, b58_address_or_ontid)
+            return None
+        encrypted_key = self.__get_encrypted_key(key_info[0], key_info[2])
+        return self.__account_cache.get(self.wallet_path, b58_address_or_ontid, password, encrypted_key)
+
+    def __get_key_info(self, b58_address_or_ontid: str) -> tuple or None:
         if b58_address_or_ontid.startswith(DID_ONT):
-            for index in range(len(self.wallet_in_mem.identities)):
-                if self.wallet_in_mem.identities[index].ont_id == b58_address_or_ontid:
-                    addr = self.wallet_in_mem.identities[index].ont_id.replace(did_ont, "")
-                    key = self.wallet_in_mem.identities[index].controls[0].key
-                    salt = base64.b64decode(self.wallet_in_mem.identities[index].controls[0].salt)
-                    private_key = Account.get_gcm_decoded_private_key(key, password, addr, salt,
-                                                                      self.wallet_in_mem.scrypt.get_n(), self.scheme)
-                    return Account(private_key, self.scheme)
+            identity = self.wallet_in_mem.get_identity_by_ont_id(b58_address_or_ontid)
+            if identity is not None:
+                addr = identity.ont_id.replace(did_ont, "")
+                return identity.controls[0].key, addr, base64.b64decode(identity.controls[0].salt)
         else:
-            for index in range(len(self.wallet_in_mem.accounts)):
-                if self.wallet_in_mem.accounts[index].address == b58_address_or_ontid:
-                    key = self.wallet_in_mem.accounts[index].key
-                    addr = self.wallet_in_mem.accounts[index].address
-                    salt = base64.b64decode(self.wallet_in_mem.accounts[index].salt)
-                    private_key = Account.get_gcm_decoded_private_key(key, password, addr, salt,
-                                                                      self.wallet_in_mem.scrypt.get_n(), self.scheme)
-                    return Account(private_key, self.scheme)
+            acct = self.wallet_in_mem.get_account_by_address(b58_address_or_ontid)
+            if acct is not None:
+                return acct.key, acct.address, base64.b64decode(acct.salt)
         return None
 
+    def __get_unlock_args(self, b58_address_or_ontid_list: List[str], password: str or List[str]):
+        if isinstance(password, str):
+            password_list = [password] * len(b58_address_or_ontid_list)
+        elif len(password) == len(b58_address_or_ontid_list):
+            password_list = list(password)
+        else:
+            raise SDKException(ErrorCode.param_err('the number of passwords should be the number of accounts.'))
+        cached_dict, id_list, arg_list = dict(), list(), list()
+        n = self.wallet_in_mem.scrypt.get_n()
+        for b58_address_or_ontid, pwd in zip(b58_address_or_ontid_list, password_list):
+            key_info = self.__get_key_info(b58_address_or_ontid)
+            account = self.__get_cached_account(b58_address_or_ontid, pwd, key_info)
+            if account is not None:
+                cached_dict[b58_address_or_ontid] = account
+                continue
+            if key_info is None:
+                continue
+            key, addr, salt = key_info
+            id_list.append(b58_address_or_ontid)
+            arg_list.append((key, pwd, addr, salt, n, self.scheme))
+        return cached_dict, id_list, arg_list
+
+    def __put_unlocked_accounts(self, result: dict, id_list: List[str], arg_list: list, private_key_list: List[str]):
+        for b58_address_or_ontid, args, private_key in zip(id_list, arg_list, private_key_list):
+            account = Account(private_key, self.scheme)
+            if self.__account_cache is not None:
+                self.__account_cache.put(self.wallet_path, b58_address_or_ontid, args[1], account,
+                                         self.__get_encrypted_key(args[0], args[3]))
+            result[b58_address_or_ontid] = account
+
+    def __get_unlock_workers(self, count: int, max_workers: int or None, max_memory: int) -> int:
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        # the scrypt of get_gcm_decoded_private_key uses r = 8, which needs 128 * r * n bytes per derivation.
+        memory_per_worker = 128 * 8 * self.wallet_in_mem.scrypt.get_n()
+        return max(1, min(count, max_workers, max_memory // memory_per_worker))
+
+    def get_accounts(self, b58_address_or_ontid_list: List[str], password: str or List[str], max_workers: int = None,
+                     max_memory: int = 256 * 1024 * 1024) -> Dict[str, Account or None]:
+        """
+        This interface is used to unlock several accounts or identities at once, deriving their scrypt keys in a
+        process pool.
+
+        :param b58_address_or_ontid_list: a list of base58 encode addresses or ontids.
+        :param password: the password of every account, or a list with the password of each account.
+        :param max_workers: the max number of worker processes, by default the number of CPUs.
+        :param max_memory: the max number of bytes used by the concurrent scrypt derivations, which bounds the number
+                           of worker processes.
+        :return: a dict of Account objects keyed by the given addresses or ontids, None for the ones not in the wallet.
+        """
+        result = dict.fromkeys(b58_address_or_ontid_list)
+        cached_dict, id_list, arg_list = self.__get_unlock_args(b58_address_or_ontid_list, password)
+        result.update(cached_dict)
+        workers = self.__get_unlock_workers(len(arg_list), max_workers, max_memory)
+        if workers == 1:
+            private_key_list = [Account.get_gcm_decoded_private_key(*args) for args in arg_list]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                private_key_list = list(executor.map(Account.get_gcm_decoded_private_key, *zip(*arg_list)))
+        self.__put_unlocked_accounts(result, id_list, arg_list, private_key_list)
+        return result
+
+    async def get_accounts_async(self, b58_address_or_ontid_list: List[str], password: str or List[str],
+                                 max_workers: int = None, max_memory: int = 256 * 1024 * 1024) -> \
+            Dict[str, Account or None]:
+        """
+        This interface is the coroutine version of get_accounts(), the keys are derived in worker processes so the
+        event loop is never blocked.
+
+        :param b58_address_or_ontid_list: a list of base58 encode addresses or ontids.
+        :param password: the password of every account, or a list with the password of each account.
+        :param max_workers: the max number of worker processes, by default the number of CPUs.
+        :param max_memory: the max number of bytes used by the concurrent scrypt derivations.
+        :return: a dict of Account objects keyed by the given addresses or ontids, None for the ones not in the wallet.
+        """
+        result = dict.fromkeys(b58_address_or_ontid_list)
+        cached_dict, id_list, arg_list = self.__get_unlock_args(b58_address_or_ontid_list, password)
+        result.update(cached_dict)
+        if len(arg_list) == 0:
+            return result
+        workers = self.__get_unlock_workers(len(arg_list), max_workers, max_memory)
+        loop = asyncio.get_event_loop()
+        executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            private_key_list = await asyncio.gather(
+                *[loop.run_in_executor(executor, Account.get_gcm_decoded_private_key, *args) for args in arg_list])
+        finally:
+            # the shutdown waits for the worker processes to exit, which should not block the event loop.
+            await loop.run_in_executor(None, executor.shutdown)
+        self.__put_unlocked_accounts(result, id_list, arg_list, private_key_list)
+        return result
+
     def get_default_identity(self) -> Identity:
         for identity in self.wallet_in_mem.identities:
             if identity.is_default:
@@ -299,6 +496,9 @@ class WalletManager(object):
 
         :return: an AccountData object that contain all the information of a default account.
         """
+        acct = self.wallet_in_mem.get_account_by_address(self.wallet_in_mem.default_account_address)
+        if acct is not None and acct.is_default:
+            return acct
         for acct in self.wallet_in_mem.accounts:
             if acct.is_default:
                 return acct
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Description:
+    Crash safe persistence of wallet files, and the index of their accounts for a lazy load.
+
+Usage:
+    from ontology.wallet.wallet_store import WalletJournal, dump_wallet, index_wallet
+"""
+
+import os
+import re
+import json
+
+from json.decoder import scanstring
+from collections import OrderedDict
+
+from ontology.wallet.wallet import WalletData
+from ontology.utils.util import write_file_atomic
+
+HEADER_KEYS = ('name', 'version', 'createTime', 'defaultOntid', 'defaultAccountAddress', 'scrypt')
+GENERATION_KEY = 'journalGeneration'
+
+__decoder__ = json.JSONDecoder()
+__white_space__ = re.compile(r'[ \t\n\r]*')
+__account_head__ = re.compile(r'\{\s*"address"\s*:\s*"([^"\\]*)"')
+
+
+def dump_wallet(wallet: WalletData, generation: str = '') -> str:
+    """
+    This interface is used to serialize a wallet into the standard wallet file format.
+
+    :param wallet: the wallet.
+    :param generation: the journal generation written before the accounts, empty to leave it out.
+    """
+    data = dict(wallet)
+    if generation:
+        accounts = data.pop('accounts')
+        data[GENERATION_KEY] = generation
+        data['accounts'] = accounts
+    return json.dumps(data, default=lambda obj: dict(obj), indent=4)
+
+
+def index_wallet(content: str) -> tuple or None:
+    """
+    This interface is used to decode a wallet file except its accounts, and to index the offsets and addresses of
+    the accounts without decoding them.
+
+    The accounts are found by the address member they start with, as written by dump_wallet. An account which is
+    missed is still found in the accounts array once the account list is decoded.
+
+    :param content: the text of the wallet file.
+    :return: the decoded wallet without accounts, the offset of the accounts array, the offsets of the accounts
+             and their addresses, or None if the accounts array is not preceded by the whole wallet header.
+    """
+    pos = __white_space__.match(content).end()
+    if content[pos:pos + 1] != '{':
+        return None
+    wallet_dict = dict()
+    while True:
+        pos = __white_space__.match(content, pos + 1).end()
+        if content[pos:pos + 1] != '"':
+            return None
+        key, pos = scanstring(content, pos + 1)
+        pos = __white_space__.match(content, pos).end()
+        if content[pos:pos + 1] != ':':
+            return None
+        pos = __white_space__.match(content, pos + 1).end()
+        if key == 'accounts':
+            break
+        wallet_dict[key], pos = __decoder__.raw_decode(content, pos)
+        pos = __white_space__.match(content, pos).end()
+        if content[pos:pos + 1] != ',':
+            return None
+    if content[pos:pos + 1] != '[' or any(key not in wallet_dict for key in HEADER_KEYS + ('identities',)):
+        return None
+    offset_list = list()
+    address_list = list()
+    for match in __account_head__.finditer(content, pos + 1, content.rfind(']') + 1):
+        offset_list.append(match.start())
+        address_list.append(match.group(1))
+    return wallet_dict, pos, offset_list, address_list
+
+
+class WalletJournal(object):
+    """
+    A JSON-lines sidecar of a wallet file, which records the changes of each save instead of rewriting the wallet.
+
+    Each line holds the changes of one save: the wallet header, the added or changed accounts and identities,
+    and the addresses and ont ids which were removed. A torn last line, left by a crash in the middle of an
+    append, is ignored on replay. Every compaction writes a new generation into the wallet file, and each line
+    carries the generation it was appended to, so the lines left by a crash between the rewrite of the wallet
+    file and the removal of the journal are skipped on replay. The changes are computed against a snapshot of the last persisted state, so
+    in-place changes of the account and identity objects are recorded as well.
+    """
+
+    def __init__(self, wallet_path: str):
+        self.__path = wallet_path + '.journal'
+        self.__generation = ''
+        self.__accounts = None
+        self.__identities = None
+
+    def get_path(self) -> str:
+        return self.__path
+
+    def get_generation(self) -> str:
+        return self.__generation
+
+    def set_generation(self, generation: str):
+        """
+        This interface is used to set the generation of the wallet file, which the appended lines are tagged with.
+        """
+        self.__generation = generation
+
+    def exists(self) -> bool:
+        return os.path.isfile(self.__path)
+
+    def size(self) -> int:
+        try:
+            return os.path.getsize(self.__path)
+        except OSError:
+            return 0
+
+    def remove(self):
+        if self.exists():
+            os.remove(self.__path)
+
+    def replay(self, wallet_dict: dict) -> dict:
+        """
+        This interface is used to apply the recorded changes to the content of a standard wallet file.
+
+        Only the lines of the generation of the wallet file are applied, the others were compacted into it already.
+
+        :param wallet_dict: the decoded content of the wallet file.
+        :return: the decoded content with the changes applied.
+        """
+        if not self.exists():
+            return wallet_dict
+        generation = wallet_dict.get(GENERATION_KEY, '')
+        accounts = OrderedDict((acct['address'], acct) for acct in wallet_dict.get('accounts', list()))
+        identities = OrderedDict((idt['ontid'], idt) for idt in wallet_dict.get('identities', list()))
+        with open(self.__path, 'rb+') as f:
+            offset = 0
+            for line in f:
+                try:
+                    record = json.loads(line.decode('utf-8'))
+                except ValueError:
+                    # drop the torn record, so the next append starts on a new line.
+                    f.truncate(offset)
+                    break
+                offset += len(line)
+                if record.get('generation', '') != generation:
+                    continue
+                wallet_dict.update(record['header'])
+                for address in record['removedAccounts']:
+                    accounts.pop(address, None)
+                for acct in record['accounts']:
+                    accounts[acct['address']] = acct
+                for ont_id in record['removedIdentities']:
+                    identities.pop(ont_id, None)
+                for idt in record['identities']:
+                    identities[idt['ontid']] = idt
+        wallet_dict['accounts'] = list(accounts.values())
+        wallet_dict['identities'] = list(identities.values())
+        return wallet_dict
+
+    @staticmethod
+    def __header_of(wallet: WalletData) -> dict:
+        data = dict(wallet)
+        data['scrypt'] = dict(data['scrypt'])
+        return {key: data[key] for key in HEADER_KEYS}
+
+    @staticmethod
+    def __account_state(acct) -> tuple:
+        return (acct.address, acct.algorithm, acct.enc_alg, acct.is_default, acct.key, acct.label, acct.lock,
+                tuple(sorted(acct.parameters.items())), acct.salt, acct.public_key, acct.signature_scheme)
+
+    @staticmethod
+    def __identity_state(identity) -> str:
+        return json.dumps(identity, default=lambda obj: dict(obj), sort_keys=True)
+
+    def snapshot(self, wallet: WalletData):
+        """
+        This interface is used to remember the persisted state of the wallet, which the next record is computed from.
+        """
+        self.__accounts = OrderedDict((acct.address, self.__account_state(acct)) for acct in wallet.accounts)
+        self.__identities = OrderedDict((idt.ont_id, self.__identity_state(idt)) for idt in wallet.identities)
+
+    def append(self, wallet: WalletData) -> bool:
+        """
+        This interface is used to record the changes of the wallet since the last snapshot.
+
+        Only the changed accounts and identities are written, but the state of every one of them is compared with
+        the snapshot to find them, so a save still takes time linear in the size of the wallet.
+
+        :param wallet: the wallet in memory.
+        :return: False if the changes can not be recorded, e.g. the accounts were reordered or there is no snapshot,
+                 and the wallet file should be rewritten instead.
+        """
+        if self.__accounts is None:
+            return False
+        account_states = OrderedDict((acct.address, self.__account_state(acct)) for acct in wallet.accounts)
+        identity_states = OrderedDict((idt.ont_id, self.__identity_state(idt)) for idt in wallet.identities)
+        if len(account_states) != len(wallet.accounts) or len(identity_states) != len(wallet.identities):
+            return False
+        record = dict(generation=self.__generation, header=self.__header_of(wallet))
+        record['removedAccounts'], record['accounts'] = self.__diff(self.__accounts, account_states)
+        record['removedIdentities'], record['identities'] = self.__diff(self.__identities, identity_states)
+        if record['removedAccounts'] is None or record['removedIdentities'] is None:
+            return False
+        changed_set = set(record['accounts'])
+        record['accounts'] = [dict(acct) for acct in wallet.accounts if acct.address in changed_set]
+        changed_set = set(record['identities'])
+        record['identities'] = [idt for idt in wallet.identities if idt.ont_id in changed_set]
+        line = json.dumps(record, default=lambda obj: dict(obj)) + '\n'
+        with open(self.__path, 'a') as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        self.__accounts = account_states
+        self.__identities = identity_states
+        return True
+
+    @staticmethod
+    def __diff(old_states: OrderedDict, new_states: OrderedDict):
+        removed_list = [key for key in old_states if key not in new_states]
+        changed_list = [key for key, state in new_states.items() if old_states.get(key) != state]
+        # the replay keeps the position of the changed entries and appends the new ones.
+        removed_set = set(removed_list)
+        kept_list = [key for key in old_states if key not in removed_set]
+        added_list = [key for key in new_states if key not in old_states]
+        if kept_list + added_list != list(new_states):
+            return None, None
+        return removed_list, changed_list